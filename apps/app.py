@@ -858,6 +858,7 @@ class SecureCipherStegnoApp:
         def worker():
             try:
                 if algo == "rsa":
+                    _ensure_key_pool()
                     cipher = RSACipher(key_size=2048)
                     keys = cipher.generate_key_pair()
                     pub = os.path.join(output_dir, "public_key.pem")
@@ -1317,12 +1318,34 @@ class SecureCipherStegnoApp:
         text.config(state=tk.DISABLED)
 
 
+# ── RSA key pool ───────────────────────────────────────────────────────────────
+
+_key_pool_lock = threading.Lock()
+
+
+def _ensure_key_pool():
+    """Start the RSA-2048 key pool on the first RSA key request
+
+    The first pair is still generated inline; the pool then keeps the next
+    ones ready so later "Generate Keys" clicks do not wait on RSA.generate.
+    """
+    from src.crypto import keypool
+    with _key_pool_lock:
+        if keypool.default_pool() is None:
+            keypool.start_default_pool(sizes=(2048,), high_water=2)
+
+
 # ── Entry point ────────────────────────────────────────────────────────────────
 
 def main():
+    from src.crypto import keypool
+
     root = tk.Tk()
     SecureCipherStegnoApp(root)
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        keypool.stop_default_pool(wait=False)
 
 
 if __name__ == "__main__":
@@ -42,10 +42,10 @@ init(autoreset=True)
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+# Cipher and steganography backends (pycryptodome, NumPy, Pillow) are
+# imported inside the handlers that use them to keep start-up fast
 from src import __version__
-from src.crypto import CaesarCipher, AESCipher, RSACipher
-from src.steganography import ImageSteganography, AudioSteganography
-from src.utils import Logger, PasswordValidator, calculate_file_hash
+from src.utils import Logger
 
 
 class CLI:
@@ -80,17 +80,19 @@ Examples:
         
         # Encrypt command
         encrypt_parser = subparsers.add_parser('encrypt', help='Encrypt data')
-        encrypt_parser.add_argument('--algorithm', choices=['caesar', 'aes', 'rsa'], required=True,
+        encrypt_parser.add_argument('--algorithm', choices=['caesar', 'aes', 'chacha20', 'rsa'], required=True,
                                    help='Encryption algorithm')
         encrypt_parser.add_argument('--input', required=True, help='Input file or text')
         encrypt_parser.add_argument('--output', required=True, help='Output file')
         encrypt_parser.add_argument('--password', help='Password for encryption')
         encrypt_parser.add_argument('--key', help='Key file for RSA')
         encrypt_parser.add_argument('--shift', type=int, default=3, help='Shift value for Caesar cipher')
+        encrypt_parser.add_argument('--chunk-size', type=int, default=1024 * 1024,
+                                   help='Chunk size in bytes for streamed AES/ChaCha20 file encryption')
         
         # Decrypt command
         decrypt_parser = subparsers.add_parser('decrypt', help='Decrypt data')
-        decrypt_parser.add_argument('--algorithm', choices=['caesar', 'aes', 'rsa'], required=True,
+        decrypt_parser.add_argument('--algorithm', choices=['caesar', 'aes', 'chacha20', 'rsa'], required=True,
                                    help='Decryption algorithm')
         decrypt_parser.add_argument('--input', required=True, help='Input encrypted file')
         decrypt_parser.add_argument('--output', required=True, help='Output file')
@@ -169,6 +171,10 @@ Examples:
     
     def _handle_encrypt(self, args):
         """Handle encryption command"""
+        if args.algorithm in ('aes', 'chacha20') and (os.path.isfile(args.input) or args.algorithm == 'chacha20'):
+            self._encrypt_stream(args)
+            return
+        
         # Read input
         if os.path.exists(args.input):
             with open(args.input, 'r') as f:
@@ -177,6 +183,7 @@ Examples:
             plaintext = args.input
         
         if args.algorithm == 'caesar':
+            from src.crypto import CaesarCipher
             result = CaesarCipher.encrypt(plaintext, args.shift)
             with open(args.output, 'w') as f:
                 f.write(result)
@@ -186,6 +193,7 @@ Examples:
             if not args.password:
                 raise ValueError("Password required for AES encryption")
             
+            from src.crypto import AESCipher
             cipher = AESCipher(args.password)
             result = cipher.encrypt(plaintext)
             
@@ -204,6 +212,7 @@ Examples:
             with open(args.key, 'r') as f:
                 public_key = f.read()
             
+            from src.crypto import RSACipher
             cipher = RSACipher()
             cipher.load_public_key(public_key)
             result = cipher.encrypt(plaintext)
@@ -213,12 +222,61 @@ Examples:
             
             print(f"{Fore.GREEN}✓ Text encrypted with RSA")
     
+    def _encrypt_stream(self, args):
+        """Encrypt a file (or literal text) in chunks with constant memory"""
+        if not args.password:
+            raise ValueError(f"Password required for {args.algorithm.upper()} encryption")
+        
+        import io
+        from src.crypto import stream
+        
+        if os.path.isfile(args.input):
+            src = open(args.input, 'rb')
+        else:
+            src = io.BytesIO(args.input.encode('utf-8'))
+        
+        with src, open(args.output, 'wb') as dst:
+            result = stream.encrypt_stream(args.password, src, dst, args.algorithm, args.chunk_size)
+        
+        name = 'AES-256-GCM' if args.algorithm == 'aes' else 'ChaCha20-Poly1305'
+        print(f"{Fore.GREEN}✓ {result['bytes']} bytes encrypted with {name} ({result['chunks']} chunks)")
+        print(f"Output: {args.output}")
+    
+    def _decrypt_stream(self, args):
+        """Decrypt a chunked container written by _encrypt_stream"""
+        if not args.password:
+            raise ValueError(f"Password required for {args.algorithm.upper()} decryption")
+        
+        from src.crypto import stream
+        
+        with open(args.input, 'rb') as src:
+            dst = open(args.output, 'wb')
+            try:
+                with dst:
+                    result = stream.decrypt_stream(args.password, src, dst, args.algorithm)
+            except Exception:
+                # Never leave partially decrypted output behind
+                os.remove(args.output)
+                raise
+        
+        print(f"{Fore.GREEN}✓ {result['bytes']} bytes decrypted ({result['chunks']} chunks)")
+        print(f"Output: {args.output}")
+    
     def _handle_decrypt(self, args):
         """Handle decryption command"""
+        if args.algorithm in ('aes', 'chacha20'):
+            from src.crypto import stream
+            if stream.is_stream(args.input):
+                self._decrypt_stream(args)
+                return
+            if args.algorithm == 'chacha20':
+                raise ValueError("Input is not a ChaCha20 encrypted file")
+        
         if args.algorithm == 'caesar':
             with open(args.input, 'r') as f:
                 ciphertext = f.read()
             
+            from src.crypto import CaesarCipher
             result = CaesarCipher.decrypt(ciphertext, args.shift)
             with open(args.output, 'w') as f:
                 f.write(result)
@@ -230,6 +288,7 @@ Examples:
                 raise ValueError("Password required for AES decryption")
             
             import json
+            from src.crypto import AESCipher
             with open(args.input, 'r') as f:
                 encrypted_data = json.load(f)
             
@@ -251,6 +310,7 @@ Examples:
             with open(args.input, 'r') as f:
                 ciphertext = f.read()
             
+            from src.crypto import RSACipher
             cipher = RSACipher()
             cipher.load_private_key(private_key)
             result = cipher.decrypt(ciphertext)
@@ -267,12 +327,14 @@ Examples:
             message = f.read()
         
         if args.type == 'image':
+            from src.steganography import ImageSteganography
             result = ImageSteganography.encode(args.cover, message, args.output, args.compress)
             print(f"{Fore.GREEN}✓ Message hidden in image")
             print(f"Output: {result['output_path']}")
             print(f"Message size: {result['message_size']} bytes")
         
         elif args.type == 'audio':
+            from src.steganography import AudioSteganography
             result = AudioSteganography.encode(args.cover, message, args.output)
             print(f"{Fore.GREEN}✓ Message hidden in audio")
             print(f"Output: {result['output_path']}")
@@ -281,8 +343,10 @@ Examples:
     def _handle_stego_decode(self, args):
         """Handle steganography decoding"""
         if args.type == 'image':
+            from src.steganography import ImageSteganography
             message = ImageSteganography.decode(args.input, args.compressed)
         elif args.type == 'audio':
+            from src.steganography import AudioSteganography
             message = AudioSteganography.decode(args.input)
         
         if args.output:
@@ -298,6 +362,7 @@ Examples:
         os.makedirs(args.output_dir, exist_ok=True)
         
         if args.algorithm == 'rsa':
+            from src.crypto import RSACipher
             key_size = args.key_size or 2048
             cipher = RSACipher(key_size)
             keys = cipher.generate_key_pair()
@@ -330,6 +395,7 @@ Examples:
     
     def _handle_hash(self, args):
         """Handle file hashing"""
+        from src.utils import calculate_file_hash
         file_hash = calculate_file_hash(args.input, args.algorithm)
         print(f"{Fore.GREEN}✓ {args.algorithm.upper()} hash calculated")
         print(f"File: {args.input}")
@@ -343,6 +409,7 @@ Examples:
             import getpass
             password = getpass.getpass("Enter password to validate: ")
         
+        from src.utils import PasswordValidator
         result = PasswordValidator.validate_strength(password)
         
         print(f"\n{Fore.CYAN}Password Strength Analysis:")
@@ -366,6 +433,7 @@ Examples:
     
     def _handle_generate_password(self, args):
         """Handle password generation"""
+        from src.utils import PasswordValidator
         password = PasswordValidator.generate_strong_password(args.length)
         print(f"{Fore.GREEN}✓ Strong password generated:")
         print(f"{Fore.CYAN}{password}{Style.RESET_ALL}")
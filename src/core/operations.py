@@ -6,19 +6,84 @@ Used by all interfaces: GUI (Tkinter), CLI, and Web
 
 import sys
 import os
+import signal
+import time
+import multiprocessing
+import queue
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
-from src.crypto import (CaesarCipher, AESCipher, RSACipher, VigenereCipher,
-                        PlayfairCipher, RailFenceCipher, BlowfishCipher,
-                        DES3Cipher, ChaCha20Cipher)
+from src.crypto import registry
 from src.steganography import ImageSteganography, AudioSteganography, VideoSteganography
 from src.utils import PasswordValidator, calculate_file_hash, Logger
 
 # Default constants
 DEFAULT_CAESAR_SHIFT = 3
 DEFAULT_RAIL_FENCE_RAILS = 3
+BATCH_TIMEOUT_GRACE = 1.0  # Seconds the parent waits past a job timeout before killing its worker
+BATCH_POLL_INTERVAL = 0.1  # Seconds between checks for job starts when a timeout is set
+BATCH_CRASH_RETRIES = 1  # Reruns of a job whose worker died before it is reported as failed
+
+# Queue on which batch workers report (pool generation, job index, pid, start time)
+_job_starts = None
+_pool_generation = None
+
+
+class _JobTimeout(BaseException):
+    """Raised inside a batch worker when a job exceeds its time limit
+    (BaseException so the operations' own error handling does not catch it)"""
+
+
+def _raise_job_timeout(signum, frame):
+    raise _JobTimeout()
+
+
+def _init_batch_worker(starts, generation):
+    """Process pool initializer recording where to report job starts"""
+    global _job_starts, _pool_generation
+    _job_starts = starts
+    _pool_generation = generation
+
+
+def _run_stego_job(operation, job, timeout=None, index=None):
+    """
+    Run one SteganographyOperations call in a batch worker process
+    
+    Where the platform supports interval timers the job is interrupted in
+    the worker after `timeout` seconds, freeing the worker for the next job.
+    The start of the job is reported to the parent, which measures its own
+    deadline from that moment rather than from submission.
+    
+    Args:
+        operation: 'encode' or 'decode'
+        job: dict of keyword arguments, or a sequence of positional arguments
+        timeout: Time limit in seconds (optional)
+        index: Position of the job in the batch (optional)
+        
+    Returns:
+        dict: Result in the shape returned by the operation
+    """
+    if _job_starts is not None and index is not None:
+        _job_starts.put((_pool_generation, index, os.getpid(), time.time()))
+    
+    args, kwargs = ((), job) if isinstance(job, dict) else (tuple(job), {})
+    use_timer = timeout is not None and hasattr(signal, 'setitimer')
+    
+    if use_timer:
+        previous = signal.signal(signal.SIGALRM, _raise_job_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return getattr(SteganographyOperations, operation)(*args, **kwargs)
+    except _JobTimeout:
+        return {'success': False, 'error': f'Job timed out after {timeout} seconds'}
+    finally:
+        if use_timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
 
 
 class CryptoOperations:
@@ -31,7 +96,8 @@ class CryptoOperations:
         
         Args:
             text: Plain text to encrypt
-            algorithm: Algorithm name (caesar, vigenere, aes, rsa, etc.)
+            algorithm: Algorithm name (caesar, vigenere, aes, rsa, etc.; any name
+                added with src.crypto.registry.register)
             key: Encryption key (required for most algorithms)
             shift: Shift value (for Caesar cipher)
             
@@ -46,106 +112,10 @@ class CryptoOperations:
             }
         """
         try:
-            algorithm = algorithm.lower()
-            
-            if algorithm == "caesar":
-                ciphertext = CaesarCipher.encrypt(text, shift)
-                return {
-                    'success': True,
-                    'ciphertext': ciphertext,
-                    'algorithm': 'caesar'
-                }
-            
-            elif algorithm == "vigenere":
-                if not key:
-                    return {'success': False, 'error': 'Key required for Vigenère cipher'}
-                ciphertext = VigenereCipher.encrypt(text, key)
-                return {
-                    'success': True,
-                    'ciphertext': ciphertext,
-                    'algorithm': 'vigenere'
-                }
-            
-            elif algorithm == "playfair":
-                if not key:
-                    return {'success': False, 'error': 'Key required for Playfair cipher'}
-                ciphertext = PlayfairCipher.encrypt(text, key)
-                return {
-                    'success': True,
-                    'ciphertext': ciphertext,
-                    'algorithm': 'playfair'
-                }
-            
-            elif algorithm == "railfence":
-                if not key:
-                    key = str(DEFAULT_RAIL_FENCE_RAILS)
-                rails = int(key)
-                ciphertext = RailFenceCipher.encrypt(text, rails)
-                return {
-                    'success': True,
-                    'ciphertext': ciphertext,
-                    'algorithm': 'railfence',
-                    'rails': rails
-                }
-            
-            elif algorithm == "aes":
-                if not key:
-                    return {'success': False, 'error': 'Password required for AES'}
-                result = AESCipher.encrypt_with_password(text, key)
-                return {
-                    'success': True,
-                    'ciphertext': result['ciphertext'],
-                    'iv': result['iv'],
-                    'algorithm': 'aes'
-                }
-            
-            elif algorithm == "blowfish":
-                if not key:
-                    return {'success': False, 'error': 'Key required for Blowfish'}
-                result = BlowfishCipher.encrypt_with_password(text, key)
-                return {
-                    'success': True,
-                    'ciphertext': result['ciphertext'],
-                    'iv': result['iv'],
-                    'algorithm': 'blowfish'
-                }
-            
-            elif algorithm == "des3" or algorithm == "3des":
-                if not key:
-                    return {'success': False, 'error': 'Key required for 3DES'}
-                result = DES3Cipher.encrypt_with_password(text, key)
-                return {
-                    'success': True,
-                    'ciphertext': result['ciphertext'],
-                    'iv': result['iv'],
-                    'algorithm': 'des3'
-                }
-            
-            elif algorithm == "chacha20":
-                if not key:
-                    return {'success': False, 'error': 'Key required for ChaCha20'}
-                result = ChaCha20Cipher.encrypt_with_password(text, key)
-                return {
-                    'success': True,
-                    'ciphertext': result['ciphertext'],
-                    'nonce': result['nonce'],
-                    'algorithm': 'chacha20'
-                }
-            
-            elif algorithm == "rsa":
-                rsa_cipher = RSACipher()
-                keys = rsa_cipher.generate_key_pair()
-                ciphertext = rsa_cipher.encrypt(text)
-                return {
-                    'success': True,
-                    'ciphertext': ciphertext,
-                    'public_key': keys['public_key'],
-                    'private_key': keys['private_key'],
-                    'algorithm': 'rsa'
-                }
-            
-            else:
-                return {'success': False, 'error': f'Unsupported algorithm: {algorithm}'}
+            codec = registry.get(algorithm)
+            if codec is None:
+                return {'success': False, 'error': f'Unsupported algorithm: {algorithm.lower()}'}
+            return codec.encrypt(text, key=key, shift=shift)
         
         except Exception as e:
             return {'success': False, 'error': str(e)}
@@ -173,101 +143,147 @@ class CryptoOperations:
             }
         """
         try:
-            algorithm = algorithm.lower()
-            
-            if algorithm == "caesar":
-                plaintext = CaesarCipher.decrypt(ciphertext, shift)
-                return {
-                    'success': True,
-                    'plaintext': plaintext,
-                    'algorithm': 'caesar'
-                }
-            
-            elif algorithm == "vigenere":
-                if not key:
-                    return {'success': False, 'error': 'Key required'}
-                plaintext = VigenereCipher.decrypt(ciphertext, key)
-                return {
-                    'success': True,
-                    'plaintext': plaintext,
-                    'algorithm': 'vigenere'
-                }
+            codec = registry.get(algorithm)
+            if codec is None:
+                return {'success': False, 'error': f'Unsupported algorithm: {algorithm.lower()}'}
+            return codec.decrypt(ciphertext, key=key, shift=shift, iv=iv, nonce=nonce,
+                                 private_key=private_key)
+        
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    @staticmethod
+    def encrypt_file(input_path, output_path, key, algorithm='aes', chunk_size=None, workers=None):
+        """
+        Encrypt a file in fixed-size chunks with constant memory
+        
+        Args:
+            input_path: File to encrypt
+            output_path: Encrypted container to write
+            key: Password or 32-byte key
+            algorithm: 'aes' (AES-256-GCM) or 'chacha20' (ChaCha20-Poly1305)
+            chunk_size: Plaintext bytes per chunk (default 1 MiB)
+            workers: Threads encrypting chunks in parallel (default: CPU count)
             
-            elif algorithm == "playfair":
-                if not key:
-                    return {'success': False, 'error': 'Key required'}
-                plaintext = PlayfairCipher.decrypt(ciphertext, key)
-                return {
-                    'success': True,
-                    'plaintext': plaintext,
-                    'algorithm': 'playfair'
-                }
+        Returns:
+            dict: {
+                'success': bool,
+                'output_path': str,
+                'algorithm': str,
+                'chunks': int,
+                'input_size': int,
+                'output_size': int,
+                'error': str (optional)
+            }
+        """
+        try:
+            if not key:
+                return {'success': False, 'error': 'Password required for file encryption'}
             
-            elif algorithm == "railfence":
-                if not key:
-                    key = str(DEFAULT_RAIL_FENCE_RAILS)
-                rails = int(key)
-                plaintext = RailFenceCipher.decrypt(ciphertext, rails)
-                return {
-                    'success': True,
-                    'plaintext': plaintext,
-                    'algorithm': 'railfence'
-                }
+            from src.crypto import stream
+            with open(input_path, 'rb') as src, open(output_path, 'wb') as dst:
+                result = stream.encrypt_stream(key, src, dst, algorithm.lower(),
+                                               chunk_size or stream.DEFAULT_CHUNK_SIZE, workers=workers)
             
-            elif algorithm == "aes":
-                if not key or not iv:
-                    return {'success': False, 'error': 'Password and IV required'}
-                plaintext = AESCipher.decrypt_with_password(ciphertext, iv, key)
-                return {
-                    'success': True,
-                    'plaintext': plaintext,
-                    'algorithm': 'aes'
-                }
+            return {
+                'success': True,
+                'output_path': output_path,
+                'algorithm': result['algorithm'],
+                'chunks': result['chunks'],
+                'input_size': result['bytes'],
+                'output_size': os.path.getsize(output_path)
+            }
+        
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    @staticmethod
+    def decrypt_file(input_path, output_path, key, workers=None):
+        """
+        Decrypt a file written by encrypt_file
+        
+        The output is removed again if any chunk fails authentication.
+        
+        Args:
+            input_path: Encrypted container
+            output_path: File to write the plaintext to
+            key: Password or 32-byte key
+            workers: Threads decrypting chunks in parallel (default: CPU count)
             
-            elif algorithm == "blowfish":
-                if not key or not iv:
-                    return {'success': False, 'error': 'Key and IV required'}
-                plaintext = BlowfishCipher.decrypt_with_password(ciphertext, iv, key)
-                return {
-                    'success': True,
-                    'plaintext': plaintext,
-                    'algorithm': 'blowfish'
-                }
+        Returns:
+            dict: {
+                'success': bool,
+                'output_path': str,
+                'algorithm': str,
+                'chunks': int,
+                'output_size': int,
+                'error': str (optional)
+            }
+        """
+        try:
+            if not key:
+                return {'success': False, 'error': 'Password required for file decryption'}
+            
+            from src.crypto import stream
+            with open(input_path, 'rb') as src:
+                dst = open(output_path, 'wb')
+                try:
+                    with dst:
+                        result = stream.decrypt_stream(key, src, dst, workers=workers)
+                except Exception:
+                    os.remove(output_path)
+                    raise
             
-            elif algorithm == "des3" or algorithm == "3des":
-                if not key or not iv:
-                    return {'success': False, 'error': 'Key and IV required'}
-                plaintext = DES3Cipher.decrypt_with_password(ciphertext, iv, key)
-                return {
-                    'success': True,
-                    'plaintext': plaintext,
-                    'algorithm': 'des3'
-                }
+            return {
+                'success': True,
+                'output_path': output_path,
+                'algorithm': result['algorithm'],
+                'chunks': result['chunks'],
+                'output_size': result['bytes']
+            }
+        
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    @staticmethod
+    def read_file_range(input_path, key, offset, length):
+        """
+        Decrypt a byte range of a file written by encrypt_file
+        
+        Only the segments overlapping the range are read and decrypted.
+        
+        Args:
+            input_path: Encrypted container
+            key: Password or 32-byte key
+            offset: Plaintext offset (negative counts from the end)
+            length: Number of bytes
             
-            elif algorithm == "chacha20":
-                if not key or not nonce:
-                    return {'success': False, 'error': 'Key and nonce required'}
-                plaintext = ChaCha20Cipher.decrypt_with_password(ciphertext, nonce, key)
-                return {
-                    'success': True,
-                    'plaintext': plaintext,
-                    'algorithm': 'chacha20'
-                }
+        Returns:
+            dict: {
+                'success': bool,
+                'data': bytes,
+                'offset': int,
+                'size': int (plaintext size of the whole file),
+                'error': str (optional)
+            }
+        """
+        try:
+            if not key:
+                return {'success': False, 'error': 'Password required for file decryption'}
             
-            elif algorithm == "rsa":
-                if not private_key:
-                    return {'success': False, 'error': 'Private key required'}
-                rsa_cipher = RSACipher()
-                rsa_cipher.load_private_key(private_key)
-                plaintext = rsa_cipher.decrypt(ciphertext)
-                return {
-                    'success': True,
-                    'plaintext': plaintext,
-                    'algorithm': 'rsa'
-                }
+            from src.crypto import stream
+            with stream.SegmentReader(input_path, key) as reader:
+                if offset < 0:
+                    offset = max(reader.size + offset, 0)
+                data = reader.read_range(offset, length)
+                size = reader.size
             
-            else:
-                return {'success': False, 'error': f'Unsupported algorithm: {algorithm}'}
+            return {
+                'success': True,
+                'data': data,
+                'offset': offset,
+                'size': size
+            }
         
         except Exception as e:
             return {'success': False, 'error': str(e)}
@@ -374,6 +390,205 @@ class SteganographyOperations:
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    @staticmethod
+    def _run_batch(operation, jobs, workers=None, timeout=None):
+        """
+        Run jobs on a process pool, yielding results in completion order
+        
+        At most 2 * workers jobs are submitted at a time, so arbitrarily long
+        job iterables are consumed lazily with bounded memory. A job's time
+        limit counts from when a worker starts it. A worker still busy
+        BATCH_TIMEOUT_GRACE seconds past the limit (its timer could not
+        interrupt the job) is killed, and the other unfinished jobs are rerun
+        on a fresh pool.
+        
+        A worker that dies on its own (OOM kill, crash in a native decoder)
+        also breaks the pool. The jobs it took down are rerun one at a time
+        on a fresh pool, so only the job that crashes on its own is counted
+        against it; after BATCH_CRASH_RETRIES reruns it is reported as failed.
+        
+        Args:
+            operation: 'encode' or 'decode'
+            jobs: Iterable of dicts of keyword arguments (or argument tuples)
+            workers: Number of worker processes (default: CPU count)
+            timeout: Per-job time limit in seconds (optional)
+            
+        Yields:
+            dict: Operation result with 'job_index' added
+        """
+        workers = workers or os.cpu_count() or 1
+        jobs = enumerate(jobs)
+        requeued = deque()
+        suspects = deque()  # Jobs in flight when a worker died, rerun one at a time
+        crashes = {}
+        starts = multiprocessing.Queue() if timeout is not None else None
+        generation = 0
+        pool = None
+        pending = {}
+        running = {}
+        
+        def next_job():
+            if requeued:
+                return requeued.popleft()
+            return next(jobs, None)
+        
+        def drop_pool():
+            """Abandon a broken pool, returning its finished results and unfinished jobs"""
+            nonlocal pool
+            pool.shutdown(wait=False)
+            pool = None
+            finished, unfinished = [], []
+            for future, item in pending.items():
+                if (future.done() and not future.cancelled()
+                        and not isinstance(future.exception(), BrokenProcessPool)):
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {'success': False, 'error': str(e)}
+                    finished.append({**result, 'job_index': item[0]})
+                else:
+                    future.cancel()
+                    unfinished.append(item)
+            pending.clear()
+            running.clear()
+            return finished, unfinished
+        
+        def collect_starts():
+            while True:
+                try:
+                    job_generation, index, pid, started = starts.get_nowait()
+                except queue.Empty:
+                    return
+                if job_generation == generation:
+                    running[index] = (pid, started)
+        
+        try:
+            while True:
+                if pool is None:
+                    generation += 1
+                    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                               initargs=(starts, generation))
+                
+                broken = False
+                while len(pending) < (1 if suspects else 2 * workers):
+                    source = suspects if suspects else requeued
+                    item = suspects.popleft() if suspects else next_job()
+                    if item is None:
+                        break
+                    try:
+                        pending[pool.submit(_run_stego_job, operation, item[1], timeout, item[0])] = item
+                    except BrokenProcessPool:
+                        source.appendleft(item)
+                        broken = True
+                        break
+                if not pending and not broken:
+                    break
+                
+                wait_for = None
+                if timeout is not None:
+                    collect_starts()
+                    deadlines = [running[index][1] + timeout + BATCH_TIMEOUT_GRACE
+                                 for index, _ in pending.values() if index in running]
+                    wait_for = min([BATCH_POLL_INTERVAL] + [d - time.time() for d in deadlines])
+                done = set()
+                if not broken:
+                    done, _ = wait(pending, timeout=max(0.0, wait_for) if wait_for is not None else None,
+                                   return_when=FIRST_COMPLETED)
+                    broken = any(isinstance(future.exception(), BrokenProcessPool)
+                                 for future in done if not future.cancelled())
+                
+                if broken:
+                    # A worker died outside our control; rerun what it took down on a new pool
+                    finished, unfinished = drop_pool()
+                    yield from finished
+                    if len(unfinished) == 1:
+                        # Nothing else was in flight, so this job killed the worker
+                        index, job = unfinished[0]
+                        crashes[index] = crashes.get(index, 0) + 1
+                        if crashes[index] > BATCH_CRASH_RETRIES:
+                            yield {'success': False, 'error': 'Worker process died while running the job',
+                                   'job_index': index}
+                        else:
+                            suspects.appendleft((index, job))
+                    else:
+                        suspects.extendleft(reversed(unfinished))
+                    continue
+                
+                for future in done:
+                    index, _ = pending.pop(future)
+                    running.pop(index, None)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {'success': False, 'error': str(e)}
+                    yield {**result, 'job_index': index}
+                
+                if timeout is None:
+                    continue
+                
+                # Kill workers whose job the in-worker timer could not interrupt
+                collect_starts()
+                now = time.time()
+                stuck = [future for future, (index, _) in pending.items()
+                         if index in running and now - running[index][1] > timeout + BATCH_TIMEOUT_GRACE]
+                if not stuck:
+                    continue
+                
+                # Killing a worker breaks the pool, so unfinished jobs are rerun on a new one
+                for future in stuck:
+                    try:
+                        os.kill(running[pending[future][0]][0], getattr(signal, 'SIGKILL', signal.SIGTERM))
+                    except OSError:
+                        pass
+                for future in stuck:
+                    index, _ = pending.pop(future)
+                    yield {'success': False, 'error': f'Job timed out after {timeout} seconds',
+                           'job_index': index}
+                finished, unfinished = drop_pool()
+                yield from finished
+                requeued.extendleft(reversed(unfinished))
+        finally:
+            for future in pending:
+                future.cancel()
+            if pool is not None:
+                pool.shutdown(wait=True)
+            if starts is not None:
+                starts.close()
+    
+    @staticmethod
+    def encode_batch(jobs, workers=None, timeout=None):
+        """
+        Hide messages in many cover files using a process pool
+        
+        Args:
+            jobs: Iterable of dicts with encode() arguments (cover_path,
+                message, output_path, file_type, compress)
+            workers: Number of worker processes (default: CPU count)
+            timeout: Per-job time limit in seconds (optional)
+            
+        Yields:
+            dict: encode() result plus 'job_index' (position in jobs),
+                in completion order
+        """
+        return SteganographyOperations._run_batch('encode', jobs, workers, timeout)
+    
+    @staticmethod
+    def decode_batch(jobs, workers=None, timeout=None):
+        """
+        Extract messages from many stego files using a process pool
+        
+        Args:
+            jobs: Iterable of dicts with decode() arguments (stego_path,
+                file_type, compressed)
+            workers: Number of worker processes (default: CPU count)
+            timeout: Per-job time limit in seconds (optional)
+            
+        Yields:
+            dict: decode() result plus 'job_index' (position in jobs),
+                in completion order
+        """
+        return SteganographyOperations._run_batch('decode', jobs, workers, timeout)
+    
     @staticmethod
     def check_capacity(cover_path, file_type='image'):
         """
@@ -1,19 +1,40 @@
-"""Crypto module initialization"""
-
-from .cipher import CaesarCipher, AESCipher, RSACipher, hybrid_encrypt, hybrid_decrypt
-from .classical import VigenereCipher, PlayfairCipher, RailFenceCipher
-from .modern import BlowfishCipher, DES3Cipher, ChaCha20Cipher
-
-__all__ = [
-    'CaesarCipher',
-    'AESCipher', 
-    'RSACipher',
-    'hybrid_encrypt',
-    'hybrid_decrypt',
-    'VigenereCipher',
-    'PlayfairCipher',
-    'RailFenceCipher',
-    'BlowfishCipher',
-    'DES3Cipher',
-    'ChaCha20Cipher'
-]
+"""Crypto module initialization
+
+Cipher classes are imported on first access (PEP 562), so importing this
+package does not load pycryptodome until an algorithm is used.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'CaesarCipher': '.cipher',
+    'AESCipher': '.cipher',
+    'RSACipher': '.cipher',
+    'hybrid_encrypt': '.cipher',
+    'hybrid_decrypt': '.cipher',
+    'VigenereCipher': '.classical',
+    'PlayfairCipher': '.classical',
+    'RailFenceCipher': '.classical',
+    'BlowfishCipher': '.modern',
+    'DES3Cipher': '.modern',
+    'ChaCha20Cipher': '.modern',
+    'encrypt_stream': '.stream',
+    'decrypt_stream': '.stream',
+    'SegmentReader': '.stream',
+    'RSAKeyPool': '.keypool',
+    'Keyring': '.keyring',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -8,9 +8,11 @@ from Crypto.PublicKey import RSA
 from Crypto.Random import get_random_bytes
 from Crypto.Util.Padding import pad, unpad
 import base64
-import hashlib
 import os
 
+from . import envelope
+from .keyring import keyring
+
 
 class CaesarCipher:
     """Caesar cipher implementation"""
@@ -62,21 +64,25 @@ class CaesarCipher:
         return result
 
 
-class AESCipher:
+class AESCipher(envelope.EnvelopeMixin):
     """AES-256 encryption/decryption"""
     
-    def __init__(self, key=None):
+    ENVELOPE_ALGORITHM = envelope.ALG_AES_CBC
+    
+    def __init__(self, key=None, kdf=None, cost=None):
         """
         Initialize AES cipher
         
         Args:
             key (bytes, optional): 32-byte key for AES-256. Generated if not provided.
+            kdf (str, optional): 'scrypt' (default) or 'pbkdf2' for a password key
+            cost (tuple, optional): KDF cost override, see src.crypto.kdf
         """
         if key is None:
             self.key = get_random_bytes(32)
         elif isinstance(key, str):
-            # Derive key from password using SHA-256
-            self.key = hashlib.sha256(key.encode()).digest()
+            # Derive key from password using a salted KDF
+            self._set_password(key, kdf, cost)
         else:
             if len(key) != 32:
                 raise ValueError("Key must be 32 bytes for AES-256")
@@ -95,12 +101,11 @@ class AESCipher:
         if isinstance(plaintext, str):
             plaintext = plaintext.encode('utf-8')
         
-        cipher = AES.new(self.key, AES.MODE_CBC)
-        ciphertext = cipher.encrypt(pad(plaintext, AES.block_size))
+        iv, ciphertext, _ = self._encrypt_raw(plaintext)
         
         return {
-            'ciphertext': base64.b64encode(ciphertext).decode('utf-8'),
-            'iv': base64.b64encode(cipher.iv).decode('utf-8'),
+            'ciphertext': self._armor(iv, ciphertext),
+            'iv': base64.b64encode(iv).decode('utf-8'),
             'key': base64.b64encode(self.key).decode('utf-8')
         }
     
@@ -115,27 +120,35 @@ class AESCipher:
         Returns:
             str: Decrypted plaintext
         """
-        ciphertext = base64.b64decode(ciphertext_b64)
-        iv = base64.b64decode(iv_b64)
-        
-        cipher = AES.new(self.key, AES.MODE_CBC, iv)
-        plaintext = unpad(cipher.decrypt(ciphertext), AES.block_size)
+        ciphertext, iv, tag, key = self._dearmor(ciphertext_b64, iv_b64)
         
-        return plaintext.decode('utf-8')
+        return self._decrypt_raw(ciphertext, iv, tag, key).decode('utf-8')
+    
+    def _encrypt_raw(self, plaintext):
+        """Encrypt bytes, returning (iv, ciphertext, tag)"""
+        cipher = AES.new(self.key, AES.MODE_CBC)
+        return cipher.iv, cipher.encrypt(pad(plaintext, AES.block_size)), b''
+    
+    def _decrypt_raw(self, ciphertext, iv, tag=b'', key=None):
+        """Decrypt bytes produced by _encrypt_raw, with this cipher's key by default"""
+        cipher = AES.new(key or self.key, AES.MODE_CBC, bytes(iv))
+        return unpad(cipher.decrypt(ciphertext), AES.block_size)
     
     @staticmethod
-    def encrypt_with_password(plaintext, password):
+    def encrypt_with_password(plaintext, password, kdf=None, cost=None):
         """
         Convenience method to encrypt with password
         
         Args:
             plaintext (str): Text to encrypt
             password (str): Password to derive key from
+            kdf (str, optional): 'scrypt' (default) or 'pbkdf2'
+            cost (tuple, optional): KDF cost override
             
         Returns:
             dict: Encrypted data with IV
         """
-        cipher = AESCipher(password)
+        cipher = AESCipher(password, kdf, cost)
         return cipher.encrypt(plaintext)
     
     @staticmethod
@@ -153,11 +166,61 @@ class AESCipher:
         """
         cipher = AESCipher(password)
         return cipher.decrypt(ciphertext_b64, iv_b64)
+    
+    def encrypt_stream(self, src, dst, chunk_size=None, workers=None):
+        """
+        Encrypt a binary stream with AES-256-GCM in fixed-size chunks
+        
+        Args:
+            src: Readable binary file object
+            dst: Writable binary file object
+            chunk_size (int, optional): Plaintext bytes per chunk (default 1 MiB)
+            workers (int, optional): Threads sealing chunks in parallel (default: CPU count)
+            
+        Returns:
+            dict: Contains 'algorithm', 'chunk_size', 'chunks' and 'bytes'
+        """
+        from . import stream
+        return stream.encrypt_stream(self.key, src, dst, 'aes', chunk_size or stream.DEFAULT_CHUNK_SIZE,
+                                     key_kdf=self.kdf, workers=workers)
+    
+    def decrypt_stream(self, src, dst, workers=None):
+        """
+        Decrypt a stream written by encrypt_stream
+        
+        Args:
+            src: Readable binary file object
+            dst: Writable binary file object
+            workers (int, optional): Threads opening chunks in parallel (default: CPU count)
+            
+        Returns:
+            dict: Contains 'algorithm', 'chunk_size', 'chunks' and 'bytes'
+        """
+        from . import stream
+        key = self._password if self._password is not None else self.key
+        return stream.decrypt_stream(key, src, dst, 'aes', workers=workers)
+    
+    def open_stream(self, src, cache_size=4):
+        """
+        Open a stream written by encrypt_stream for random-access reads
+        
+        Args:
+            src (str or file): Container path or readable, seekable binary file
+            cache_size (int): Number of decrypted segments to keep
+            
+        Returns:
+            SegmentReader: Seekable file-like plaintext view
+        """
+        from . import stream
+        key = self._password if self._password is not None else self.key
+        return stream.SegmentReader(src, key, cache_size)
 
 
-class RSACipher:
+class RSACipher(envelope.EnvelopeMixin):
     """RSA encryption/decryption"""
     
+    ENVELOPE_ALGORITHM = envelope.ALG_RSA_OAEP
+    
     def __init__(self, key_size=2048):
         """
         Initialize RSA cipher
@@ -169,10 +232,19 @@ class RSACipher:
         self.key_pair = None
         self.public_key = None
         self.private_key = None
+        # (key, PKCS1_OAEP cipher) reused while the key is unchanged
+        self._encryptor = None
+        self._decryptor = None
     
     def generate_key_pair(self):
-        """Generate RSA key pair"""
-        self.key_pair = RSA.generate(self.key_size)
+        """
+        Generate RSA key pair
+        
+        Takes a pre-generated key from the background pool when one has been
+        started (see src.crypto.keypool), otherwise generates inline.
+        """
+        from . import keypool
+        self.key_pair = keypool.take(self.key_size) or RSA.generate(self.key_size)
         self.public_key = self.key_pair.publickey()
         self.private_key = self.key_pair
         
@@ -188,7 +260,9 @@ class RSACipher:
         Args:
             public_key_pem (str): PEM formatted public key
         """
-        self.public_key = RSA.import_key(public_key_pem)
+        entry = keyring.public(public_key_pem)
+        self.public_key = entry.key
+        self._encryptor = (entry.key, entry.cipher)
     
     def load_private_key(self, private_key_pem):
         """
@@ -197,7 +271,9 @@ class RSACipher:
         Args:
             private_key_pem (str): PEM formatted private key
         """
-        self.private_key = RSA.import_key(private_key_pem)
+        entry = keyring.private(private_key_pem)
+        self.private_key = entry.key
+        self._decryptor = (entry.key, entry.cipher)
     
     def encrypt(self, plaintext):
         """
@@ -209,14 +285,10 @@ class RSACipher:
         Returns:
             str: Base64 encoded ciphertext
         """
-        if self.public_key is None:
-            raise ValueError("Public key not loaded")
-        
         if isinstance(plaintext, str):
             plaintext = plaintext.encode('utf-8')
         
-        cipher = PKCS1_OAEP.new(self.public_key)
-        ciphertext = cipher.encrypt(plaintext)
+        _, ciphertext, _ = self._encrypt_raw(plaintext)
         
         return base64.b64encode(ciphertext).decode('utf-8')
     
@@ -230,14 +302,27 @@ class RSACipher:
         Returns:
             str: Decrypted plaintext
         """
+        ciphertext = base64.b64decode(ciphertext_b64)
+        
+        return self._decrypt_raw(ciphertext, b'').decode('utf-8')
+    
+    def _encrypt_raw(self, plaintext):
+        """Encrypt bytes with the public key, returning (nonce, ciphertext, tag)"""
+        if self.public_key is None:
+            raise ValueError("Public key not loaded")
+        
+        if self._encryptor is None or self._encryptor[0] is not self.public_key:
+            self._encryptor = (self.public_key, PKCS1_OAEP.new(self.public_key))
+        return b'', self._encryptor[1].encrypt(plaintext), b''
+    
+    def _decrypt_raw(self, ciphertext, nonce=b'', tag=b'', key=None):
+        """Decrypt bytes with the private key"""
         if self.private_key is None:
             raise ValueError("Private key not loaded")
         
-        ciphertext = base64.b64decode(ciphertext_b64)
-        cipher = PKCS1_OAEP.new(self.private_key)
-        plaintext = cipher.decrypt(ciphertext)
-        
-        return plaintext.decode('utf-8')
+        if self._decryptor is None or self._decryptor[0] is not self.private_key:
+            self._decryptor = (self.private_key, PKCS1_OAEP.new(self.private_key))
+        return self._decryptor[1].decrypt(ciphertext)
     
     def save_keys(self, public_key_path, private_key_path):
         """
@@ -266,17 +351,19 @@ class RSACipher:
         """
         if public_key_path and os.path.exists(public_key_path):
             with open(public_key_path, 'rb') as f:
-                self.public_key = RSA.import_key(f.read())
+                self.load_public_key(f.read())
         
         if private_key_path and os.path.exists(private_key_path):
             with open(private_key_path, 'rb') as f:
-                self.private_key = RSA.import_key(f.read())
+                self.load_private_key(f.read())
 
 
 def hybrid_encrypt(plaintext, recipient_public_key_pem):
     """
     Hybrid encryption: Use AES for data, RSA for AES key
     
+    The recipient key is parsed once and reused through the keyring.
+    
     Args:
         plaintext (str): Text to encrypt
         recipient_public_key_pem (str): Recipient's RSA public key
@@ -289,9 +376,8 @@ def hybrid_encrypt(plaintext, recipient_public_key_pem):
     encrypted_data = aes_cipher.encrypt(plaintext)
     
     # Encrypt AES key with RSA
-    rsa_cipher = RSACipher()
-    rsa_cipher.load_public_key(recipient_public_key_pem)
-    encrypted_key = rsa_cipher.encrypt(aes_cipher.key)
+    rsa_oaep = keyring.public(recipient_public_key_pem).cipher
+    encrypted_key = base64.b64encode(rsa_oaep.encrypt(aes_cipher.key)).decode('utf-8')
     
     return {
         'encrypted_data': encrypted_data['ciphertext'],
@@ -313,10 +399,9 @@ def hybrid_decrypt(encrypted_data, iv, encrypted_key, private_key_pem):
     Returns:
         str: Decrypted plaintext
     """
-    # Decrypt AES key with RSA
-    rsa_cipher = RSACipher()
-    rsa_cipher.load_private_key(private_key_pem)
-    aes_key = base64.b64decode(rsa_cipher.decrypt(encrypted_key))
+    # Decrypt AES key with RSA (the raw key bytes, not text)
+    rsa_oaep = keyring.private(private_key_pem).cipher
+    aes_key = rsa_oaep.decrypt(base64.b64decode(encrypted_key))
     
     # Decrypt data with AES
     aes_cipher = AESCipher(aes_key)
@@ -0,0 +1,277 @@
+"""
+Ciphertext Envelope Module
+Compact binary container for encrypted messages
+
+Layout (big-endian):
+    magic (4) | version (1) | algorithm (1) | KDF (1) | KDF params length (2)
+    | KDF params | nonce length (1) | nonce | tag length (1) | tag | ciphertext
+
+Parsing returns memoryview slices of the input, so no field is copied
+until a cipher consumes it. The base64 dictionaries returned by the
+ciphers' encrypt() remain available as a text armor.
+"""
+
+import base64
+import struct
+from collections import namedtuple
+
+MAGIC = b'CSTE'
+VERSION = 1
+
+HEADER_FORMAT = '>4sBBBH'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# Algorithm ids
+ALG_AES_CBC = 1
+ALG_BLOWFISH_CBC = 2
+ALG_DES3_CBC = 3
+ALG_CHACHA20 = 4
+ALG_RSA_OAEP = 5
+
+ALGORITHM_NAMES = {
+    ALG_AES_CBC: 'aes',
+    ALG_BLOWFISH_CBC: 'blowfish',
+    ALG_DES3_CBC: 'des3',
+    ALG_CHACHA20: 'chacha20',
+    ALG_RSA_OAEP: 'rsa',
+}
+
+# Key derivation ids (parameters are encoded by src.crypto.kdf)
+KDF_NONE = 0    # Raw key, nothing derived
+KDF_SHA256 = 1  # Legacy unsalted SHA-256 of the password
+KDF_PBKDF2 = 2  # PBKDF2-HMAC-SHA256
+KDF_SCRYPT = 3  # scrypt
+
+Envelope = namedtuple('Envelope', 'algorithm kdf kdf_params nonce tag ciphertext')
+
+
+def pack(algorithm, ciphertext, nonce=b'', tag=b'', kdf=KDF_NONE, kdf_params=b''):
+    """
+    Build an envelope
+
+    Args:
+        algorithm (int): ALG_* id
+        ciphertext (bytes): Encrypted data
+        nonce (bytes): IV or nonce, up to 255 bytes
+        tag (bytes): Authentication tag, up to 255 bytes
+        kdf (int): KDF_* id describing how the key was derived
+        kdf_params (bytes): Encoded KDF parameters, up to 65535 bytes
+
+    Returns:
+        bytes: Encoded envelope
+    """
+    if algorithm not in ALGORITHM_NAMES:
+        raise ValueError(f"Unknown envelope algorithm id: {algorithm}")
+    if len(nonce) > 255 or len(tag) > 255 or len(kdf_params) > 0xFFFF:
+        raise ValueError("Envelope field too long")
+
+    return b''.join((
+        struct.pack(HEADER_FORMAT, MAGIC, VERSION, algorithm, kdf, len(kdf_params)),
+        kdf_params,
+        bytes((len(nonce),)), nonce,
+        bytes((len(tag),)), tag,
+        ciphertext
+    ))
+
+
+def _length_byte(view, pos):
+    """Read a one-byte field length"""
+    if pos >= len(view):
+        raise ValueError("Ciphertext envelope is truncated")
+    return view[pos]
+
+
+def _field(view, pos, length):
+    """Slice a field, returning (field, position after it)"""
+    if pos + length > len(view):
+        raise ValueError("Ciphertext envelope is truncated")
+    return view[pos:pos + length], pos + length
+
+
+def unpack(data):
+    """
+    Parse an envelope without copying its fields
+
+    Args:
+        data (bytes-like): Encoded envelope
+
+    Returns:
+        Envelope: Fields as memoryview slices of `data`
+
+    Raises:
+        ValueError: If the data is not a valid envelope
+    """
+    view = memoryview(data)
+    if len(view) < HEADER_SIZE:
+        raise ValueError("Not a ciphertext envelope: too short")
+
+    magic, version, algorithm, kdf, params_len = struct.unpack_from(HEADER_FORMAT, view)
+    if magic != MAGIC:
+        raise ValueError("Not a ciphertext envelope: bad magic")
+    if version != VERSION:
+        raise ValueError(f"Unsupported envelope version: {version}")
+    if algorithm not in ALGORITHM_NAMES:
+        raise ValueError(f"Unknown envelope algorithm id: {algorithm}")
+
+    kdf_params, pos = _field(view, HEADER_SIZE, params_len)
+    nonce, pos = _field(view, pos + 1, _length_byte(view, pos))
+    tag, pos = _field(view, pos + 1, _length_byte(view, pos))
+    return Envelope(algorithm, kdf, kdf_params, nonce, tag, view[pos:])
+
+
+def is_envelope(data):
+    """
+    Check whether data starts with the envelope magic
+
+    Args:
+        data (bytes-like): Candidate data
+
+    Returns:
+        bool: True if the data looks like an envelope
+    """
+    return bytes(data[:len(MAGIC)]) == MAGIC
+
+
+class EnvelopeMixin:
+    """
+    Adds envelopes and salted password keys to a cipher class
+    
+    The cipher sets ENVELOPE_ALGORITHM and implements
+    _encrypt_raw(plaintext) -> (nonce, ciphertext, tag) and
+    _decrypt_raw(ciphertext, nonce, tag, key=None) -> bytes.
+    
+    Password keys come from src.crypto.kdf. When a password is set, the
+    base64 'ciphertext' of the text armor holds a whole envelope so the
+    salt travels with it; armored data without one is legacy SHA-256.
+    Envelopes in the armor are also accepted with a raw key.
+    """
+    
+    ENVELOPE_ALGORITHM = None
+    
+    # Password the key is derived from, kept to derive keys for other salts
+    _password = None
+    
+    # KDF for the password key: (KDF id, cost override)
+    _kdf_choice = (None, None)
+    
+    _key = None
+    _kdf = (KDF_NONE, b'')
+    
+    @property
+    def key(self):
+        """Encryption key, derived from the password on first use"""
+        if self._key is None and self._password is not None:
+            self._derive_encryption_key()
+        return self._key
+    
+    @key.setter
+    def key(self, value):
+        self._key = value
+    
+    @property
+    def kdf(self):
+        """(KDF id, encoded params) recorded in emitted envelopes"""
+        if self._key is None and self._password is not None:
+            self._derive_encryption_key()
+        return self._kdf
+    
+    @kdf.setter
+    def kdf(self, value):
+        self._kdf = value
+    
+    def _key_from_material(self, material):
+        """Turn KDF output into this cipher's key"""
+        return material
+    
+    def _set_password(self, password, kdf=None, cost=None):
+        """
+        Use a password-derived key
+        
+        The salted derivation runs on the first encryption, so a cipher
+        used only for decryption derives just the keys its data needs.
+        """
+        from . import kdf as kdf_module
+        
+        self._password = password
+        self._kdf_choice = (kdf_module.kdf_id(kdf), cost)
+    
+    def _derive_encryption_key(self):
+        """Derive the encryption key and fresh KDF parameters from the password"""
+        from . import kdf
+        
+        kdf_id, cost = self._kdf_choice
+        material, params = kdf.encryption_key(self._password, kdf_id, cost)
+        self._key = self._key_from_material(material)
+        self._kdf = (params.kdf, params.encode())
+    
+    def _key_for(self, kdf_id, kdf_params):
+        """Key for data encrypted under the given KDF parameters, None for this cipher's key"""
+        if self._password is None or kdf_id == KDF_NONE or (kdf_id, bytes(kdf_params)) == self._kdf:
+            # A raw key (such as the 'key' returned by encrypt()) is used as given
+            return None
+        
+        from . import kdf
+        return self._key_from_material(kdf.derive_from(self._password, kdf_id, kdf_params))
+    
+    def _armor(self, nonce, ciphertext, tag=b''):
+        """Base64 'ciphertext' field for the text armor"""
+        if self._password is not None:
+            kdf, kdf_params = self.kdf
+            ciphertext = pack(self.ENVELOPE_ALGORITHM, ciphertext, nonce, tag, kdf, kdf_params)
+        return base64.b64encode(ciphertext).decode('utf-8')
+    
+    def _dearmor(self, ciphertext_b64, nonce_b64):
+        """
+        Decode text armor
+        
+        Returns:
+            tuple: (ciphertext, nonce, tag, key) ready for _decrypt_raw
+        """
+        raw = base64.b64decode(ciphertext_b64)
+        if is_envelope(raw):
+            envelope = self._unpack_own(raw)
+            return (envelope.ciphertext, envelope.nonce, envelope.tag,
+                    self._key_for(envelope.kdf, envelope.kdf_params))
+        if self._password is None:
+            return raw, base64.b64decode(nonce_b64), b'', None
+        return raw, base64.b64decode(nonce_b64), b'', self._key_for(KDF_SHA256, b'')
+    
+    def _unpack_own(self, data):
+        """Parse an envelope and check it belongs to this algorithm"""
+        envelope = unpack(data)
+        if envelope.algorithm != self.ENVELOPE_ALGORITHM:
+            raise ValueError(f"Envelope was encrypted with {ALGORITHM_NAMES[envelope.algorithm]}, "
+                             f"not {ALGORITHM_NAMES[self.ENVELOPE_ALGORITHM]}")
+        return envelope
+    
+    def encrypt_envelope(self, plaintext):
+        """
+        Encrypt plaintext into a binary envelope
+        
+        Args:
+            plaintext (str or bytes): Data to encrypt
+        
+        Returns:
+            bytes: Encoded envelope
+        """
+        if isinstance(plaintext, str):
+            plaintext = plaintext.encode('utf-8')
+        
+        nonce, ciphertext, tag = self._encrypt_raw(plaintext)
+        kdf, kdf_params = self.kdf
+        return pack(self.ENVELOPE_ALGORITHM, ciphertext, nonce, tag, kdf, kdf_params)
+    
+    def decrypt_envelope(self, data):
+        """
+        Decrypt a binary envelope
+        
+        Args:
+            data (bytes-like): Envelope produced by encrypt_envelope
+        
+        Returns:
+            str: Decrypted plaintext
+        """
+        envelope = self._unpack_own(data)
+        key = self._key_for(envelope.kdf, envelope.kdf_params)
+        
+        return self._decrypt_raw(envelope.ciphertext, envelope.nonce, envelope.tag, key).decode('utf-8')
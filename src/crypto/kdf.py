@@ -0,0 +1,309 @@
+"""
+Key Derivation Module
+Salted password-based key derivation (scrypt, PBKDF2) with a bounded cache
+
+Derived keys are memoised in an in-process LRU cache keyed by
+(password tag, KDF parameters) with a time-to-live, so bulk operations
+under one password pay the KDF cost once. Within the TTL, encryption also
+reuses the salt last generated for a password; every message still gets
+its own IV or nonce, so a reused key is safe.
+"""
+
+import hashlib
+import hmac
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from . import envelope
+
+KDF_SHA256 = envelope.KDF_SHA256
+KDF_PBKDF2 = envelope.KDF_PBKDF2
+KDF_SCRYPT = envelope.KDF_SCRYPT
+
+KDF_NAMES = {
+    KDF_SHA256: 'sha256',
+    KDF_PBKDF2: 'pbkdf2',
+    KDF_SCRYPT: 'scrypt',
+}
+
+KDF_IDS = {name: kdf for kdf, name in KDF_NAMES.items()}
+
+DEFAULT_KDF = KDF_SCRYPT
+SALT_SIZE = 16
+KEY_SIZE = 32
+
+# Default cost: scrypt (log2 N, r, p) and PBKDF2-HMAC-SHA256 iterations
+SCRYPT_COST = (15, 8, 1)
+PBKDF2_COST = (600000,)
+
+# Upper bounds accepted when decoding parameters from untrusted data. scrypt
+# is capped on its total cost: memory is 128 * r * N bytes and p multiplies
+# the CPU time, so bounding each field separately would still allow GiBs.
+MAX_SCRYPT_LOG2_N = 20
+MAX_SCRYPT_MEMORY = 256 * 1024 * 1024
+MAX_SCRYPT_P = 16
+MAX_PBKDF2_ITERATIONS = 10000000
+
+CACHE_SIZE = 128
+CACHE_TTL = 300.0
+
+# Per-process secret so cache keys are not plain password hashes
+_CACHE_PEPPER = os.urandom(32)
+
+
+def _check_cost(kdf, cost):
+    """Return cost as a tuple, raising ValueError if it exceeds the bounds"""
+    cost = tuple(cost)
+    if kdf == KDF_SCRYPT:
+        if len(cost) != 3:
+            raise ValueError(f"scrypt cost must be (log2 N, r, p): {cost}")
+        log2_n, r, p = cost
+        if not (1 <= log2_n <= MAX_SCRYPT_LOG2_N and r >= 1 and 1 <= p <= MAX_SCRYPT_P
+                and 128 * r * (1 << log2_n) <= MAX_SCRYPT_MEMORY):
+            raise ValueError(f"scrypt cost out of range: {cost}")
+    elif kdf == KDF_PBKDF2:
+        if len(cost) != 1 or not 1 <= cost[0] <= MAX_PBKDF2_ITERATIONS:
+            raise ValueError(f"PBKDF2 iterations out of range: {cost}")
+    return cost
+
+
+class KDFParams(namedtuple('KDFParams', 'kdf salt cost')):
+    """
+    Key derivation parameters
+    
+    Attributes:
+        kdf (int): KDF_* id
+        salt (bytes): Random salt (empty for the legacy SHA-256 KDF)
+        cost (tuple): (log2 N, r, p) for scrypt, (iterations,) for PBKDF2
+    """
+    
+    __slots__ = ()
+    
+    def encode(self):
+        """
+        Encode the parameters for an envelope or stream header
+        
+        Returns:
+            bytes: Cost fields followed by the salt
+        """
+        if self.kdf == KDF_SCRYPT:
+            return struct.pack('>BBB', *self.cost) + self.salt
+        if self.kdf == KDF_PBKDF2:
+            return struct.pack('>I', *self.cost) + self.salt
+        return b''
+    
+    @classmethod
+    def decode(cls, kdf, data):
+        """
+        Decode parameters read from an envelope or stream header
+        
+        Args:
+            kdf (int): KDF_* id
+            data (bytes-like): Encoded parameters
+        
+        Returns:
+            KDFParams: Parsed parameters
+        
+        Raises:
+            ValueError: If the KDF is unknown or the cost is out of range
+        """
+        data = bytes(data)
+        if kdf == KDF_SHA256:
+            return cls(kdf, b'', ())
+        if kdf == KDF_SCRYPT and len(data) > 3:
+            return cls(kdf, data[3:], _check_cost(kdf, struct.unpack('>BBB', data[:3])))
+        if kdf == KDF_PBKDF2 and len(data) > 4:
+            return cls(kdf, data[4:], _check_cost(kdf, struct.unpack('>I', data[:4])))
+        raise ValueError(f"Unsupported or malformed KDF parameters (id {kdf})")
+
+
+class KeyCache:
+    """Thread-safe LRU cache with per-entry time-to-live"""
+    
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL):
+        """
+        Args:
+            maxsize (int): Maximum number of entries
+            ttl (float): Seconds an entry stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return a cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop every entry and reset the statistics"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self):
+        """
+        Returns:
+            dict: Contains 'size', 'maxsize', 'ttl', 'hits' and 'misses'
+        """
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+cache = KeyCache()
+
+
+def _password_tag(password):
+    """Keyed hash identifying a password in cache keys"""
+    if isinstance(password, str):
+        password = password.encode('utf-8')
+    return hmac.new(_CACHE_PEPPER, password, hashlib.sha256).digest()
+
+
+def _run_kdf(password, params):
+    """Derive KEY_SIZE bytes without caching"""
+    password = password.encode('utf-8') if isinstance(password, str) else bytes(password)
+    if params.kdf == KDF_SCRYPT:
+        log2_n, r, p = params.cost
+        n = 1 << log2_n
+        return hashlib.scrypt(password, salt=params.salt, n=n, r=r, p=p,
+                              maxmem=MAX_SCRYPT_MEMORY + 1024 * 1024, dklen=KEY_SIZE)
+    if params.kdf == KDF_PBKDF2:
+        return hashlib.pbkdf2_hmac('sha256', password, params.salt, params.cost[0], KEY_SIZE)
+    if params.kdf == KDF_SHA256:
+        # Legacy unsalted derivation, kept to decrypt existing data
+        return hashlib.sha256(password).digest()
+    raise ValueError(f"Unsupported KDF id: {params.kdf}")
+
+
+def kdf_id(kdf):
+    """
+    Resolve a KDF given by name or id
+
+    Args:
+        kdf (str, int or None): 'scrypt', 'pbkdf2', a KDF_* id, or None for DEFAULT_KDF
+
+    Returns:
+        int: KDF_* id
+    """
+    if kdf is None:
+        return DEFAULT_KDF
+    if isinstance(kdf, str):
+        if kdf.lower() not in KDF_IDS:
+            raise ValueError(f"Unknown KDF: {kdf}")
+        return KDF_IDS[kdf.lower()]
+    return kdf
+
+
+def new_params(kdf=DEFAULT_KDF, cost=None):
+    """
+    Create parameters with a fresh random salt
+
+    Args:
+        kdf (int): KDF_SCRYPT or KDF_PBKDF2
+        cost (tuple, optional): Cost override, defaults to SCRYPT_COST/PBKDF2_COST
+
+    Returns:
+        KDFParams: New parameters
+
+    Raises:
+        ValueError: If the KDF is unsupported or the cost is out of range
+    """
+    if kdf == KDF_SCRYPT:
+        cost = cost or SCRYPT_COST
+    elif kdf == KDF_PBKDF2:
+        cost = cost or PBKDF2_COST
+    else:
+        raise ValueError(f"Unsupported KDF id for new keys: {kdf}")
+    # Reject costs that decoding would refuse, so nothing undecryptable is written
+    return KDFParams(kdf, os.urandom(SALT_SIZE), _check_cost(kdf, cost))
+
+
+def derive_key(password, params):
+    """
+    Derive a key, using the cache when possible
+
+    Args:
+        password (str or bytes): Password
+        params (KDFParams): Derivation parameters
+
+    Returns:
+        bytes: KEY_SIZE-byte key material
+    """
+    if params.kdf == KDF_SHA256:
+        return _run_kdf(password, params)
+
+    cache_key = ('key', _password_tag(password), params)
+    key = cache.get(cache_key)
+    if key is None:
+        key = _run_kdf(password, params)
+        cache.put(cache_key, key)
+    return key
+
+
+def derive_from(password, kdf, data):
+    """
+    Derive the key for data whose KDF parameters were read from a header
+
+    Args:
+        password (str or bytes): Password
+        kdf (int): KDF_* id
+        data (bytes-like): Encoded parameters
+
+    Returns:
+        bytes: KEY_SIZE-byte key material
+    """
+    return derive_key(password, KDFParams.decode(kdf, data))
+
+
+def encryption_key(password, kdf=DEFAULT_KDF, cost=None):
+    """
+    Key and parameters for encrypting under a password
+
+    The salt generated for a password is reused until its cache entry
+    expires, so consecutive encryptions derive the key only once.
+
+    Args:
+        password (str or bytes): Password
+        kdf (int): KDF_SCRYPT or KDF_PBKDF2
+        cost (tuple, optional): Cost override
+
+    Returns:
+        tuple: (key material, KDFParams)
+    """
+    probe = new_params(kdf, cost)
+    cache_key = ('salt', _password_tag(password), probe.kdf, probe.cost)
+    params = cache.get(cache_key)
+    if params is None:
+        params = probe
+        cache.put(cache_key, params)
+    return derive_key(password, params), params
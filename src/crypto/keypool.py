@@ -0,0 +1,222 @@
+"""
+RSA Key Pool Module
+Pre-generates RSA key pairs in background processes
+
+An optional service: once a pool is started, RSACipher.generate_key_pair
+takes a ready key in O(1) and only generates inline when the pool for
+that size is empty. Pools refill themselves up to a high-water mark.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_SIZES = (2048,)
+DEFAULT_HIGH_WATER = 4
+
+_default_pool = None
+_default_lock = threading.Lock()
+
+
+def _generate_components(key_size):
+    """Generate a key in a worker process, returning its integer components"""
+    from Crypto.PublicKey import RSA
+
+    key = RSA.generate(key_size)
+    return key.n, key.e, key.d, key.p, key.q
+
+
+class RSAKeyPool:
+    """Background pool of pre-generated RSA keys"""
+    
+    def __init__(self, sizes=DEFAULT_SIZES, high_water=DEFAULT_HIGH_WATER, workers=1):
+        """
+        Args:
+            sizes (iterable): RSA key sizes to keep ready
+            high_water (int): Keys to hold per size
+            workers (int): Background generator processes
+        """
+        if high_water < 1:
+            raise ValueError("high_water must be at least 1")
+        
+        self.sizes = tuple(sizes)
+        self.high_water = high_water
+        self.workers = workers
+        self._keys = {size: deque() for size in self.sizes}
+        self._pending = {size: 0 for size in self.sizes}
+        self._hits = 0
+        self._misses = 0
+        self._generated = 0
+        self._failures = 0
+        self._executor = None
+        self._futures = set()
+        self._closed = False
+        self._cond = threading.Condition()
+    
+    def start(self):
+        """Start the generator processes and fill every pool"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Key pool has been shut down")
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            for size in self.sizes:
+                self._refill(size)
+        return self
+    
+    def _refill(self, size):
+        """Submit generation jobs up to the high-water mark (lock held)"""
+        if self._executor is None or self._closed:
+            return
+        while len(self._keys[size]) + self._pending[size] < self.high_water:
+            future = self._executor.submit(_generate_components, size)
+            self._pending[size] += 1
+            self._futures.add(future)
+            future.add_done_callback(lambda f, size=size: self._on_generated(size, f))
+    
+    def _on_generated(self, size, future):
+        """Store a finished key (runs on the executor's callback thread)"""
+        with self._cond:
+            self._pending[size] -= 1
+            self._futures.discard(future)
+            if future.cancelled() or self._closed:
+                pass
+            elif future.exception() is not None:
+                self._failures += 1
+            else:
+                from Crypto.PublicKey import RSA
+                self._keys[size].append(RSA.construct(future.result(), consistency_check=False))
+                self._generated += 1
+            self._cond.notify_all()
+    
+    def get(self, key_size):
+        """
+        Take a pre-generated key
+        
+        Args:
+            key_size (int): RSA key size in bits
+        
+        Returns:
+            RsaKey or None: A ready key, None if the pool for this size is empty
+        """
+        with self._cond:
+            keys = self._keys.get(key_size)
+            if not keys:
+                self._misses += 1
+                return None
+            key = keys.popleft()
+            self._hits += 1
+            self._refill(key_size)
+            return key
+    
+    def wait(self, timeout=None):
+        """
+        Block until every pool is at its high-water mark
+        
+        Args:
+            timeout (float, optional): Maximum seconds to wait
+        
+        Returns:
+            bool: True if the pools are full
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: all(len(keys) >= self.high_water for keys in self._keys.values()),
+                timeout
+            )
+    
+    def stats(self):
+        """
+        Pool metrics
+        
+        Returns:
+            dict: Contains 'hits', 'misses', 'hit_rate', 'generated',
+                'failures', 'available' and 'pending' (per size)
+        """
+        with self._cond:
+            requests = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / requests if requests else 0.0,
+                'generated': self._generated,
+                'failures': self._failures,
+                'available': {size: len(keys) for size, keys in self._keys.items()},
+                'pending': dict(self._pending)
+            }
+    
+    def shutdown(self, wait=True):
+        """
+        Stop generating keys and drop the ones held
+        
+        Args:
+            wait (bool): Wait for running generator processes to exit
+        """
+        with self._cond:
+            self._closed = True
+            executor, self._executor = self._executor, None
+            futures = list(self._futures)
+            for keys in self._keys.values():
+                keys.clear()
+        for future in futures:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=wait)
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+
+def start_default_pool(sizes=DEFAULT_SIZES, high_water=DEFAULT_HIGH_WATER, workers=1):
+    """
+    Start the process-wide pool used by RSACipher.generate_key_pair
+
+    Args:
+        sizes (iterable): RSA key sizes to keep ready
+        high_water (int): Keys to hold per size
+        workers (int): Background generator processes
+
+    Returns:
+        RSAKeyPool: The started pool (replacing any previous one)
+    """
+    global _default_pool
+    pool = RSAKeyPool(sizes, high_water, workers).start()
+    with _default_lock:
+        previous, _default_pool = _default_pool, pool
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return pool
+
+
+def stop_default_pool(wait=True):
+    """Shut down the process-wide pool, if any"""
+    global _default_pool
+    with _default_lock:
+        pool, _default_pool = _default_pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+
+def default_pool():
+    """
+    Returns:
+        RSAKeyPool or None: The process-wide pool, if started
+    """
+    return _default_pool
+
+
+def take(key_size):
+    """
+    Take a key from the process-wide pool
+
+    Args:
+        key_size (int): RSA key size in bits
+
+    Returns:
+        RsaKey or None: A ready key, None if no pool is running or it is empty
+    """
+    pool = _default_pool
+    return pool.get(key_size) if pool is not None else None
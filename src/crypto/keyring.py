@@ -0,0 +1,124 @@
+"""
+RSA Keyring Module
+Thread-safe LRU cache of parsed RSA keys and their PKCS1_OAEP ciphers
+
+PEM parsing (especially private keys) dominates the cost of encrypting
+many small messages to the same recipient. Entries are keyed by a SHA-256
+fingerprint of the PEM text, which is far cheaper to compute than an
+import, and hold the parsed key together with a reusable cipher context.
+PKCS1_OAEP ciphers keep no per-message state, so one context is shared by
+all threads.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+from Crypto.Cipher import PKCS1_OAEP
+from Crypto.PublicKey import RSA
+
+DEFAULT_MAXSIZE = 64
+
+KeyEntry = namedtuple('KeyEntry', 'fingerprint key cipher')
+
+
+def fingerprint(pem):
+    """
+    Fingerprint of a PEM encoded key
+
+    Args:
+        pem (str or bytes): PEM text
+
+    Returns:
+        str: Hex SHA-256 of the PEM with surrounding whitespace removed
+    """
+    if isinstance(pem, str):
+        pem = pem.encode('utf-8')
+    return hashlib.sha256(pem.strip()).hexdigest()
+
+
+class Keyring:
+    """Thread-safe LRU cache of parsed RSA keys"""
+    
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        """
+        Args:
+            maxsize (int): Maximum number of cached keys
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _entry(self, pem, private):
+        cache_key = (fingerprint(pem), private)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        
+        # Parse outside the lock so other threads are not held up
+        key = RSA.import_key(pem)
+        if private and not key.has_private():
+            raise ValueError("Not a private key")
+        if not private:
+            key = key.publickey()
+        entry = KeyEntry(cache_key[0], key, PKCS1_OAEP.new(key))
+        
+        with self._lock:
+            entry = self._entries.setdefault(cache_key, entry)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+    
+    def public(self, pem):
+        """
+        Parsed public key and encryption context
+        
+        Args:
+            pem (str or bytes): PEM public (or private) key
+        
+        Returns:
+            KeyEntry: (fingerprint, RsaKey, PKCS1_OAEP cipher)
+        """
+        return self._entry(pem, False)
+    
+    def private(self, pem):
+        """
+        Parsed private key and decryption context
+        
+        Args:
+            pem (str or bytes): PEM private key
+        
+        Returns:
+            KeyEntry: (fingerprint, RsaKey, PKCS1_OAEP cipher)
+        """
+        return self._entry(pem, True)
+    
+    def clear(self):
+        """Drop every cached key and reset the statistics"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self):
+        """
+        Returns:
+            dict: Contains 'size', 'maxsize', 'hits' and 'misses'
+        """
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+keyring = Keyring()
@@ -6,26 +6,30 @@ Includes Blowfish, DES, 3DES encryption algorithms
 from Crypto.Cipher import Blowfish, DES3
 from Crypto.Random import get_random_bytes
 from Crypto.Util.Padding import pad, unpad
-import hashlib
 import base64
 
+from . import envelope
 
-class BlowfishCipher:
+
+class BlowfishCipher(envelope.EnvelopeMixin):
     """Blowfish cipher - fast block cipher designed by Bruce Schneier"""
     
-    def __init__(self, key=None):
+    ENVELOPE_ALGORITHM = envelope.ALG_BLOWFISH_CBC
+    
+    def __init__(self, key=None, kdf=None, cost=None):
         """
         Initialize Blowfish cipher
         
         Args:
             key (bytes or str): Key for Blowfish (4-56 bytes, default 16)
+            kdf (str, optional): 'scrypt' (default) or 'pbkdf2' for a password key
+            cost (tuple, optional): KDF cost override, see src.crypto.kdf
         """
         if key is None:
             self.key = get_random_bytes(16)
         elif isinstance(key, str):
-            # Derive key from password using SHA-256, truncate to 32 bytes
-            derived = hashlib.sha256(key.encode()).digest()
-            self.key = derived[:32]  # Blowfish supports up to 56 bytes, we use 32
+            # Derive a 32-byte key from password using a salted KDF
+            self._set_password(key, kdf, cost)  # Blowfish supports up to 56 bytes, we use 32
         else:
             if len(key) < 4 or len(key) > 56:
                 raise ValueError("Blowfish key must be between 4 and 56 bytes")
@@ -44,12 +48,11 @@ class BlowfishCipher:
         if isinstance(plaintext, str):
             plaintext = plaintext.encode('utf-8')
         
-        cipher = Blowfish.new(self.key, Blowfish.MODE_CBC)
-        ciphertext = cipher.encrypt(pad(plaintext, Blowfish.block_size))
+        iv, ciphertext, _ = self._encrypt_raw(plaintext)
         
         return {
-            'ciphertext': base64.b64encode(ciphertext).decode('utf-8'),
-            'iv': base64.b64encode(cipher.iv).decode('utf-8'),
+            'ciphertext': self._armor(iv, ciphertext),
+            'iv': base64.b64encode(iv).decode('utf-8'),
             'key': base64.b64encode(self.key).decode('utf-8')
         }
     
@@ -64,27 +67,35 @@ class BlowfishCipher:
         Returns:
             str: Decrypted plaintext
         """
-        ciphertext = base64.b64decode(ciphertext_b64)
-        iv = base64.b64decode(iv_b64)
+        ciphertext, iv, tag, key = self._dearmor(ciphertext_b64, iv_b64)
         
-        cipher = Blowfish.new(self.key, Blowfish.MODE_CBC, iv)
-        plaintext = unpad(cipher.decrypt(ciphertext), Blowfish.block_size)
-        
-        return plaintext.decode('utf-8')
+        return self._decrypt_raw(ciphertext, iv, tag, key).decode('utf-8')
+    
+    def _encrypt_raw(self, plaintext):
+        """Encrypt bytes, returning (iv, ciphertext, tag)"""
+        cipher = Blowfish.new(self.key, Blowfish.MODE_CBC)
+        return cipher.iv, cipher.encrypt(pad(plaintext, Blowfish.block_size)), b''
+    
+    def _decrypt_raw(self, ciphertext, iv, tag=b'', key=None):
+        """Decrypt bytes produced by _encrypt_raw, with this cipher's key by default"""
+        cipher = Blowfish.new(key or self.key, Blowfish.MODE_CBC, bytes(iv))
+        return unpad(cipher.decrypt(ciphertext), Blowfish.block_size)
     
     @staticmethod
-    def encrypt_with_password(plaintext, password):
+    def encrypt_with_password(plaintext, password, kdf=None, cost=None):
         """
         Convenience method to encrypt with password
         
         Args:
             plaintext (str): Text to encrypt
             password (str): Password to derive key from
+            kdf (str, optional): 'scrypt' (default) or 'pbkdf2'
+            cost (tuple, optional): KDF cost override
             
         Returns:
             dict: Encrypted data with IV
         """
-        cipher = BlowfishCipher(password)
+        cipher = BlowfishCipher(password, kdf, cost)
         return cipher.encrypt(plaintext)
     
     @staticmethod
@@ -104,28 +115,34 @@ class BlowfishCipher:
         return cipher.decrypt(ciphertext_b64, iv_b64)
 
 
-class DES3Cipher:
+class DES3Cipher(envelope.EnvelopeMixin):
     """Triple DES cipher - applies DES three times for enhanced security"""
     
-    def __init__(self, key=None):
+    ENVELOPE_ALGORITHM = envelope.ALG_DES3_CBC
+    
+    def __init__(self, key=None, kdf=None, cost=None):
         """
         Initialize 3DES cipher
         
         Args:
             key (bytes or str): Key for 3DES (must be 16 or 24 bytes)
+            kdf (str, optional): 'scrypt' (default) or 'pbkdf2' for a password key
+            cost (tuple, optional): KDF cost override, see src.crypto.kdf
         """
         if key is None:
             self.key = DES3.adjust_key_parity(get_random_bytes(24))
         elif isinstance(key, str):
-            # Derive key from password using SHA-256
-            derived = hashlib.sha256(key.encode()).digest()
-            # Take first 24 bytes and adjust parity
-            self.key = DES3.adjust_key_parity(derived[:24])
+            # Derive key from password using a salted KDF
+            self._set_password(key, kdf, cost)
         else:
             if len(key) not in [16, 24]:
                 raise ValueError("3DES key must be 16 or 24 bytes")
             self.key = DES3.adjust_key_parity(key)
     
+    def _key_from_material(self, material):
+        """Take the first 24 bytes of KDF output and adjust parity"""
+        return DES3.adjust_key_parity(material[:24])
+    
     def encrypt(self, plaintext):
         """
         Encrypt plaintext using 3DES in CBC mode
@@ -139,12 +156,11 @@ class DES3Cipher:
         if isinstance(plaintext, str):
             plaintext = plaintext.encode('utf-8')
         
-        cipher = DES3.new(self.key, DES3.MODE_CBC)
-        ciphertext = cipher.encrypt(pad(plaintext, DES3.block_size))
+        iv, ciphertext, _ = self._encrypt_raw(plaintext)
         
         return {
-            'ciphertext': base64.b64encode(ciphertext).decode('utf-8'),
-            'iv': base64.b64encode(cipher.iv).decode('utf-8'),
+            'ciphertext': self._armor(iv, ciphertext),
+            'iv': base64.b64encode(iv).decode('utf-8'),
             'key': base64.b64encode(self.key).decode('utf-8')
         }
     
@@ -159,27 +175,35 @@ class DES3Cipher:
         Returns:
             str: Decrypted plaintext
         """
-        ciphertext = base64.b64decode(ciphertext_b64)
-        iv = base64.b64decode(iv_b64)
-        
-        cipher = DES3.new(self.key, DES3.MODE_CBC, iv)
-        plaintext = unpad(cipher.decrypt(ciphertext), DES3.block_size)
+        ciphertext, iv, tag, key = self._dearmor(ciphertext_b64, iv_b64)
         
-        return plaintext.decode('utf-8')
+        return self._decrypt_raw(ciphertext, iv, tag, key).decode('utf-8')
+    
+    def _encrypt_raw(self, plaintext):
+        """Encrypt bytes, returning (iv, ciphertext, tag)"""
+        cipher = DES3.new(self.key, DES3.MODE_CBC)
+        return cipher.iv, cipher.encrypt(pad(plaintext, DES3.block_size)), b''
+    
+    def _decrypt_raw(self, ciphertext, iv, tag=b'', key=None):
+        """Decrypt bytes produced by _encrypt_raw, with this cipher's key by default"""
+        cipher = DES3.new(key or self.key, DES3.MODE_CBC, bytes(iv))
+        return unpad(cipher.decrypt(ciphertext), DES3.block_size)
     
     @staticmethod
-    def encrypt_with_password(plaintext, password):
+    def encrypt_with_password(plaintext, password, kdf=None, cost=None):
         """
         Convenience method to encrypt with password
         
         Args:
             plaintext (str): Text to encrypt
             password (str): Password to derive key from
+            kdf (str, optional): 'scrypt' (default) or 'pbkdf2'
+            cost (tuple, optional): KDF cost override
             
         Returns:
             dict: Encrypted data with IV
         """
-        cipher = DES3Cipher(password)
+        cipher = DES3Cipher(password, kdf, cost)
         return cipher.encrypt(plaintext)
     
     @staticmethod
@@ -199,21 +223,25 @@ class DES3Cipher:
         return cipher.decrypt(ciphertext_b64, iv_b64)
 
 
-class ChaCha20Cipher:
+class ChaCha20Cipher(envelope.EnvelopeMixin):
     """ChaCha20 stream cipher - modern, fast, and secure"""
     
-    def __init__(self, key=None):
+    ENVELOPE_ALGORITHM = envelope.ALG_CHACHA20
+    
+    def __init__(self, key=None, kdf=None, cost=None):
         """
         Initialize ChaCha20 cipher
         
         Args:
             key (bytes or str): Key for ChaCha20 (must be 32 bytes)
+            kdf (str, optional): 'scrypt' (default) or 'pbkdf2' for a password key
+            cost (tuple, optional): KDF cost override, see src.crypto.kdf
         """
         if key is None:
             self.key = get_random_bytes(32)
         elif isinstance(key, str):
-            # Derive key from password using SHA-256
-            self.key = hashlib.sha256(key.encode()).digest()
+            # Derive key from password using a salted KDF
+            self._set_password(key, kdf, cost)
         else:
             if len(key) != 32:
                 raise ValueError("ChaCha20 key must be 32 bytes")
@@ -229,17 +257,14 @@ class ChaCha20Cipher:
         Returns:
             dict: Contains 'ciphertext', 'nonce', and 'key'
         """
-        from Crypto.Cipher import ChaCha20
-        
         if isinstance(plaintext, str):
             plaintext = plaintext.encode('utf-8')
         
-        cipher = ChaCha20.new(key=self.key)
-        ciphertext = cipher.encrypt(plaintext)
+        nonce, ciphertext, _ = self._encrypt_raw(plaintext)
         
         return {
-            'ciphertext': base64.b64encode(ciphertext).decode('utf-8'),
-            'nonce': base64.b64encode(cipher.nonce).decode('utf-8'),
+            'ciphertext': self._armor(nonce, ciphertext),
+            'nonce': base64.b64encode(nonce).decode('utf-8'),
             'key': base64.b64encode(self.key).decode('utf-8')
         }
     
@@ -254,29 +279,39 @@ class ChaCha20Cipher:
         Returns:
             str: Decrypted plaintext
         """
-        from Crypto.Cipher import ChaCha20
+        ciphertext, nonce, tag, key = self._dearmor(ciphertext_b64, nonce_b64)
         
-        ciphertext = base64.b64decode(ciphertext_b64)
-        nonce = base64.b64decode(nonce_b64)
+        return self._decrypt_raw(ciphertext, nonce, tag, key).decode('utf-8')
+    
+    def _encrypt_raw(self, plaintext):
+        """Encrypt bytes, returning (nonce, ciphertext, tag)"""
+        from Crypto.Cipher import ChaCha20
         
-        cipher = ChaCha20.new(key=self.key, nonce=nonce)
-        plaintext = cipher.decrypt(ciphertext)
+        cipher = ChaCha20.new(key=self.key)
+        return cipher.nonce, cipher.encrypt(plaintext), b''
+    
+    def _decrypt_raw(self, ciphertext, nonce, tag=b'', key=None):
+        """Decrypt bytes produced by _encrypt_raw, with this cipher's key by default"""
+        from Crypto.Cipher import ChaCha20
         
-        return plaintext.decode('utf-8')
+        cipher = ChaCha20.new(key=key or self.key, nonce=bytes(nonce))
+        return cipher.decrypt(ciphertext)
     
     @staticmethod
-    def encrypt_with_password(plaintext, password):
+    def encrypt_with_password(plaintext, password, kdf=None, cost=None):
         """
         Convenience method to encrypt with password
         
         Args:
             plaintext (str): Text to encrypt
             password (str): Password to derive key from
+            kdf (str, optional): 'scrypt' (default) or 'pbkdf2'
+            cost (tuple, optional): KDF cost override
             
         Returns:
             dict: Encrypted data with nonce
         """
-        cipher = ChaCha20Cipher(password)
+        cipher = ChaCha20Cipher(password, kdf, cost)
         return cipher.encrypt(plaintext)
     
     @staticmethod
@@ -294,3 +329,51 @@ class ChaCha20Cipher:
         """
         cipher = ChaCha20Cipher(password)
         return cipher.decrypt(ciphertext_b64, nonce_b64)
+    
+    def encrypt_stream(self, src, dst, chunk_size=None, workers=None):
+        """
+        Encrypt a binary stream with ChaCha20-Poly1305 in fixed-size chunks
+        
+        Args:
+            src: Readable binary file object
+            dst: Writable binary file object
+            chunk_size (int, optional): Plaintext bytes per chunk (default 1 MiB)
+            workers (int, optional): Threads sealing chunks in parallel (default: CPU count)
+            
+        Returns:
+            dict: Contains 'algorithm', 'chunk_size', 'chunks' and 'bytes'
+        """
+        from . import stream
+        return stream.encrypt_stream(self.key, src, dst, 'chacha20', chunk_size or stream.DEFAULT_CHUNK_SIZE,
+                                     key_kdf=self.kdf, workers=workers)
+    
+    def decrypt_stream(self, src, dst, workers=None):
+        """
+        Decrypt a stream written by encrypt_stream
+        
+        Args:
+            src: Readable binary file object
+            dst: Writable binary file object
+            workers (int, optional): Threads opening chunks in parallel (default: CPU count)
+            
+        Returns:
+            dict: Contains 'algorithm', 'chunk_size', 'chunks' and 'bytes'
+        """
+        from . import stream
+        key = self._password if self._password is not None else self.key
+        return stream.decrypt_stream(key, src, dst, 'chacha20', workers=workers)
+    
+    def open_stream(self, src, cache_size=4):
+        """
+        Open a stream written by encrypt_stream for random-access reads
+        
+        Args:
+            src (str or file): Container path or readable, seekable binary file
+            cache_size (int): Number of decrypted segments to keep
+            
+        Returns:
+            SegmentReader: Seekable file-like plaintext view
+        """
+        from . import stream
+        key = self._password if self._password is not None else self.key
+        return stream.SegmentReader(src, key, cache_size)
@@ -0,0 +1,231 @@
+"""
+Algorithm Registry Module
+Maps algorithm names to codecs that import their cipher backends on first use
+"""
+
+import importlib
+
+
+class Codec:
+    """
+    Base class for registered algorithms
+    
+    Subclasses implement encrypt/decrypt returning the result dictionaries
+    used by CryptoOperations. The backend class is imported lazily, so
+    registering an algorithm costs nothing until it is used.
+    """
+    
+    def __init__(self, name, backend_path):
+        """
+        Args:
+            name (str): Canonical algorithm name reported in results
+            backend_path (str): 'module:Class' of the backend, relative
+                modules are resolved against this package
+        """
+        self.name = name
+        self.backend_path = backend_path
+        self._backend = None
+    
+    @property
+    def backend(self):
+        """Backend class, imported on first access"""
+        if self._backend is None:
+            module_name, class_name = self.backend_path.split(':')
+            module = importlib.import_module(module_name, __package__)
+            self._backend = getattr(module, class_name)
+        return self._backend
+    
+    def encrypt(self, text, key=None, shift=3):
+        """Encrypt text, returning a CryptoOperations result dictionary"""
+        raise NotImplementedError
+    
+    def decrypt(self, ciphertext, key=None, shift=3, iv=None, nonce=None, private_key=None):
+        """Decrypt ciphertext, returning a CryptoOperations result dictionary"""
+        raise NotImplementedError
+
+
+class ShiftCodec(Codec):
+    """Caesar-style cipher keyed by an integer shift"""
+    
+    def encrypt(self, text, key=None, shift=3):
+        return {
+            'success': True,
+            'ciphertext': self.backend.encrypt(text, shift),
+            'algorithm': self.name
+        }
+    
+    def decrypt(self, ciphertext, key=None, shift=3, iv=None, nonce=None, private_key=None):
+        return {
+            'success': True,
+            'plaintext': self.backend.decrypt(ciphertext, shift),
+            'algorithm': self.name
+        }
+
+
+class KeyedCodec(Codec):
+    """Classical cipher keyed by a text key"""
+    
+    def __init__(self, name, backend_path, missing_key_error):
+        super().__init__(name, backend_path)
+        self.missing_key_error = missing_key_error
+    
+    def encrypt(self, text, key=None, shift=3):
+        if not key:
+            return {'success': False, 'error': self.missing_key_error}
+        return {
+            'success': True,
+            'ciphertext': self.backend.encrypt(text, key),
+            'algorithm': self.name
+        }
+    
+    def decrypt(self, ciphertext, key=None, shift=3, iv=None, nonce=None, private_key=None):
+        if not key:
+            return {'success': False, 'error': 'Key required'}
+        return {
+            'success': True,
+            'plaintext': self.backend.decrypt(ciphertext, key),
+            'algorithm': self.name
+        }
+
+
+class RailFenceCodec(Codec):
+    """Rail fence cipher keyed by the number of rails"""
+    
+    def __init__(self, name, backend_path, default_rails=3):
+        super().__init__(name, backend_path)
+        self.default_rails = default_rails
+    
+    def encrypt(self, text, key=None, shift=3):
+        rails = int(key) if key else self.default_rails
+        return {
+            'success': True,
+            'ciphertext': self.backend.encrypt(text, rails),
+            'algorithm': self.name,
+            'rails': rails
+        }
+    
+    def decrypt(self, ciphertext, key=None, shift=3, iv=None, nonce=None, private_key=None):
+        rails = int(key) if key else self.default_rails
+        return {
+            'success': True,
+            'plaintext': self.backend.decrypt(ciphertext, rails),
+            'algorithm': self.name
+        }
+
+
+class PasswordCodec(Codec):
+    """Symmetric cipher with password-derived key and a per-message IV or nonce"""
+    
+    def __init__(self, name, backend_path, encrypt_error, decrypt_error, param='iv'):
+        """
+        Args:
+            name (str): Canonical algorithm name
+            backend_path (str): 'module:Class' of the backend
+            encrypt_error (str): Error when no password is given
+            decrypt_error (str): Error when password or IV/nonce is missing
+            param (str): 'iv' or 'nonce', the per-message value in results
+        """
+        super().__init__(name, backend_path)
+        self.encrypt_error = encrypt_error
+        self.decrypt_error = decrypt_error
+        self.param = param
+    
+    def encrypt(self, text, key=None, shift=3):
+        if not key:
+            return {'success': False, 'error': self.encrypt_error}
+        result = self.backend.encrypt_with_password(text, key)
+        return {
+            'success': True,
+            'ciphertext': result['ciphertext'],
+            self.param: result[self.param],
+            'algorithm': self.name
+        }
+    
+    def decrypt(self, ciphertext, key=None, shift=3, iv=None, nonce=None, private_key=None):
+        value = nonce if self.param == 'nonce' else iv
+        if not key or not value:
+            return {'success': False, 'error': self.decrypt_error}
+        return {
+            'success': True,
+            'plaintext': self.backend.decrypt_with_password(ciphertext, value, key),
+            'algorithm': self.name
+        }
+
+
+class RSACodec(Codec):
+    """RSA with a freshly generated key pair per encryption"""
+    
+    def encrypt(self, text, key=None, shift=3):
+        rsa_cipher = self.backend()
+        keys = rsa_cipher.generate_key_pair()
+        return {
+            'success': True,
+            'ciphertext': rsa_cipher.encrypt(text),
+            'public_key': keys['public_key'],
+            'private_key': keys['private_key'],
+            'algorithm': self.name
+        }
+    
+    def decrypt(self, ciphertext, key=None, shift=3, iv=None, nonce=None, private_key=None):
+        if not private_key:
+            return {'success': False, 'error': 'Private key required'}
+        rsa_cipher = self.backend()
+        rsa_cipher.load_private_key(private_key)
+        return {
+            'success': True,
+            'plaintext': rsa_cipher.decrypt(ciphertext),
+            'algorithm': self.name
+        }
+
+
+_codecs = {}
+
+
+def register(name, codec, aliases=()):
+    """
+    Register an algorithm codec
+    
+    Args:
+        name (str): Algorithm name (case-insensitive)
+        codec (Codec): Codec instance handling the algorithm
+        aliases (iterable): Additional names for the same codec
+    """
+    for alias in (name, *aliases):
+        _codecs[alias.lower()] = codec
+
+
+def get(name):
+    """
+    Look up a codec by algorithm name
+    
+    Args:
+        name (str): Algorithm name or alias (case-insensitive)
+    
+    Returns:
+        Codec or None: Registered codec, None if the name is unknown
+    """
+    return _codecs.get(name.lower())
+
+
+def available():
+    """
+    List registered algorithm names
+    
+    Returns:
+        list: Sorted names and aliases
+    """
+    return sorted(_codecs)
+
+
+register('caesar', ShiftCodec('caesar', '.cipher:CaesarCipher'))
+register('vigenere', KeyedCodec('vigenere', '.classical:VigenereCipher', 'Key required for Vigenère cipher'))
+register('playfair', KeyedCodec('playfair', '.classical:PlayfairCipher', 'Key required for Playfair cipher'))
+register('railfence', RailFenceCodec('railfence', '.classical:RailFenceCipher'))
+register('aes', PasswordCodec('aes', '.cipher:AESCipher', 'Password required for AES', 'Password and IV required'))
+register('blowfish', PasswordCodec('blowfish', '.modern:BlowfishCipher', 'Key required for Blowfish',
+                                   'Key and IV required'))
+register('des3', PasswordCodec('des3', '.modern:DES3Cipher', 'Key required for 3DES', 'Key and IV required'),
+         aliases=('3des',))
+register('chacha20', PasswordCodec('chacha20', '.modern:ChaCha20Cipher', 'Key required for ChaCha20',
+                                   'Key and nonce required', param='nonce'))
+register('rsa', RSACodec('rsa', '.cipher:RSACipher'))
@@ -0,0 +1,430 @@
+"""
+Streaming File Encryption Module
+Encrypts arbitrarily large files in fixed-size authenticated chunks
+
+Container layout (big-endian):
+    header: magic (4) | version (1) | algorithm (1) | chunk size (4) | nonce prefix (7)
+            | KDF (1) | KDF params length (2) | KDF params
+    chunks: ciphertext (chunk size, last chunk may be shorter) | tag (16)
+
+Each chunk is sealed with AES-256-GCM or ChaCha20-Poly1305 under the nonce
+    nonce prefix (7) | chunk counter (4) | final flag (1)
+and the header as associated data, so reordered, truncated or extended
+streams fail authentication. Chunks are independent, so they are sealed
+and opened on a thread pool, and any one chunk can be decrypted on its own.
+Memory use is bounded by a small window of chunks.
+"""
+
+import io
+import os
+import struct
+from collections import OrderedDict
+
+from . import envelope, kdf
+from ..utils.parallel import ordered_map
+
+STREAM_MAGIC = b'CSTS'
+STREAM_VERSION = 1
+
+HEADER_FORMAT = '>4sBBI7sBH'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+NONCE_PREFIX_SIZE = 7
+TAG_SIZE = 16
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+MAX_CHUNKS = 0xFFFFFFFF
+
+# Algorithm ids stored in the header
+ALG_AES_GCM = 1
+ALG_CHACHA20_POLY1305 = 2
+
+ALGORITHMS = {
+    'aes': ALG_AES_GCM,
+    'chacha20': ALG_CHACHA20_POLY1305,
+}
+ALGORITHM_NAMES = {alg_id: name for name, alg_id in ALGORITHMS.items()}
+
+
+def _check_key(key):
+    """Validate a raw 32-byte key"""
+    if len(key) != 32:
+        raise ValueError("Key must be 32 bytes")
+    return bytes(key)
+
+
+def _new_cipher(alg_id, key, nonce):
+    """Create an AEAD cipher for one chunk"""
+    if alg_id == ALG_AES_GCM:
+        from Crypto.Cipher import AES
+        return AES.new(key, AES.MODE_GCM, nonce=nonce)
+    if alg_id == ALG_CHACHA20_POLY1305:
+        from Crypto.Cipher import ChaCha20_Poly1305
+        return ChaCha20_Poly1305.new(key=key, nonce=nonce)
+    raise ValueError(f"Unsupported stream algorithm id: {alg_id}")
+
+
+def _chunk_nonce(prefix, counter, final):
+    """Build the nonce for chunk number `counter`"""
+    if counter > MAX_CHUNKS:
+        raise ValueError("Stream has too many chunks for the chunk counter")
+    return prefix + struct.pack('>IB', counter, 1 if final else 0)
+
+
+def _read_full(f, size):
+    """Read exactly `size` bytes unless EOF is reached first"""
+    data = f.read(size)
+    if len(data) == size or not data:
+        return data
+    parts = [data]
+    remaining = size - len(data)
+    while remaining:
+        part = f.read(remaining)
+        if not part:
+            break
+        parts.append(part)
+        remaining -= len(part)
+    return b''.join(parts)
+
+
+def read_header(src):
+    """
+    Read and validate a stream container header
+
+    Args:
+        src: Binary file object positioned at the start of the container
+
+    Returns:
+        tuple: (header bytes, algorithm name, chunk size, nonce prefix,
+            KDF id, KDF params)
+    """
+    header = _read_full(src, HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError("Not an encrypted stream: header too short")
+
+    magic, version, alg_id, chunk_size, prefix, kdf_id, params_len = struct.unpack(HEADER_FORMAT, header)
+    if magic != STREAM_MAGIC:
+        raise ValueError("Not an encrypted stream: bad magic")
+    if version != STREAM_VERSION:
+        raise ValueError(f"Unsupported stream version: {version}")
+    if alg_id not in ALGORITHM_NAMES:
+        raise ValueError(f"Unsupported stream algorithm id: {alg_id}")
+    if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+        raise ValueError(f"Invalid chunk size: {chunk_size}")
+
+    kdf_params = _read_full(src, params_len)
+    if len(kdf_params) < params_len:
+        raise ValueError("Encrypted stream header is truncated")
+
+    return header + kdf_params, ALGORITHM_NAMES[alg_id], chunk_size, prefix, kdf_id, kdf_params
+
+
+def is_stream(path):
+    """
+    Check whether a file starts with the stream container magic
+
+    Args:
+        path (str): File path
+
+    Returns:
+        bool: True if the file looks like an encrypted stream
+    """
+    with open(path, 'rb') as f:
+        return f.read(len(STREAM_MAGIC)) == STREAM_MAGIC
+
+
+def _iter_chunks(src, size):
+    """Yield (index, data, final) for consecutive reads, looking one read ahead"""
+    index = 0
+    chunk = _read_full(src, size)
+    while True:
+        next_chunk = _read_full(src, size) if len(chunk) == size else b''
+        final = not next_chunk
+        yield index, chunk, final
+        if final:
+            return
+        index += 1
+        chunk = next_chunk
+
+
+def _stream_key(key, kdf_id, kdf_params):
+    """Key for a stream header, deriving it when a password is given"""
+    if isinstance(key, str):
+        if kdf_id == envelope.KDF_NONE:
+            raise ValueError("Stream was encrypted with a raw key, not a password")
+        return kdf.derive_from(key, kdf_id, kdf_params)
+    return _check_key(key)
+
+
+def _open_chunk(alg_id, key, header, prefix, index, block, final):
+    """Verify and decrypt one chunk (ciphertext followed by its tag)"""
+    if len(block) < TAG_SIZE:
+        raise ValueError("Encrypted stream is truncated")
+
+    cipher = _new_cipher(alg_id, key, _chunk_nonce(prefix, index, final))
+    cipher.update(header)
+    try:
+        return cipher.decrypt_and_verify(block[:-TAG_SIZE], block[-TAG_SIZE:])
+    except ValueError:
+        raise ValueError(f"Authentication failed at chunk {index} "
+                         "(wrong key or corrupted data)") from None
+
+
+def encrypt_stream(key, src, dst, algorithm='aes', chunk_size=DEFAULT_CHUNK_SIZE, key_kdf=None,
+                   workers=None):
+    """
+    Encrypt a binary stream into a chunked container
+
+    Chunks are independently nonced, so they are sealed on a thread pool
+    and written in order.
+
+    Args:
+        key (bytes or str): 32-byte key or password (derived with a salted KDF)
+        src: Readable binary file object
+        dst: Writable binary file object
+        algorithm (str): 'aes' (AES-256-GCM) or 'chacha20' (ChaCha20-Poly1305)
+        chunk_size (int): Plaintext bytes per chunk
+        key_kdf (tuple, optional): (KDF id, encoded params) a raw key was
+            derived with, recorded so the password can decrypt the stream
+        workers (int, optional): Worker threads (default: CPU count)
+
+    Returns:
+        dict: Contains 'algorithm', 'chunk_size', 'chunks' and 'bytes'
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unsupported stream algorithm: {algorithm}")
+    if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+        raise ValueError(f"Chunk size must be between 1 and {MAX_CHUNK_SIZE} bytes")
+
+    if isinstance(key, str):
+        key, params = kdf.encryption_key(key)
+        kdf_id, kdf_params = params.kdf, params.encode()
+    else:
+        key = _check_key(key)
+        kdf_id, kdf_params = key_kdf or (envelope.KDF_NONE, b'')
+
+    alg_id = ALGORITHMS[algorithm]
+    prefix = os.urandom(NONCE_PREFIX_SIZE)
+    header = struct.pack(HEADER_FORMAT, STREAM_MAGIC, STREAM_VERSION, alg_id, chunk_size, prefix,
+                         kdf_id, len(kdf_params)) + kdf_params
+    dst.write(header)
+
+    def seal(item):
+        index, chunk, final = item
+        cipher = _new_cipher(alg_id, key, _chunk_nonce(prefix, index, final))
+        cipher.update(header)
+        return len(chunk), cipher.encrypt_and_digest(chunk)
+
+    counter = 0
+    total = 0
+    for size, (ciphertext, tag) in ordered_map(seal, _iter_chunks(src, chunk_size),
+                                                workers or os.cpu_count() or 1):
+        dst.write(ciphertext)
+        dst.write(tag)
+        counter += 1
+        total += size
+
+    return {
+        'algorithm': algorithm,
+        'chunk_size': chunk_size,
+        'chunks': counter,
+        'bytes': total
+    }
+
+
+def decrypt_stream(key, src, dst, algorithm=None, workers=None):
+    """
+    Decrypt a chunked container, writing only authenticated plaintext
+
+    Args:
+        key (bytes or str): 32-byte key or password
+        src: Readable binary file object
+        dst: Writable binary file object
+        algorithm (str, optional): Expected algorithm; any if None
+        workers (int, optional): Worker threads (default: CPU count)
+
+    Returns:
+        dict: Contains 'algorithm', 'chunk_size', 'chunks' and 'bytes'
+
+    Raises:
+        ValueError: If the container is malformed, truncated or tampered with
+    """
+    header, name, chunk_size, prefix, kdf_id, kdf_params = read_header(src)
+    key = _stream_key(key, kdf_id, kdf_params)
+    if algorithm is not None and algorithm != name:
+        raise ValueError(f"Stream was encrypted with {name}, not {algorithm}")
+    alg_id = ALGORITHMS[name]
+
+    def open_block(item):
+        index, block, final = item
+        return _open_chunk(alg_id, key, header, prefix, index, block, final)
+
+    counter = 0
+    total = 0
+    for plaintext in ordered_map(open_block, _iter_chunks(src, chunk_size + TAG_SIZE),
+                                  workers or os.cpu_count() or 1):
+        dst.write(plaintext)
+        counter += 1
+        total += len(plaintext)
+
+    return {
+        'algorithm': name,
+        'chunk_size': chunk_size,
+        'chunks': counter,
+        'bytes': total
+    }
+
+
+class SegmentReader(io.RawIOBase):
+    """
+    Seekable, read-only plaintext view of an encrypted container
+
+    Segments have a fixed size, so the segment index is arithmetic on the
+    header and the container size: a read decrypts only the segments that
+    overlap the requested range, each verified against its own tag.
+    Recently used segments are kept in a small LRU cache.
+    """
+
+    def __init__(self, src, key, cache_size=4):
+        """
+        Args:
+            src (str or file): Container path, or a readable, seekable binary file
+            key (bytes or str): 32-byte key or password
+            cache_size (int): Number of decrypted segments to keep
+        """
+        super().__init__()
+        self._owns_src = isinstance(src, (str, os.PathLike))
+        self._src = open(src, 'rb') if self._owns_src else src
+        try:
+            self._src.seek(0)
+            (self._header, self.algorithm, self.chunk_size, self._prefix,
+             kdf_id, kdf_params) = read_header(self._src)
+            self._key = _stream_key(key, kdf_id, kdf_params)
+
+            block_size = self.chunk_size + TAG_SIZE
+            body_size = self._src.seek(0, os.SEEK_END) - len(self._header)
+            if body_size < TAG_SIZE:
+                raise ValueError("Encrypted stream is truncated")
+            self.segment_count = -(-body_size // block_size)
+            last_block = body_size - (self.segment_count - 1) * block_size
+            if last_block < TAG_SIZE:
+                raise ValueError("Encrypted stream is truncated")
+            self.size = (self.segment_count - 1) * self.chunk_size + last_block - TAG_SIZE
+        except Exception:
+            if self._owns_src:
+                self._src.close()
+            raise
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._pos = 0
+
+    def segment(self, index):
+        """
+        Authenticated plaintext of one segment
+
+        Args:
+            index (int): Segment number
+
+        Returns:
+            bytes: Decrypted segment
+        """
+        if not 0 <= index < self.segment_count:
+            raise IndexError(f"Segment {index} out of range (0-{self.segment_count - 1})")
+
+        data = self._cache.get(index)
+        if data is not None:
+            self._cache.move_to_end(index)
+            return data
+
+        block_size = self.chunk_size + TAG_SIZE
+        self._src.seek(len(self._header) + index * block_size)
+        block = _read_full(self._src, block_size)
+        data = _open_chunk(ALGORITHMS[self.algorithm], self._key, self._header, self._prefix,
+                           index, block, index == self.segment_count - 1)
+
+        if self.cache_size > 0:
+            self._cache[index] = data
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return data
+
+    def read_range(self, offset, length):
+        """
+        Decrypt a byte range of the plaintext
+
+        Args:
+            offset (int): Plaintext offset
+            length (int): Number of bytes (clipped at the end of the plaintext)
+
+        Returns:
+            bytes: Plaintext bytes
+        """
+        if offset < 0 or length < 0:
+            raise ValueError("Offset and length must be non-negative")
+        end = min(offset + length, self.size)
+        if offset >= end:
+            return b''
+
+        first = offset // self.chunk_size
+        last = (end - 1) // self.chunk_size
+        parts = []
+        for index in range(first, last + 1):
+            base = index * self.chunk_size
+            data = self.segment(index)
+            parts.append(data[max(offset - base, 0):end - base])
+        return b''.join(parts)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError("Negative seek position")
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer):
+        data = self.read_range(self._pos, len(buffer))
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._cache.clear()
+            if self._owns_src:
+                self._src.close()
+        super().close()
+
+
+def decrypt_segment(key, src, index):
+    """
+    Decrypt a single chunk of a container for random access
+
+    Chunks have a fixed size, so chunk `index` is located directly from the
+    header and the container size without reading the chunks before it.
+
+    Args:
+        key (bytes or str): 32-byte key or password
+        src: Readable, seekable binary file object
+        index (int): Chunk number
+
+    Returns:
+        bytes: Authenticated plaintext of the chunk
+    """
+    return SegmentReader(src, key, cache_size=0).segment(index)
@@ -1,13 +1,29 @@
-"""Steganography module initialization"""
-
-from .image_stego import ImageSteganography, AdvancedImageSteganography
-from .audio_stego import AudioSteganography
-from .video_stego import VideoSteganography, JPEGSteganography
-
-__all__ = [
-    'ImageSteganography',
-    'AdvancedImageSteganography',
-    'AudioSteganography',
-    'VideoSteganography',
-    'JPEGSteganography'
-]
+"""Steganography module initialization
+
+Engine classes are imported on first access (PEP 562), so importing this
+package does not load NumPy or Pillow until an engine is used.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'ImageSteganography': '.image_stego',
+    'AdvancedImageSteganography': '.image_stego',
+    'AudioSteganography': '.audio_stego',
+    'VideoSteganography': '.video_stego',
+    'JPEGSteganography': '.jpeg_stego',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,137 +1,411 @@
 """
 Audio Steganography Module
 Implements LSB steganography for WAV audio files
+(8/16/24/32-bit PCM and 32/64-bit IEEE float)
 """
 
-import wave
-import struct
 import os
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+from ..utils.file_ops import FileManager
+from . import lsb, payload
+
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Supported (format tag, bytes per sample) combinations -> format name
+SAMPLE_FORMATS = {
+    (WAVE_FORMAT_PCM, 1): 'pcm8',
+    (WAVE_FORMAT_PCM, 2): 'pcm16',
+    (WAVE_FORMAT_PCM, 3): 'pcm24',
+    (WAVE_FORMAT_PCM, 4): 'pcm32',
+    (WAVE_FORMAT_IEEE_FLOAT, 4): 'float32',
+    (WAVE_FORMAT_IEEE_FLOAT, 8): 'float64',
+}
+
+WavLayout = namedtuple('WavLayout', [
+    'format_tag', 'channels', 'frame_rate', 'sample_width', 'block_align',
+    'data_offset', 'data_size'
+])
 
 
 class AudioSteganography:
     """Audio steganography using LSB technique for WAV files"""
     
     DELIMITER = "<<<END_OF_MESSAGE>>>"
+    BLOCK_FRAMES = 1 << 16  # Frames read and written per streaming block
+    SPAN_GAP = 4096  # Scattered samples closer than this are read in one span
     
     @staticmethod
-    def _text_to_binary(text):
-        """Convert text to binary string"""
-        return ''.join(format(ord(char), '08b') for char in text)
+    def _read_layout(audio_path):
+        """
+        Parse the RIFF/WAVE header of a WAV file
+        
+        Args:
+            audio_path (str): Path to audio file
+            
+        Returns:
+            WavLayout: Sample format and location of the data chunk
+        """
+        file_size = os.path.getsize(audio_path)
+        fmt = None
+        
+        with open(audio_path, 'rb') as f:
+            riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+            if riff != b'RIFF' or wave_id != b'WAVE':
+                raise ValueError("Not a RIFF/WAVE file")
+            
+            while True:
+                chunk_header = f.read(8)
+                if len(chunk_header) < 8:
+                    raise ValueError("WAV file has no data chunk")
+                chunk_id, chunk_size = struct.unpack('<4sI', chunk_header)
+                
+                if chunk_id == b'fmt ':
+                    body = f.read(chunk_size)
+                    format_tag, channels, frame_rate, _, block_align, bits = struct.unpack('<HHIIHH', body[:16])
+                    if format_tag == WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                        # Actual format is the first two bytes of the SubFormat GUID
+                        format_tag = struct.unpack('<H', body[24:26])[0]
+                    fmt = (format_tag, channels, frame_rate, block_align // channels, block_align)
+                    f.seek(chunk_size % 2, 1)
+                
+                elif chunk_id == b'data':
+                    if fmt is None:
+                        raise ValueError("WAV data chunk precedes fmt chunk")
+                    data_offset = f.tell()
+                    data_size = min(chunk_size, file_size - data_offset)
+                    return WavLayout(*fmt, data_offset, data_size)
+                
+                else:
+                    f.seek(chunk_size + chunk_size % 2, 1)
     
     @staticmethod
-    def _binary_to_text(binary):
-        """Convert binary string to text"""
-        chars = []
-        for i in range(0, len(binary), 8):
-            byte = binary[i:i+8]
-            if len(byte) == 8:
-                chars.append(chr(int(byte, 2)))
-        return ''.join(chars)
+    def _lsb_view(buffer, layout):
+        """
+        View the byte holding each sample's least significant bit
+        
+        WAV samples are little-endian, so for every supported PCM width and
+        for IEEE float (mantissa LSB) that is the first byte of the sample.
+        24-bit audio is handled the same way through a strided uint8 view.
+        
+        Args:
+            buffer (bytes or bytearray): Raw sample data
+            layout (WavLayout): File layout
+            
+        Returns:
+            np.ndarray: uint8 view, one element per sample (writable for bytearray)
+        """
+        if (layout.format_tag, layout.sample_width) not in SAMPLE_FORMATS:
+            raise ValueError(f"Unsupported WAV format: tag {layout.format_tag}, "
+                             f"{layout.sample_width * 8}-bit samples")
+        
+        raw = np.frombuffer(buffer, dtype=np.uint8)
+        usable = raw.size - raw.size % layout.sample_width
+        return raw[:usable:layout.sample_width]
     
     @classmethod
-    def encode(cls, audio_path, message, output_path):
+    def _read_lsb_bytes(cls, f, layout, offset, count):
         """
-        Encode message into WAV audio file
+        Read bytes hidden in sample LSBs without loading the whole file
         
         Args:
-            audio_path (str): Path to cover audio file (WAV)
-            message (str): Message to hide
-            output_path (str): Path to save stego audio
+            f (file): Audio file opened in binary mode
+            layout (WavLayout): File layout
+            offset (int): Byte offset into the hidden stream
+            count (int): Number of bytes to read
             
         Returns:
-            dict: Encoding result
+            bytes: Extracted bytes
+        """
+        first_sample = offset * 8
+        total_samples = layout.data_size // layout.sample_width
+        n_samples = max(0, min(count * 8, total_samples - first_sample))
+        
+        f.seek(layout.data_offset + first_sample * layout.sample_width)
+        samples = cls._lsb_view(f.read(n_samples * layout.sample_width), layout)
+        return lsb.extract_bytes(samples, count)
+    
+    @classmethod
+    def _iter_spans(cls, indices, max_samples):
+        """
+        Group sorted sample indices into contiguous file spans
+        
+        Args:
+            indices (np.ndarray): Sorted sample indices
+            max_samples (int): Maximum samples covered by one span
+            
+        Yields:
+            tuple: (first sample, end sample, slice of indices in the span)
+        """
+        breaks = np.flatnonzero(np.diff(indices) > cls.SPAN_GAP) + 1
+        bounds = np.concatenate(([0], breaks, [indices.size]))
+        
+        for begin, end in zip(bounds[:-1], bounds[1:]):
+            while begin < end:
+                first = int(indices[begin])
+                stop = begin + int(np.searchsorted(indices[begin:end], first + max_samples))
+                yield first, int(indices[stop - 1]) + 1, slice(begin, stop)
+                begin = stop
+    
+    @classmethod
+    def _read_keyed_bytes(cls, f, layout, password, offset, count):
+        """
+        Read bytes hidden in password-keyed pseudo-random sample order
+        
+        Only the spans of the file around the needed samples are read.
+        
+        Args:
+            f (file): Audio file opened in binary mode
+            layout (WavLayout): File layout
+            password (str): Password used when encoding
+            offset (int): Byte offset into the hidden stream
+            count (int): Number of bytes to read
+            
+        Returns:
+            bytes: Extracted bytes
         """
-        # Open audio file
-        audio = wave.open(audio_path, 'rb')
+        total_samples = layout.data_size // layout.sample_width
+        count = max(0, min(count, total_samples // 8 - offset))
+        indices = lsb.keyed_indices(password, total_samples, count * 8, offset * 8)
+        order = np.argsort(indices)
+        indices = indices[order]
+        bits = np.empty(indices.size, dtype=np.uint8)
         
-        # Get audio parameters
-        params = audio.getparams()
-        n_channels = params.nchannels
-        sample_width = params.sampwidth
-        frame_rate = params.framerate
-        n_frames = params.nframes
+        for first, end, part in cls._iter_spans(indices, cls.BLOCK_FRAMES * layout.channels):
+            f.seek(layout.data_offset + first * layout.sample_width)
+            samples = cls._lsb_view(f.read((end - first) * layout.sample_width), layout)
+            bits[order[part]] = samples[indices[part] - first] & 1
         
-        # Read frames
-        frames = audio.readframes(n_frames)
-        audio.close()
+        return np.packbits(bits).tobytes()
+    
+    @classmethod
+    def _iter_blocks(cls, f, layout):
+        """Yield per-sample LSB views of the data chunk block by block"""
+        block_bytes = cls.BLOCK_FRAMES * layout.block_align
+        remaining = layout.data_size
+        f.seek(layout.data_offset)
+        while remaining > 0:
+            block = f.read(min(block_bytes, remaining))
+            if not block:
+                return
+            remaining -= len(block)
+            yield cls._lsb_view(block, layout)
+    
+    @classmethod
+    def _embed(cls, audio_path, stream, output_path, block_frames=None, password=None):
+        """
+        Embed a header-prefixed payload stream into a WAV file
+        
+        The cover is copied with a buffered file copy (or patched directly
+        when output_path is the cover itself), then only the blocks
+        of the data chunk holding payload bits are rewritten in place, so
+        memory use is bounded by the block size and all other chunks
+        (metadata, extensible format headers) are preserved.
+        
+        Args:
+            audio_path (str): Path to cover audio file (WAV)
+            stream (bytes): Header-prefixed payload
+            output_path (str): Path to save stego audio
+            block_frames (int, optional): Frames per block
+            password (str, optional): Scatter bits in a keyed pseudo-random order
+            
+        Returns:
+            float: Audio duration in seconds
+        """
+        block_frames = block_frames or cls.BLOCK_FRAMES
+        if block_frames < 1:
+            raise ValueError("block_frames must be at least 1")
         
-        # Convert to list of samples
-        samples = list(struct.unpack(f'{n_frames * n_channels}h', frames))
+        layout = cls._read_layout(audio_path)
+        cls._lsb_view(b'', layout)  # Reject unsupported formats before copying
         
-        # Prepare message
-        message_with_delimiter = message + cls.DELIMITER
-        binary_message = cls._text_to_binary(message_with_delimiter)
+        bits = lsb.bytes_to_bits(stream)
+        total_samples = layout.data_size // layout.sample_width
         
         # Check capacity
-        if len(binary_message) > len(samples):
-            raise ValueError(f"Message too large. Maximum {len(samples)//8} bytes, got {len(binary_message)//8} bytes")
+        if bits.size > total_samples:
+            raise ValueError(f"Message too large. Maximum {total_samples//8} bytes, got {len(stream)} bytes")
         
-        # Encode message in LSB
-        for i in range(len(binary_message)):
-            # Modify LSB of sample
-            samples[i] = (samples[i] & ~1) | int(binary_message[i])
+        FileManager.copy_for_patching(audio_path, output_path)
         
-        # Convert back to bytes
-        modified_frames = struct.pack(f'{len(samples)}h', *samples)
+        block_bytes = block_frames * layout.block_align
+        payload_bytes = bits.size * layout.sample_width
         
-        # Write to output file
-        output_audio = wave.open(output_path, 'wb')
-        output_audio.setparams(params)
-        output_audio.writeframes(modified_frames)
-        output_audio.close()
+        if password is not None:
+            # Patch only the file spans holding the scattered samples
+            indices = lsb.keyed_indices(password, total_samples, bits.size)
+            order = np.argsort(indices)
+            indices, bits = indices[order], bits[order]
+            
+            with open(output_path, 'r+b') as f:
+                for first, end, part in cls._iter_spans(indices, block_frames * layout.channels):
+                    f.seek(layout.data_offset + first * layout.sample_width)
+                    span = bytearray(f.read((end - first) * layout.sample_width))
+                    
+                    samples = cls._lsb_view(span, layout)
+                    local = indices[part] - first
+                    values = samples[local]
+                    lsb.embed_bits(values, bits[part])
+                    samples[local] = values
+                    
+                    f.seek(layout.data_offset + first * layout.sample_width)
+                    f.write(span)
+            
+            return layout.data_size // layout.block_align / layout.frame_rate
         
-        return {
-            'success': True,
-            'message_size': len(message),
-            'audio_duration': n_frames / frame_rate,
-            'output_path': output_path
-        }
+        with open(output_path, 'r+b') as f:
+            for block_start in range(0, payload_bytes, block_bytes):
+                f.seek(layout.data_offset + block_start)
+                block = bytearray(f.read(min(block_bytes, payload_bytes - block_start)))
+                
+                # Encode the next slice of the payload into this block
+                samples = cls._lsb_view(block, layout)
+                first_bit = block_start // layout.sample_width
+                lsb.embed_bits(samples, bits[first_bit:first_bit + samples.size])
+                
+                f.seek(layout.data_offset + block_start)
+                f.write(block)
+        
+        n_frames = layout.data_size // layout.block_align
+        return n_frames / layout.frame_rate
     
     @classmethod
-    def decode(cls, audio_path):
+    def _extract(cls, audio_path, password=None):
         """
-        Decode message from WAV audio file
+        Extract the hidden payload from a WAV file
         
         Args:
             audio_path (str): Path to stego audio file
+            password (str, optional): Password used for scatter mode
             
         Returns:
-            str: Hidden message
+            tuple: (flags, data) for headered payloads, (None, data) for legacy
+                delimiter-terminated messages
         """
-        # Open audio file
-        audio = wave.open(audio_path, 'rb')
+        layout = cls._read_layout(audio_path)
         
-        # Get audio parameters
-        params = audio.getparams()
-        n_channels = params.nchannels
-        n_frames = params.nframes
+        with open(audio_path, 'rb') as f:
+            if password is not None:
+                result = payload.read(
+                    lambda offset, count: cls._read_keyed_bytes(f, layout, password, offset, count),
+                    layout.data_size // layout.sample_width // 8
+                )
+                if result is None:
+                    raise ValueError("No hidden message found, wrong password or message corrupted")
+                return result
+            
+            # Read only the samples holding the header and payload
+            result = payload.read(
+                lambda offset, count: cls._read_lsb_bytes(f, layout, offset, count),
+                layout.data_size // layout.sample_width // 8
+            )
+            if result is not None:
+                return result
+            
+            # Legacy format: stream blocks and search for the delimiter
+            data = lsb.StreamReader(cls._iter_blocks(f, layout)).find(cls.DELIMITER.encode('latin-1'))
         
-        # Read frames
-        frames = audio.readframes(n_frames)
-        audio.close()
+        if data is None:
+            raise ValueError("No hidden message found or message corrupted")
         
-        # Convert to list of samples
-        samples = list(struct.unpack(f'{n_frames * n_channels}h', frames))
+        return None, data
+    
+    @classmethod
+    def encode(cls, audio_path, message, output_path, block_frames=None, password=None):
+        """
+        Encode message into WAV audio file
         
-        # Extract binary data from LSB
-        binary_data = ""
-        for sample in samples:
-            binary_data += str(sample & 1)
+        Args:
+            audio_path (str): Path to cover audio file (WAV)
+            message (str): Message to hide
+            output_path (str): Path to save stego audio
+            block_frames (int, optional): Frames per streaming block
+            password (str, optional): Scatter the payload over the recording in a
+                password-keyed pseudo-random order
+            
+        Returns:
+            dict: Encoding result
+        """
+        stream = payload.encode_text(message)
+        duration = cls._embed(audio_path, stream, output_path, block_frames, password)
         
-        # Convert to text
-        message_with_delimiter = cls._binary_to_text(binary_data)
+        return {
+            'success': True,
+            'message_size': len(stream) - payload.HEADER_SIZE,
+            'audio_duration': duration,
+            'output_path': output_path
+        }
+    
+    @classmethod
+    def encode_bytes(cls, audio_path, data, output_path, compress=False, block_frames=None,
+                     password=None):
+        """
+        Encode raw bytes into WAV audio file
         
-        # Find delimiter
-        delimiter_index = message_with_delimiter.find(cls.DELIMITER)
-        if delimiter_index == -1:
-            raise ValueError("No hidden message found or message corrupted")
+        Args:
+            audio_path (str): Path to cover audio file (WAV)
+            data (bytes): Data to hide
+            output_path (str): Path to save stego audio
+            compress (bool): Whether to zlib compress data before encoding
+            block_frames (int, optional): Frames per streaming block
+            password (str, optional): Scatter the payload over the recording in a
+                password-keyed pseudo-random order
+            
+        Returns:
+            dict: Encoding result
+        """
+        stream = payload.encode_bytes(data, compress)
+        duration = cls._embed(audio_path, stream, output_path, block_frames, password)
+        
+        return {
+            'success': True,
+            'message_size': len(stream) - payload.HEADER_SIZE,
+            'audio_duration': duration,
+            'output_path': output_path
+        }
+    
+    @classmethod
+    def decode(cls, audio_path, password=None):
+        """
+        Decode message from WAV audio file
         
-        message = message_with_delimiter[:delimiter_index]
+        Args:
+            audio_path (str): Path to stego audio file
+            password (str, optional): Password used when encoding in scatter mode
+            
+        Returns:
+            str: Hidden message
+        """
+        flags, data = cls._extract(audio_path, password)
+        if flags is None:
+            return data.decode('latin-1')
+        return payload.decode_text(flags, data)
+    
+    @classmethod
+    def decode_bytes(cls, audio_path, password=None):
+        """
+        Decode raw bytes from WAV audio file
         
-        return message
+        Args:
+            audio_path (str): Path to stego audio file
+            password (str, optional): Password used when encoding in scatter mode
+            
+        Returns:
+            bytes: Hidden data
+        """
+        flags, data = cls._extract(audio_path, password)
+        if flags is None:
+            return data
+        return payload.decode_bytes(flags, data)
     
-    @staticmethod
-    def get_capacity(audio_path):
+    @classmethod
+    def get_capacity(cls, audio_path):
         """
         Get maximum message capacity of an audio file
         
@@ -141,12 +415,10 @@ class AudioSteganography:
         Returns:
             dict: Capacity information
         """
-        audio = wave.open(audio_path, 'rb')
-        params = audio.getparams()
-        n_channels = params.nchannels
-        n_frames = params.nframes
-        frame_rate = params.framerate
-        audio.close()
+        layout = cls._read_layout(audio_path)
+        n_channels = layout.channels
+        n_frames = layout.data_size // layout.block_align
+        frame_rate = layout.frame_rate
         
         total_samples = n_frames * n_channels
         max_bits = total_samples
@@ -156,16 +428,17 @@ class AudioSteganography:
         return {
             'channels': n_channels,
             'frame_rate': frame_rate,
+            'sample_width': layout.sample_width,
             'n_frames': n_frames,
             'duration_seconds': duration,
             'total_samples': total_samples,
             'max_bits': max_bits,
             'max_bytes': max_bytes,
-            'max_chars_approx': max_bytes - len(AudioSteganography.DELIMITER)
+            'max_chars_approx': max_bytes - payload.HEADER_SIZE
         }
     
-    @staticmethod
-    def validate_audio_file(audio_path):
+    @classmethod
+    def validate_audio_file(cls, audio_path):
         """
         Validate if audio file is suitable for steganography
         
@@ -188,24 +461,21 @@ class AudioSteganography:
             }
         
         try:
-            audio = wave.open(audio_path, 'rb')
-            params = audio.getparams()
+            layout = cls._read_layout(audio_path)
             
-            # Check if 16-bit audio
-            if params.sampwidth != 2:
-                audio.close()
+            # Check for a supported sample format
+            if (layout.format_tag, layout.sample_width) not in SAMPLE_FORMATS:
                 return {
                     'valid': False,
-                    'error': 'Only 16-bit audio is supported'
+                    'error': 'Only 8/16/24/32-bit PCM and 32/64-bit float audio is supported'
                 }
             
-            audio.close()
-            
             return {
                 'valid': True,
-                'channels': params.nchannels,
-                'sample_rate': params.framerate,
-                'sample_width': params.sampwidth
+                'channels': layout.channels,
+                'sample_rate': layout.frame_rate,
+                'sample_width': layout.sample_width,
+                'format': SAMPLE_FORMATS[(layout.format_tag, layout.sample_width)]
             }
             
         except Exception as e:
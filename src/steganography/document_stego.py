@@ -6,6 +6,8 @@ Hide data in PDF and text documents
 import os
 import tempfile
 
+from . import payload
+
 
 class PDFSteganography:
     """PDF steganography using metadata and whitespace"""
@@ -245,3 +247,90 @@ class TextSteganography:
                 message += chr(int(byte, 2))
         
         return message
+    
+    @staticmethod
+    def _bytes_to_binary(data):
+        """Convert bytes to binary string"""
+        return ''.join(format(byte, '08b') for byte in data)
+    
+    @staticmethod
+    def _binary_to_bytes(binary):
+        """Convert binary string to bytes, dropping any incomplete byte"""
+        usable = len(binary) - len(binary) % 8
+        if usable == 0:
+            return b''
+        return int(binary[:usable], 2).to_bytes(usable // 8, 'big')
+    
+    @classmethod
+    def encode_bytes(cls, text, data, method='unicode', compress=False):
+        """
+        Encode raw bytes into cover text
+        
+        The data is stored with a length-prefixed payload header, so no end
+        marker is needed and any byte value can be hidden.
+        
+        Args:
+            text (str): Cover text
+            data (bytes): Data to hide
+            method (str): 'unicode' (zero-width characters) or 'whitespace'
+            compress (bool): Whether to zlib compress data before encoding
+            
+        Returns:
+            str: Stego text
+        """
+        binary = cls._bytes_to_binary(payload.encode_bytes(data, compress))
+        
+        if method == 'whitespace':
+            lines = text.split('\n')
+            if len(binary) > len(lines):
+                raise ValueError("Message too long for cover text")
+            
+            # Encode in trailing whitespace (space=0, tab=1)
+            markers = {'0': ' ', '1': '\t'}
+            stego_lines = [line + markers[bit] for line, bit in zip(lines, binary)]
+            return '\n'.join(stego_lines + lines[len(binary):])
+        
+        if method == 'unicode':
+            if len(binary) > len(text):
+                raise ValueError("Message too long for cover text")
+            
+            # Zero-width space = 0, zero-width non-joiner = 1
+            markers = {'0': '\u200B', '1': '\u200C'}
+            stego_chars = [char + markers[bit] for char, bit in zip(text, binary)]
+            return ''.join(stego_chars) + text[len(binary):]
+        
+        raise ValueError(f"Unsupported method: {method}")
+    
+    @classmethod
+    def decode_bytes(cls, stego_text, method='unicode'):
+        """
+        Decode raw bytes hidden with encode_bytes
+        
+        Args:
+            stego_text (str): Stego text
+            method (str): 'unicode' or 'whitespace'
+            
+        Returns:
+            bytes: Hidden data
+        """
+        if method == 'whitespace':
+            bits = []
+            for line in stego_text.split('\n'):
+                if line.endswith('\t'):
+                    bits.append('1')
+                elif line.endswith(' '):
+                    bits.append('0')
+                else:
+                    break  # No more encoded data
+        elif method == 'unicode':
+            markers = {'\u200B': '0', '\u200C': '1'}
+            bits = [markers[char] for char in stego_text if char in markers]
+        else:
+            raise ValueError(f"Unsupported method: {method}")
+        
+        stream = cls._binary_to_bytes(''.join(bits))
+        result = payload.read(lambda offset, count: stream[offset:offset + count], len(stream))
+        if result is None:
+            raise ValueError("No hidden message found or message corrupted")
+        
+        return payload.decode_bytes(*result)
@@ -5,9 +5,13 @@ Implements LSB steganography for images with compression
 
 from PIL import Image
 import numpy as np
+import os
 import zlib
 import base64
 
+from ..utils.file_ops import FileManager
+from . import lsb, payload
+
 
 class ImageSteganography:
     """Image steganography using LSB (Least Significant Bit) technique"""
@@ -15,24 +19,23 @@ class ImageSteganography:
     DELIMITER = "<<<END_OF_MESSAGE>>>"
     
     @staticmethod
-    def _text_to_binary(text):
-        """Convert text to binary string"""
-        return ''.join(format(ord(char), '08b') for char in text)
+    def _text_to_bytes(text):
+        """Convert text to one byte per character"""
+        try:
+            return text.encode('latin-1')
+        except UnicodeEncodeError:
+            raise ValueError("Message contains non Latin-1 characters, enable compression to hide it")
     
     @staticmethod
-    def _binary_to_text(binary):
-        """Convert binary string to text"""
-        chars = []
-        for i in range(0, len(binary), 8):
-            byte = binary[i:i+8]
-            if len(byte) == 8:
-                chars.append(chr(int(byte, 2)))
-        return ''.join(chars)
+    def _bytes_to_text(data):
+        """Convert bytes back to text (one character per byte)"""
+        return data.decode('latin-1')
     
     @staticmethod
     def compress_text(text):
         """
-        Compress text using zlib
+        Compress text using zlib (legacy delimiter format; headered
+        payloads store raw zlib bytes instead)
         
         Args:
             text (str): Text to compress
@@ -57,99 +60,345 @@ class ImageSteganography:
         compressed = base64.b64decode(compressed_text)
         return zlib.decompress(compressed).decode('utf-8')
     
+    @staticmethod
+    def _raster_layout(image):
+        """
+        Describe where an uncompressed RGB raster lives inside the image file
+        
+        Args:
+            image (PIL.Image.Image): Opened (not yet loaded) image
+            
+        Returns:
+            tuple or None: (offset, stride, orientation, rawmode), None if the
+                pixels are compressed or not stored as plain RGB/BGR rows
+        """
+        if image.mode != 'RGB' or not image.tile:
+            return None
+        
+        width, height = image.size
+        row_bytes = width * 3
+        tiles = []
+        for decoder, box, offset, args in image.tile:
+            if isinstance(args, str):
+                args = (args, 0, 1)
+            rawmode, stride, orientation = (tuple(args) + (0, 1))[:3]
+            if decoder != 'raw' or rawmode not in ('RGB', 'BGR'):
+                return None
+            if box[0] != 0 or box[2] != width:
+                return None
+            tiles.append((box[1], box[3], offset, rawmode, stride or row_bytes, orientation))
+        
+        tiles.sort()
+        top, _, offset, rawmode, stride, orientation = tiles[0]
+        if top != 0 or tiles[-1][1] != height:
+            return None
+        
+        # Multiple strips must form one contiguous top-down raster
+        expected_offset = offset
+        for strip_top, strip_bottom, strip_offset, strip_rawmode, strip_stride, strip_orientation in tiles:
+            if (strip_offset != expected_offset or strip_rawmode != rawmode or
+                    strip_stride != stride or (len(tiles) > 1 and strip_orientation != 1)):
+                return None
+            expected_offset += (strip_bottom - strip_top) * stride
+        
+        return offset, stride, orientation, rawmode
+    
+    @staticmethod
+    def _map_raster(path, layout, size, mode='r'):
+        """
+        Memory-map an uncompressed raster as a (height, width, 3) RGB view
+        
+        Args:
+            path (str): Image file path
+            layout (tuple): Result of _raster_layout
+            size (tuple): (width, height)
+            mode (str): np.memmap mode ('r' or 'r+')
+            
+        Returns:
+            tuple: (memmap, RGB-ordered row-major view)
+        """
+        offset, stride, orientation, rawmode = layout
+        width, height = size
+        mapped = np.memmap(path, dtype=np.uint8, mode=mode, offset=offset, shape=(height, stride))
+        raster = mapped[:, :width * 3].reshape(height, width, 3)
+        if orientation < 0:
+            raster = raster[::-1]
+        if rawmode == 'BGR':
+            raster = raster[..., ::-1]
+        return mapped, raster
+    
+    @staticmethod
+    def _same_format(image, output_path):
+        """Check whether output_path would be saved in the image's own format"""
+        extension = os.path.splitext(output_path)[1].lower()
+        return Image.registered_extensions().get(extension) == image.format
+    
     @classmethod
-    def encode(cls, image_path, message, output_path, compress=True):
+    def _iter_strips(cls, image_path, strip_rows):
         """
-        Encode message into image
+        Yield flat pixel strips of an image, top to bottom
+        
+        Uncompressed rasters are read through a memory map; other formats
+        are decoded whole by PIL first.
+        
+        Args:
+            image_path (str): Path to image
+            strip_rows (int): Rows per strip
+            
+        Yields:
+            np.ndarray: Flat uint8 array of one strip in (row, col, channel) order
+        """
+        image = Image.open(image_path)
+        width, height = image.size
+        layout = cls._raster_layout(image)
+        
+        if layout is not None:
+            image.close()
+            _, raster = cls._map_raster(image_path, layout, (width, height))
+            for top in range(0, height, strip_rows):
+                yield np.ascontiguousarray(raster[top:top + strip_rows]).reshape(-1)
+            return
+        
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        for top in range(0, height, strip_rows):
+            box = (0, top, width, min(top + strip_rows, height))
+            yield np.asarray(image.crop(box)).reshape(-1)
+    
+    @classmethod
+    def _embed(cls, image_path, stream, output_path, strip_rows=None, password=None):
+        """
+        Embed a header-prefixed payload stream into an image
         
         Args:
             image_path (str): Path to cover image
-            message (str): Message to hide
+            stream (bytes): Header-prefixed payload
             output_path (str): Path to save stego image
-            compress (bool): Whether to compress message before encoding
-            
-        Returns:
-            dict: Contains success status and metadata
+            strip_rows (int, optional): Process the image in strips of this
+                many rows instead of loading it into one array
+            password (str, optional): Scatter bits in a keyed pseudo-random order
         """
+        bits = lsb.bytes_to_bits(stream)
+        
+        if strip_rows is not None and password is not None:
+            raise ValueError("password scatter mode cannot be combined with strip_rows")
+        
+        if strip_rows is not None:
+            cls._embed_tiled(image_path, bits, output_path, strip_rows)
+            return
+        
         # Load image
         image = Image.open(image_path).convert('RGB')
-        pixels = np.array(image, dtype=np.int32)  # Use int32 to prevent overflow
+        pixels = np.array(image, dtype=np.uint8)
         
-        # Compress if requested
-        if compress:
-            message = cls.compress_text(message)
+        # Check capacity
+        max_bytes = pixels.size // 8
+        if bits.size > pixels.size:
+            raise ValueError(f"Message too large. Maximum {max_bytes} bytes, got {len(stream)} bytes")
         
-        # Add delimiter
-        message_with_delimiter = message + cls.DELIMITER
+        if password is not None:
+            lsb.embed_keyed(pixels.reshape(-1), bits, password)
+        else:
+            # Encode message into the flat (row, col, channel) ordered view
+            lsb.embed_bits(pixels.reshape(-1), bits)
         
-        # Convert to binary
-        binary_message = cls._text_to_binary(message_with_delimiter)
+        stego_image = Image.fromarray(pixels)
+        stego_image.save(output_path)
+    
+    @classmethod
+    def _embed_tiled(cls, image_path, bits, output_path, strip_rows):
+        """
+        Embed bits strip by strip
+        
+        Uncompressed rasters (PPM, BMP, raw TIFF) saved to the same format are
+        copied (or patched directly when output_path is the cover) through a
+        memory map, so working memory is bounded by strip size. Other formats,
+        PNG included, are decoded whole by PIL and only the payload arithmetic
+        is done per strip; memory then scales with the image. Only strips
+        holding payload bits are touched, and the resulting pixels match the
+        in-memory path.
+        
+        Args:
+            image_path (str): Path to cover image
+            bits (np.ndarray): Payload bits
+            output_path (str): Path to save stego image
+            strip_rows (int): Rows per strip
+        """
+        if strip_rows < 1:
+            raise ValueError("strip_rows must be at least 1")
+        
+        image = Image.open(image_path)
+        width, height = image.size
+        row_bits = width * 3
         
         # Check capacity
-        max_bytes = pixels.size // 8
-        if len(binary_message) > pixels.size:
-            raise ValueError(f"Message too large. Maximum {max_bytes} bytes, got {len(binary_message)//8} bytes")
-        
-        # Encode message
-        data_index = 0
-        for row in range(pixels.shape[0]):
-            for col in range(pixels.shape[1]):
-                if data_index >= len(binary_message):
-                    break
-                
-                for color_channel in range(3):  # RGB
-                    if data_index < len(binary_message):
-                        # Modify LSB
-                        pixels[row, col, color_channel] = (pixels[row, col, color_channel] & ~1) | int(binary_message[data_index])
-                        data_index += 1
+        if bits.size > row_bits * height:
+            raise ValueError(f"Message too large. Maximum {row_bits * height // 8} bytes, "
+                             f"got {bits.size // 8} bytes")
+        rows_needed = -(-bits.size // row_bits)
+        
+        layout = cls._raster_layout(image)
+        if layout is not None and cls._same_format(image, output_path):
+            image.close()
+            FileManager.copy_for_patching(image_path, output_path)
+            mapped, raster = cls._map_raster(output_path, layout, (width, height), 'r+')
+            
+            for top in range(0, rows_needed, strip_rows):
+                strip = np.array(raster[top:top + strip_rows])
+                start = top * row_bits
+                lsb.embed_bits(strip.reshape(-1), bits[start:start + strip.size])
+                raster[top:top + strip_rows] = strip
             
-            if data_index >= len(binary_message):
-                break
+            mapped.flush()
+            del mapped, raster
+            return
         
-        # Save image - ensure proper uint8 conversion
-        stego_image = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
-        stego_image.save(output_path)
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        
+        for top in range(0, rows_needed, strip_rows):
+            box = (0, top, width, min(top + strip_rows, height))
+            strip = np.array(image.crop(box), dtype=np.uint8)
+            start = top * row_bits
+            lsb.embed_bits(strip.reshape(-1), bits[start:start + strip.size])
+            image.paste(Image.fromarray(strip), box)
+        
+        image.save(output_path)
+    
+    @classmethod
+    def _extract(cls, image_path, strip_rows=None, password=None):
+        """
+        Extract the hidden payload from an image
+        
+        Args:
+            image_path (str): Path to stego image
+            strip_rows (int, optional): Read the image in strips of this many
+                rows, stopping once the payload is complete
+            password (str, optional): Password used for scatter mode
+            
+        Returns:
+            tuple: (flags, data) for headered payloads, (None, data) for legacy
+                delimiter-terminated messages
+        """
+        delimiter = cls._text_to_bytes(cls.DELIMITER)
+        
+        if strip_rows is not None and password is not None:
+            raise ValueError("password scatter mode cannot be combined with strip_rows")
+        
+        if strip_rows is not None:
+            result = payload.read(lsb.StreamReader(cls._iter_strips(image_path, strip_rows)).read_bytes)
+            if result is not None:
+                return result
+            
+            data = lsb.StreamReader(cls._iter_strips(image_path, strip_rows)).find(delimiter)
+            if data is None:
+                raise ValueError("No hidden message found or message corrupted")
+            return None, data
+        
+        # Load image
+        image = Image.open(image_path).convert('RGB')
+        flat = np.asarray(image).reshape(-1)
+        
+        if password is not None:
+            def read_keyed(offset, count):
+                return lsb.extract_keyed_bytes(flat, count, password, offset * 8)
+            
+            result = payload.read(read_keyed, flat.size // 8)
+            if result is None:
+                raise ValueError("No hidden message found, wrong password or message corrupted")
+            return result
+        
+        # Read only the header and payload bits
+        result = payload.read(lambda offset, count: lsb.extract_bytes(flat, count, offset * 8),
+                              flat.size // 8)
+        if result is not None:
+            return result
+        
+        # Legacy format: extract bytes until the delimiter is found
+        data = lsb.find_delimited(flat, delimiter)
+        if data is None:
+            raise ValueError("No hidden message found or message corrupted")
+        
+        return None, data
+    
+    @classmethod
+    def encode(cls, image_path, message, output_path, compress=True, strip_rows=None, password=None):
+        """
+        Encode message into image
+        
+        Args:
+            image_path (str): Path to cover image
+            message (str): Message to hide
+            output_path (str): Path to save stego image
+            compress (bool): Whether to compress message before encoding
+            strip_rows (int, optional): Tiled mode for very large covers,
+                processing this many rows at a time (memory is bounded only
+                for uncompressed PPM/BMP/TIFF covers)
+            password (str, optional): Scatter the payload over the image in a
+                password-keyed pseudo-random order (not with strip_rows)
+            
+        Returns:
+            dict: Contains success status and metadata
+        """
+        stream = payload.encode_text(message, compress)
+        cls._embed(image_path, stream, output_path, strip_rows, password)
+        
+        return {
+            'success': True,
+            'message_size': len(stream) - payload.HEADER_SIZE,
+            'compressed': compress,
+            'output_path': output_path
+        }
+    
+    @classmethod
+    def encode_bytes(cls, image_path, data, output_path, compress=False, strip_rows=None, password=None):
+        """
+        Encode raw bytes into image
+        
+        Args:
+            image_path (str): Path to cover image
+            data (bytes): Data to hide (e.g. ciphertext, archives, keys)
+            output_path (str): Path to save stego image
+            compress (bool): Whether to zlib compress data before encoding
+            strip_rows (int, optional): Tiled mode for very large covers,
+                processing this many rows at a time (memory is bounded only
+                for uncompressed PPM/BMP/TIFF covers)
+            password (str, optional): Scatter the payload over the image in a
+                password-keyed pseudo-random order (not with strip_rows)
+            
+        Returns:
+            dict: Contains success status and metadata
+        """
+        stream = payload.encode_bytes(data, compress)
+        cls._embed(image_path, stream, output_path, strip_rows, password)
         
         return {
             'success': True,
-            'message_size': len(message),
+            'message_size': len(stream) - payload.HEADER_SIZE,
             'compressed': compress,
             'output_path': output_path
         }
     
     @classmethod
-    def decode(cls, image_path, compressed=True):
+    def decode(cls, image_path, compressed=True, strip_rows=None, password=None):
         """
         Decode message from image
         
         Args:
             image_path (str): Path to stego image
-            compressed (bool): Whether message was compressed
+            compressed (bool): Whether message was compressed (legacy
+                delimiter-terminated images only; headered payloads record it)
+            strip_rows (int, optional): Tiled mode, reading this many rows at a time
+            password (str, optional): Password used when encoding in scatter mode
             
         Returns:
             str: Hidden message
         """
-        # Load image
-        image = Image.open(image_path).convert('RGB')
-        pixels = np.array(image)
-        
-        # Extract binary data
-        binary_data = ""
-        for row in range(pixels.shape[0]):
-            for col in range(pixels.shape[1]):
-                pixel = pixels[row, col]
-                for color_channel in range(3):  # RGB
-                    binary_data += str(pixel[color_channel] & 1)
-        
-        # Convert to text
-        message_with_delimiter = cls._binary_to_text(binary_data)
-        
-        # Find delimiter
-        delimiter_index = message_with_delimiter.find(cls.DELIMITER)
-        if delimiter_index == -1:
-            raise ValueError("No hidden message found or message corrupted")
+        flags, data = cls._extract(image_path, strip_rows, password)
+        if flags is not None:
+            return payload.decode_text(flags, data)
         
-        message = message_with_delimiter[:delimiter_index]
+        message = cls._bytes_to_text(data)
         
         # Decompress if needed
         if compressed:
@@ -160,6 +409,24 @@ class ImageSteganography:
         
         return message
     
+    @classmethod
+    def decode_bytes(cls, image_path, strip_rows=None, password=None):
+        """
+        Decode raw bytes from image
+        
+        Args:
+            image_path (str): Path to stego image
+            strip_rows (int, optional): Tiled mode, reading this many rows at a time
+            password (str, optional): Password used when encoding in scatter mode
+            
+        Returns:
+            bytes: Hidden data
+        """
+        flags, data = cls._extract(image_path, strip_rows, password)
+        if flags is None:
+            return data
+        return payload.decode_bytes(flags, data)
+    
     @staticmethod
     def get_capacity(image_path):
         """
@@ -176,32 +443,131 @@ class ImageSteganography:
         total_pixels = width * height
         max_bits = total_pixels * 3  # 3 channels (RGB)
         max_bytes = max_bits // 8
-        max_chars = max_bytes  # Approximately, excluding delimiter
+        max_chars = max_bytes  # Approximately, excluding header
         
         return {
             'image_size': f"{width}x{height}",
             'total_pixels': total_pixels,
             'max_bits': max_bits,
             'max_bytes': max_bytes,
-            'max_chars_approx': max_chars - len(ImageSteganography.DELIMITER)
+            'max_chars_approx': max_chars - payload.HEADER_SIZE
         }
 
 
 class AdvancedImageSteganography:
     """Advanced image steganography with multiple bits per pixel"""
     
-    def __init__(self, bits_per_channel=2):
+    def __init__(self, bits_per_channel=2, password=None):
         """
         Initialize with configurable bits per channel
         
         Args:
             bits_per_channel (int): Number of LSBs to use (1-4)
+            password (str, optional): Scatter symbols over the image in a
+                password-keyed pseudo-random order
         """
         if bits_per_channel < 1 or bits_per_channel > 4:
             raise ValueError("bits_per_channel must be between 1 and 4")
         
         self.bits_per_channel = bits_per_channel
-        self.mask = (1 << bits_per_channel) - 1
+        self.password = password
+    
+    def _read_bytes(self, flat, offset, count):
+        """
+        Read bytes from the multi-bit stream without unpacking the whole image
+        
+        Args:
+            flat (np.ndarray): Flat pixel array
+            offset (int): Byte offset into the hidden stream
+            count (int): Number of bytes to read
+            
+        Returns:
+            bytes: Extracted bytes
+        """
+        width = self.bits_per_channel
+        first_bit = offset * 8
+        last_bit = min((offset + count) * 8, flat.size * width)
+        if last_bit <= first_bit:
+            return b''
+        
+        first_symbol = first_bit // width
+        last_symbol = -(-last_bit // width)
+        if self.password is not None:
+            carrier = flat[lsb.keyed_indices(self.password, flat.size, last_symbol - first_symbol, first_symbol)]
+            symbols = lsb.extract_symbols(carrier, carrier.size, width)
+        else:
+            symbols = lsb.extract_symbols(flat, last_symbol - first_symbol, width, first_symbol)
+        bits = lsb.unpack_symbols(symbols, width)
+        
+        skip = first_bit - first_symbol * width
+        bits = bits[skip:skip + last_bit - first_bit]
+        return np.packbits(bits[:bits.size - bits.size % 8]).tobytes()
+    
+    def _embed(self, image_path, stream, output_path):
+        """
+        Embed a header-prefixed payload stream using multiple LSBs
+        
+        Args:
+            image_path (str): Path to cover image
+            stream (bytes): Header-prefixed payload
+            output_path (str): Path to save stego image
+        """
+        image = Image.open(image_path).convert('RGB')
+        pixels = np.array(image, dtype=np.uint8)
+        
+        # Reshape the payload into k-bit symbols, one per channel value
+        symbols = lsb.pack_symbols(lsb.bytes_to_bits(stream), self.bits_per_channel)
+        
+        # Check capacity
+        if symbols.size > pixels.size:
+            raise ValueError("Message too large for this image and bit configuration")
+        
+        flat = pixels.reshape(-1)
+        if self.password is not None:
+            indices = lsb.keyed_indices(self.password, flat.size, symbols.size)
+            carrier = flat[indices]
+            lsb.embed_symbols(carrier, symbols, self.bits_per_channel)
+            flat[indices] = carrier
+        else:
+            lsb.embed_symbols(flat, symbols, self.bits_per_channel)
+        
+        stego_image = Image.fromarray(pixels)
+        stego_image.save(output_path)
+    
+    def _extract(self, image_path):
+        """
+        Extract the hidden payload from an image
+        
+        Args:
+            image_path (str): Path to stego image
+            
+        Returns:
+            tuple: (flags, data) for headered payloads, (None, data) for legacy
+                end-marker terminated messages
+        """
+        image = Image.open(image_path).convert('RGB')
+        flat = np.asarray(image).reshape(-1)
+        
+        # Read only the symbols holding the header and payload
+        result = payload.read(lambda offset, count: self._read_bytes(flat, offset, count),
+                              flat.size * self.bits_per_channel // 8)
+        if result is not None:
+            return result
+        if self.password is not None:
+            raise ValueError("No hidden message found, wrong password or message corrupted")
+        
+        # Legacy format: whole message bytes followed by 16 consecutive '1'
+        # bits, so the marker starts at the first byte boundary of a long run
+        bits = lsb.unpack_symbols(lsb.extract_symbols(flat, flat.size, self.bits_per_channel),
+                                  self.bits_per_channel)
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], bits, [0])).astype(np.int8)))
+        run_starts, run_ends = edges[::2], edges[1::2]
+        marker_starts = -(-run_starts // 8) * 8
+        candidates = np.flatnonzero(marker_starts + 16 <= run_ends)
+        if candidates.size == 0:
+            raise ValueError("No hidden message found")
+        
+        return None, np.packbits(bits[:marker_starts[candidates[0]]]).tobytes()
     
     def encode(self, image_path, message, output_path):
         """
@@ -215,48 +581,35 @@ class AdvancedImageSteganography:
         Returns:
             dict: Encoding result
         """
-        image = Image.open(image_path).convert('RGB')
-        pixels = np.array(image)
-        
-        # Prepare message
-        binary_message = ''.join(format(ord(c), '08b') for c in message)
-        binary_message += '1' * 16  # End marker
+        stream = payload.encode_text(message)
+        self._embed(image_path, stream, output_path)
         
-        # Check capacity
-        max_bits = pixels.size * self.bits_per_channel
-        if len(binary_message) > max_bits:
-            raise ValueError("Message too large for this image and bit configuration")
+        return {
+            'success': True,
+            'bits_per_channel': self.bits_per_channel,
+            'message_size': len(stream) - payload.HEADER_SIZE
+        }
+    
+    def encode_bytes(self, image_path, data, output_path, compress=False):
+        """
+        Encode raw bytes using multiple LSBs
         
-        # Encode
-        bit_index = 0
-        for row in range(pixels.shape[0]):
-            for col in range(pixels.shape[1]):
-                if bit_index >= len(binary_message):
-                    break
-                
-                pixel = list(pixels[row, col])
-                for channel in range(3):
-                    if bit_index < len(binary_message):
-                        # Clear LSBs and set new value
-                        bits_to_embed = binary_message[bit_index:bit_index + self.bits_per_channel]
-                        bits_to_embed = bits_to_embed.ljust(self.bits_per_channel, '0')
-                        value = int(bits_to_embed, 2)
-                        
-                        pixel[channel] = (pixel[channel] & ~self.mask) | value
-                        bit_index += self.bits_per_channel
-                
-                pixels[row, col] = tuple(pixel)
+        Args:
+            image_path (str): Path to cover image
+            data (bytes): Data to hide
+            output_path (str): Path to save stego image
+            compress (bool): Whether to zlib compress data before encoding
             
-            if bit_index >= len(binary_message):
-                break
-        
-        stego_image = Image.fromarray(pixels.astype(np.uint8))
-        stego_image.save(output_path)
+        Returns:
+            dict: Encoding result
+        """
+        stream = payload.encode_bytes(data, compress)
+        self._embed(image_path, stream, output_path)
         
         return {
             'success': True,
             'bits_per_channel': self.bits_per_channel,
-            'message_size': len(message)
+            'message_size': len(stream) - payload.HEADER_SIZE
         }
     
     def decode(self, image_path):
@@ -269,27 +622,22 @@ class AdvancedImageSteganography:
         Returns:
             str: Hidden message
         """
-        image = Image.open(image_path).convert('RGB')
-        pixels = np.array(image)
-        
-        # Extract bits
-        binary_data = ""
-        for row in range(pixels.shape[0]):
-            for col in range(pixels.shape[1]):
-                pixel = pixels[row, col]
-                for channel in range(3):
-                    bits = format(pixel[channel] & self.mask, f'0{self.bits_per_channel}b')
-                    binary_data += bits
-        
-        # Find end marker
-        end_marker = '1' * 16
-        marker_index = binary_data.find(end_marker)
-        if marker_index == -1:
-            raise ValueError("No hidden message found")
-        
-        binary_data = binary_data[:marker_index]
-        
-        # Convert to text
-        message = ''.join(chr(int(binary_data[i:i+8], 2)) for i in range(0, len(binary_data), 8))
+        flags, data = self._extract(image_path)
+        if flags is None:
+            return data.decode('latin-1')
+        return payload.decode_text(flags, data)
+    
+    def decode_bytes(self, image_path):
+        """
+        Decode raw bytes from image
         
-        return message
+        Args:
+            image_path (str): Path to stego image
+            
+        Returns:
+            bytes: Hidden data
+        """
+        flags, data = self._extract(image_path)
+        if flags is None:
+            return data
+        return payload.decode_bytes(flags, data)
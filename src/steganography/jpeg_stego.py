@@ -0,0 +1,554 @@
+"""
+JPEG Steganography Module
+Hides data in the quantized DCT coefficients of baseline JPEG files
+"""
+
+import io
+import re
+import struct
+
+import numpy as np
+from PIL import Image
+
+from . import lsb, payload
+
+
+# Entropy-coded data ends at the first marker that is neither stuffing nor a restart marker
+SCAN_END = re.compile(rb'\xff[^\x00\xd0-\xd7]')
+RESTART_MARKER = re.compile(rb'(\xff[\xd0-\xd7])')
+
+# Start-of-frame markers for baseline and extended sequential Huffman coding
+SEQUENTIAL_HUFFMAN = (0xC0, 0xC1)
+
+
+# Scan bytes decoded per window (the unit in which carriers are yielded;
+# never less than two maximal blocks)
+WINDOW_BYTES = 1 << 15
+
+# Upper bound on the bits one coded 8x8 block can span (DC plus 63 AC codes)
+MAX_BLOCK_BITS = 64 * 32
+
+# AC step fields: bits to advance | coefficient positions << 8 | carrier flag
+AC_CARRIER = 0x8000
+
+
+class HuffmanTable:
+    """Canonical Huffman table decoded through a 16-bit prefix lookup"""
+    
+    def __init__(self, counts, symbols):
+        """
+        Args:
+            counts (bytes): Number of codes of each length 1-16
+            symbols (bytes): Symbols in code order
+        """
+        self.symbols = np.zeros(65536, dtype=np.int32)
+        self.lengths = np.zeros(65536, dtype=np.int32)  # 0 marks an invalid prefix
+        
+        code = 0
+        index = 0
+        for length in range(1, 17):
+            for _ in range(counts[length - 1]):
+                start = code << (16 - length)
+                end = (code + 1) << (16 - length)
+                self.symbols[start:end] = symbols[index]
+                self.lengths[start:end] = length
+                code += 1
+                index += 1
+            code <<= 1
+    
+    def dc_steps(self):
+        """
+        Bits taken by a DC code and its additional bits, per 16-bit prefix
+        
+        Returns:
+            np.ndarray: Step per prefix, 0 for invalid prefixes
+        """
+        return np.where(self.lengths > 0, self.lengths + self.symbols, 0)
+    
+    def ac_steps(self):
+        """
+        Combined decoding step of an AC code, per 16-bit prefix
+        
+        Each entry packs the bits taken by the code and its additional bits,
+        the number of coefficient positions it covers (64 for end of block)
+        shifted left by 8, and AC_CARRIER for coefficients of magnitude >= 2.
+        
+        Returns:
+            np.ndarray: Step per prefix, 0 for invalid prefixes
+        """
+        run, size = self.symbols >> 4, self.symbols & 15
+        coefficients = np.where(size > 0, run + 1, np.where(self.symbols == 0xF0, 16, 64))
+        steps = (self.lengths + size) | (coefficients << 8) | np.where(size >= 2, AC_CARRIER, 0)
+        return np.where(self.lengths > 0, steps, 0)
+
+
+class JPEGFile:
+    """
+    Baseline JPEG split into its headers and entropy-coded scan
+    
+    Only the additional bits of the Huffman-coded coefficients are touched,
+    so quantisation tables, Huffman tables and all other coefficients are
+    preserved exactly.
+    """
+    
+    def __init__(self, data):
+        """
+        Args:
+            data (bytes): Complete JPEG file
+        
+        Raises:
+            ValueError: If the file is not a single-scan sequential Huffman JPEG
+        """
+        if data[:2] != b'\xff\xd8':
+            raise ValueError("Not a JPEG file")
+        
+        self.data = data
+        self.tables = {}
+        self.components = {}
+        self.restart_interval = 0
+        self.scan_components = None
+        
+        position = 2
+        while self.scan_components is None:
+            marker, segment, next_position = self._read_marker(data, position)
+            
+            if marker == 0xC4:  # DHT
+                offset = 0
+                while offset < len(segment):
+                    table_class, table_id = segment[offset] >> 4, segment[offset] & 15
+                    counts = segment[offset + 1:offset + 17]
+                    total = sum(counts)
+                    symbols = segment[offset + 17:offset + 17 + total]
+                    self.tables[(table_class, table_id)] = HuffmanTable(counts, symbols)
+                    offset += 17 + total
+            
+            elif marker in SEQUENTIAL_HUFFMAN:
+                precision, self.height, self.width, n_components = struct.unpack('>BHHB', segment[:6])
+                for i in range(n_components):
+                    component_id, sampling, _ = segment[6 + 3 * i:9 + 3 * i]
+                    self.components[component_id] = (sampling >> 4, sampling & 15)
+            
+            elif 0xC2 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                raise ValueError("Only baseline (sequential Huffman) JPEG is supported")
+            
+            elif marker == 0xDD:  # DRI
+                self.restart_interval = struct.unpack('>H', segment[:2])[0]
+            
+            elif marker == 0xDA:  # SOS
+                if not self.components:
+                    raise ValueError("JPEG scan precedes frame header")
+                n_scan = segment[0]
+                self.scan_components = [
+                    (segment[1 + 2 * i], segment[2 + 2 * i] >> 4, segment[2 + 2 * i] & 15)
+                    for i in range(n_scan)
+                ]
+                start, end = segment[1 + 2 * n_scan], segment[2 + 2 * n_scan]
+                if (start, end) != (0, 63) or segment[3 + 2 * n_scan]:
+                    raise ValueError("Only baseline (sequential Huffman) JPEG is supported")
+                if len(self.scan_components) != len(self.components):
+                    raise ValueError("Only single-scan JPEG is supported")
+            
+            elif marker == 0xD9:
+                raise ValueError("JPEG file has no image data")
+            
+            position = next_position
+        
+        match = SCAN_END.search(data, position)
+        self.scan_start = position
+        self.scan_end = match.start() if match else len(data)
+        if b'\xff\xda' in data[self.scan_end:]:
+            raise ValueError("Only single-scan JPEG is supported")
+        
+        # Restart markers split the scan into independently coded intervals
+        parts = RESTART_MARKER.split(data[self.scan_start:self.scan_end])
+        self.intervals = [part.replace(b'\xff\x00', b'\xff') for part in parts[::2]]
+        self.markers = parts[1::2]
+    
+    @staticmethod
+    def _read_marker(data, position):
+        """Return (marker, segment, next_position) for the marker at position"""
+        while position < len(data) and data[position] == 0xFF and data[position + 1] == 0xFF:
+            position += 1  # Fill bytes
+        if position + 1 >= len(data) or data[position] != 0xFF:
+            raise ValueError("Corrupt JPEG marker structure")
+        
+        marker = data[position + 1]
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            return marker, b'', position + 2
+        
+        length = struct.unpack('>H', data[position + 2:position + 4])[0]
+        return marker, data[position + 4:position + 2 + length], position + 2 + length
+    
+    def _mcu_layout(self):
+        """Return (number of MCUs, [(dc_table, ac_table) per block of an MCU])"""
+        def ceil_div(a, b):
+            return -(-a // b)
+        
+        h_max = max(h for h, _ in self.components.values())
+        v_max = max(v for _, v in self.components.values())
+        
+        blocks = []
+        for component_id, dc_id, ac_id in self.scan_components:
+            h, v = self.components[component_id]
+            if len(self.scan_components) == 1:
+                h = v = 1  # Non-interleaved scans code one block per MCU
+            tables = (self.tables[(0, dc_id)], self.tables[(1, ac_id)])
+            blocks.extend([tables] * (h * v))
+        
+        if len(self.scan_components) == 1:
+            h, v = self.components[self.scan_components[0][0]]
+            columns = ceil_div(ceil_div(self.width * h, h_max), 8)
+            rows = ceil_div(ceil_div(self.height * v, v_max), 8)
+        else:
+            columns = ceil_div(self.width, 8 * h_max)
+            rows = ceil_div(self.height, 8 * v_max)
+        
+        return columns * rows, blocks
+    
+    @staticmethod
+    def _bit_windows(padded, first_byte, n_bytes):
+        """
+        16-bit prefix starting at every bit position of a byte range
+        
+        Args:
+            padded (bytes): Interval followed by at least 2 zero bytes
+            first_byte (int): First byte of the range
+            n_bytes (int): Bytes in the range
+        
+        Returns:
+            np.ndarray: One prefix per bit position
+        """
+        data = np.frombuffer(padded, dtype=np.uint8, count=n_bytes + 2, offset=first_byte).astype(np.uint32)
+        words = (data[:-2] << 16) | (data[1:-1] << 8) | data[2:]
+        return ((words[:, None] >> np.arange(8, 0, -1, dtype=np.uint32)) & 0xFFFF).reshape(-1)
+    
+    @staticmethod
+    def _window_carriers(window_steps, starts, table_ids):
+        """
+        Decode the AC codes of many blocks side by side
+        
+        Args:
+            window_steps (np.ndarray): AC steps per (AC table, bit position)
+            starts (np.ndarray): Bit position of each block's first AC code
+            table_ids (np.ndarray): AC table of each block
+        
+        Returns:
+            np.ndarray: Sorted carrier bit positions within the window
+        """
+        found = [np.zeros(0, dtype=np.int64)]
+        positions = starts
+        k = np.ones(starts.size, dtype=np.int64)
+        while positions.size:
+            steps = window_steps[table_ids, positions]
+            positions = positions + (steps & 255)
+            found.append(positions[(steps & AC_CARRIER) != 0] - 1)
+            k += steps >> 8 & 127
+            active = k < 64
+            positions, table_ids, k = positions[active], table_ids[active], k[active]
+        return np.sort(np.concatenate(found))
+    
+    def iter_carriers(self):
+        """
+        Locate usable coefficient bits, decoding the scan only as far as needed
+        
+        A carrier bit is the last additional bit of an AC coefficient with
+        magnitude of at least 2. Flipping it changes the magnitude by one
+        within the same size category, so the Huffman code and the length
+        of the scan are unchanged. DC coefficients and +-1 are never touched.
+        
+        The scan is decoded a window at a time. NumPy maps every bit position
+        of the window through the AC tables, so the Python walk that finds
+        where each block ends costs one lookup per code and keeps no per-
+        coefficient state; the carriers of all blocks in the window are then
+        decoded side by side with array operations.
+        
+        Yields:
+            tuple: (interval index, np.ndarray of bit positions in the unstuffed interval)
+        """
+        n_mcus, blocks = self._mcu_layout()
+        per_interval = self.restart_interval or n_mcus
+        
+        dc_tables, ac_tables, block_tables = [], [], []
+        for dc, ac in blocks:
+            for table, known in ((dc, dc_tables), (ac, ac_tables)):
+                if not any(table is other for other in known):
+                    known.append(table)
+            block_tables.append((next(i for i, t in enumerate(dc_tables) if t is dc),
+                                 next(i for i, t in enumerate(ac_tables) if t is ac)))
+        dc_steps = [table.dc_steps().tolist() for table in dc_tables]
+        ac_steps = np.stack([table.ac_steps() for table in ac_tables]).astype(np.uint16)
+        
+        for index, interval in enumerate(self.intervals):
+            remaining = min(per_interval, n_mcus - index * per_interval) * len(blocks)
+            padded = interval + b'\x00\x00\x00'
+            limit = len(interval) * 8
+            p = 0
+            block = 0
+            
+            while remaining > 0:
+                if p >= limit:
+                    raise ValueError("Corrupt JPEG scan data")
+                first_byte = p >> 3
+                n_bytes = min(max(WINDOW_BYTES, 2 * MAX_BLOCK_BITS // 8), len(interval) - first_byte)
+                base, span = first_byte * 8, n_bytes * 8
+                last_window = first_byte + n_bytes == len(interval)
+                
+                windows = self._bit_windows(padded, first_byte, n_bytes)
+                window_steps = ac_steps[:, windows]
+                prefixes = memoryview(windows)
+                ac_views = [memoryview(steps) for steps in window_steps]
+                
+                # Walk block by block to find where each block's AC codes start
+                q = p - base
+                starts, table_ids = [], []
+                try:
+                    while remaining > 0 and (last_window or q + MAX_BLOCK_BITS <= span):
+                        dc_table, ac_table = block_tables[block]
+                        step = dc_steps[dc_table][prefixes[q]]
+                        if not step:
+                            raise ValueError("Corrupt JPEG scan data")
+                        q += step
+                        starts.append(q)
+                        table_ids.append(ac_table)
+                        
+                        ac = ac_views[ac_table]
+                        k = 1
+                        while k < 64:
+                            step = ac[q]
+                            if not step:
+                                raise ValueError("Corrupt JPEG scan data")
+                            q += step & 255
+                            k += step >> 8 & 127
+                        
+                        block = (block + 1) % len(blocks)
+                        remaining -= 1
+                except IndexError:
+                    raise ValueError("Corrupt JPEG scan data")
+                
+                p = base + q
+                if p > limit:
+                    raise ValueError("Corrupt JPEG scan data")
+                carriers = self._window_carriers(window_steps, np.array(starts, dtype=np.int64),
+                                                 np.array(table_ids, dtype=np.int64))
+                yield index, carriers + base
+    
+    def interval_bits(self, index):
+        """Unpack an interval into a writable bit array"""
+        return np.unpackbits(np.frombuffer(self.intervals[index], dtype=np.uint8))
+    
+    def to_bytes(self):
+        """Reassemble the file with byte stuffing restored"""
+        scan = bytearray()
+        for i, interval in enumerate(self.intervals):
+            scan += interval.replace(b'\xff', b'\xff\x00')
+            if i < len(self.markers):
+                scan += self.markers[i]
+        return self.data[:self.scan_start] + bytes(scan) + self.data[self.scan_end:]
+
+
+class JPEGSteganography:
+    """JPEG steganography using quantized DCT coefficients"""
+    
+    @staticmethod
+    def _load_cover(image_path, quality):
+        """
+        Load a cover as a baseline JPEG, re-encoding in memory only if needed
+        
+        Args:
+            image_path (str): Path to cover image
+            quality (int): JPEG quality used when the cover must be re-encoded
+        
+        Returns:
+            tuple: (JPEGFile, re-encoded flag)
+        """
+        with open(image_path, 'rb') as f:
+            data = f.read()
+        
+        try:
+            return JPEGFile(data), False
+        except ValueError:
+            pass
+        
+        # Progressive JPEG or other formats: write a baseline JPEG to memory
+        image = Image.open(io.BytesIO(data))
+        if image.mode not in ('L', 'RGB'):
+            image = image.convert('RGB')
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', quality=quality)
+        return JPEGFile(buffer.getvalue()), True
+    
+    @staticmethod
+    def _embed(jpeg, stream):
+        """
+        Embed a header-prefixed payload stream into coefficient bits
+        
+        Args:
+            jpeg (JPEGFile): Cover JPEG, modified in place
+            stream (bytes): Header-prefixed payload
+        """
+        bits = lsb.bytes_to_bits(stream)
+        targets = {}
+        used = 0
+        
+        # Decode the scan only until enough coefficients are found
+        for index, positions in jpeg.iter_carriers():
+            take = positions[:bits.size - used]
+            targets.setdefault(index, []).append(take)
+            used += take.size
+            if used == bits.size:
+                break
+        
+        if used < bits.size:
+            raise ValueError(f"Message too large. Maximum {used // 8} bytes, got {len(stream)} bytes")
+        
+        used = 0
+        for index, chunks in targets.items():
+            positions = np.concatenate(chunks)
+            interval = jpeg.interval_bits(index)
+            interval[positions] = bits[used:used + positions.size]
+            jpeg.intervals[index] = np.packbits(interval).tobytes()
+            used += positions.size
+    
+    @staticmethod
+    def _extract(image_path):
+        """
+        Extract the hidden payload from a JPEG
+        
+        Args:
+            image_path (str): Path to stego image
+        
+        Returns:
+            tuple: (flags, data)
+        """
+        with open(image_path, 'rb') as f:
+            jpeg = JPEGFile(f.read())
+        
+        def carriers():
+            cached = {}
+            for index, positions in jpeg.iter_carriers():
+                if index not in cached:
+                    cached.clear()
+                    cached[index] = jpeg.interval_bits(index)
+                yield cached[index][positions]
+        
+        result = payload.read(lsb.StreamReader(carriers()).read_bytes)
+        if result is None:
+            raise ValueError("No hidden message found or message corrupted")
+        
+        return result
+    
+    @classmethod
+    def _encode_stream(cls, image_path, stream, output_path, quality):
+        """Embed a payload stream and write the stego JPEG"""
+        jpeg, reencoded = cls._load_cover(image_path, quality)
+        cls._embed(jpeg, stream)
+        
+        with open(output_path, 'wb') as f:
+            f.write(jpeg.to_bytes())
+        
+        return {
+            'success': True,
+            'message_size': len(stream) - payload.HEADER_SIZE,
+            'output_path': output_path,
+            'quality': quality if reencoded else None,
+            'reencoded': reencoded,
+            'note': 'Data stored in quantized DCT coefficients; re-saving the JPEG destroys it'
+        }
+    
+    @classmethod
+    def encode(cls, image_path, message, output_path, quality=95):
+        """
+        Encode message into JPEG DCT coefficients
+        
+        Baseline JPEG covers keep their quantisation and Huffman tables;
+        other covers are converted to baseline JPEG in memory first.
+        
+        Args:
+            image_path (str): Path to cover image
+            message (str): Message to hide
+            output_path (str): Output path
+            quality (int): JPEG quality used if the cover must be re-encoded
+        
+        Returns:
+            dict: Encoding result
+        """
+        return cls._encode_stream(image_path, payload.encode_text(message), output_path, quality)
+    
+    @classmethod
+    def encode_bytes(cls, image_path, data, output_path, quality=95, compress=False):
+        """
+        Encode raw bytes into JPEG DCT coefficients
+        
+        Args:
+            image_path (str): Path to cover image
+            data (bytes): Data to hide
+            output_path (str): Output path
+            quality (int): JPEG quality used if the cover must be re-encoded
+            compress (bool): Whether to zlib compress data before encoding
+        
+        Returns:
+            dict: Encoding result
+        """
+        return cls._encode_stream(image_path, payload.encode_bytes(data, compress), output_path, quality)
+    
+    @classmethod
+    def decode(cls, image_path):
+        """
+        Decode message from JPEG
+        
+        Args:
+            image_path (str): Path to stego image
+        
+        Returns:
+            str: Hidden message
+        """
+        try:
+            flags, data = cls._extract(image_path)
+        except ValueError as e:
+            # Files written by earlier versions hid the message in pixel LSBs
+            from .image_stego import ImageSteganography
+            try:
+                return ImageSteganography.decode(image_path, compressed=True)
+            except Exception:
+                raise ValueError(f"Failed to decode message: {str(e)}")
+        
+        return payload.decode_text(flags, data)
+    
+    @classmethod
+    def decode_bytes(cls, image_path):
+        """
+        Decode raw bytes from JPEG
+        
+        Args:
+            image_path (str): Path to stego image
+        
+        Returns:
+            bytes: Hidden data
+        """
+        flags, data = cls._extract(image_path)
+        return payload.decode_bytes(flags, data)
+    
+    @staticmethod
+    def get_capacity(image_path):
+        """
+        Get maximum message capacity of a baseline JPEG
+        
+        Args:
+            image_path (str): Path to image
+        
+        Returns:
+            dict: Capacity information
+        """
+        with open(image_path, 'rb') as f:
+            jpeg = JPEGFile(f.read())
+        
+        max_bits = sum(positions.size for _, positions in jpeg.iter_carriers())
+        max_bytes = max_bits // 8
+        
+        return {
+            'image_size': (jpeg.width, jpeg.height),
+            'usable_coefficients': max_bits,
+            'max_bits': max_bits,
+            'max_bytes': max_bytes,
+            'max_chars_approx': max(0, max_bytes - payload.HEADER_SIZE)
+        }
@@ -0,0 +1,353 @@
+"""
+LSB Engine Module
+Vectorized least-significant-bit embedding and extraction shared by the
+steganography classes
+"""
+
+import hashlib
+
+import numpy as np
+
+
+FEISTEL_ROUNDS = 4
+
+
+def bytes_to_bits(data):
+    """
+    Unpack bytes into an array of bits (most significant bit first)
+
+    Args:
+        data (bytes): Data to unpack
+
+    Returns:
+        np.ndarray: uint8 array containing one bit per element
+    """
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+
+
+def embed_bits(carrier, bits, start=0):
+    """
+    Write bits into the LSB of consecutive carrier elements in place
+
+    Args:
+        carrier (np.ndarray): Writable 1-D integer array (e.g. flat pixel view)
+        bits (np.ndarray): Array of 0/1 values
+        start (int): Index of the first carrier element to modify
+    """
+    end = start + len(bits)
+    if end > carrier.size:
+        raise ValueError(f"Carrier too small. Need {end} elements, have {carrier.size}")
+
+    keep_mask = ~np.array(1, dtype=carrier.dtype)
+    segment = carrier[start:end]
+    np.bitwise_and(segment, keep_mask, out=segment)
+    np.bitwise_or(segment, bits.astype(carrier.dtype, copy=False), out=segment)
+
+
+def extract_bits(carrier, count, start=0):
+    """
+    Read LSBs from consecutive carrier elements
+
+    Args:
+        carrier (np.ndarray): 1-D integer array
+        count (int): Number of bits to read
+        start (int): Index of the first carrier element to read
+
+    Returns:
+        np.ndarray: uint8 array of 0/1 values
+    """
+    return (carrier[start:start + count] & 1).astype(np.uint8)
+
+
+def extract_bytes(carrier, n_bytes, start=0):
+    """
+    Read bytes packed MSB-first from carrier LSBs
+
+    Args:
+        carrier (np.ndarray): 1-D integer array
+        n_bytes (int): Number of bytes to read
+        start (int): Index of the first carrier element to read
+
+    Returns:
+        bytes: Extracted data (shorter if the carrier runs out)
+    """
+    available = max(0, (carrier.size - start) // 8)
+    n_bytes = min(n_bytes, available)
+    return np.packbits(extract_bits(carrier, n_bytes * 8, start)).tobytes()
+
+
+def pack_symbols(bits, width):
+    """
+    Group bits into width-bit symbols (first bit is the symbol MSB)
+
+    Args:
+        bits (np.ndarray): Array of 0/1 values, zero padded to a whole symbol
+        width (int): Bits per symbol
+
+    Returns:
+        np.ndarray: uint8 array of symbols
+    """
+    padding = (-bits.size) % width
+    if padding:
+        bits = np.concatenate([bits, np.zeros(padding, dtype=np.uint8)])
+    weights = (1 << np.arange(width - 1, -1, -1)).astype(np.uint8)
+    return (bits.reshape(-1, width) * weights).sum(axis=1, dtype=np.uint8)
+
+
+def unpack_symbols(symbols, width):
+    """
+    Expand width-bit symbols back into bits (inverse of pack_symbols)
+
+    Args:
+        symbols (np.ndarray): Integer array of symbols
+        width (int): Bits per symbol
+
+    Returns:
+        np.ndarray: uint8 array of 0/1 values
+    """
+    shifts = np.arange(width - 1, -1, -1, dtype=np.uint8)
+    return ((symbols.astype(np.uint8)[:, None] >> shifts) & 1).reshape(-1)
+
+
+def embed_symbols(carrier, symbols, width, start=0):
+    """
+    Write symbols into the low `width` bits of consecutive carrier elements
+
+    Args:
+        carrier (np.ndarray): Writable 1-D integer array
+        symbols (np.ndarray): Symbols, each smaller than 2**width
+        width (int): Number of low bits replaced per element
+        start (int): Index of the first carrier element to modify
+    """
+    end = start + len(symbols)
+    if end > carrier.size:
+        raise ValueError(f"Carrier too small. Need {end} elements, have {carrier.size}")
+
+    keep_mask = ~np.array((1 << width) - 1, dtype=carrier.dtype)
+    segment = carrier[start:end]
+    np.bitwise_and(segment, keep_mask, out=segment)
+    np.bitwise_or(segment, symbols.astype(carrier.dtype, copy=False), out=segment)
+
+
+def extract_symbols(carrier, count, width, start=0):
+    """
+    Read the low `width` bits of consecutive carrier elements
+
+    Args:
+        carrier (np.ndarray): 1-D integer array
+        count (int): Number of symbols to read
+        width (int): Bits per symbol
+        start (int): Index of the first carrier element to read
+
+    Returns:
+        np.ndarray: uint8 array of symbols
+    """
+    return (carrier[start:start + count] & ((1 << width) - 1)).astype(np.uint8)
+
+
+def _feistel(values, half_bits, round_keys):
+    """One pass of a balanced Feistel network over 2 * half_bits bit values"""
+    mask = np.uint64((1 << half_bits) - 1)
+    left = values >> np.uint64(half_bits)
+    right = values & mask
+
+    for key in round_keys:
+        # Multiply-xorshift round function; uint64 multiplication wraps
+        mixed = (right ^ key) * np.uint64(0x9E3779B97F4A7C15)
+        mixed ^= mixed >> np.uint64(32)
+        mixed *= np.uint64(0xBF58476D1CE4E5B9)
+        mixed ^= mixed >> np.uint64(29)
+        left, right = right, left ^ (mixed & mask)
+
+    return (left << np.uint64(half_bits)) | right
+
+
+def keyed_indices(key, size, count, start=0):
+    """
+    Map payload positions to pseudo-random carrier indices
+
+    A password-keyed Feistel network over the smallest power-of-four domain
+    covering the carrier, with cycle-walking back into range, is a
+    permutation of range(size). Only the indices for payload positions
+    start .. start + count - 1 are computed, so the cost is O(count)
+    regardless of carrier size.
+
+    Args:
+        key (str or bytes): Password
+        size (int): Number of carrier elements
+        count (int): Number of indices to generate
+        start (int): First payload position
+
+    Returns:
+        np.ndarray: int64 array of distinct carrier indices
+    """
+    if start + count > size:
+        raise ValueError(f"Carrier too small. Need {start + count} elements, have {size}")
+    if isinstance(key, str):
+        key = key.encode('utf-8')
+
+    # Round keys come from a Generator seeded with the password digest
+    seed = int.from_bytes(hashlib.sha256(b'keyed-scatter:' + key).digest(), 'big')
+    half_bits = max(1, -(-max(1, (size - 1).bit_length()) // 2))
+    round_keys = np.random.default_rng(seed).integers(
+        0, 1 << half_bits, size=FEISTEL_ROUNDS, dtype=np.uint64
+    )
+
+    indices = _feistel(np.arange(start, start + count, dtype=np.uint64), half_bits, round_keys)
+
+    # Cycle-walk values that land outside the carrier (domain < 4 * size)
+    outside = np.flatnonzero(indices >= size)
+    while outside.size:
+        indices[outside] = _feistel(indices[outside], half_bits, round_keys)
+        outside = outside[indices[outside] >= size]
+
+    return indices.astype(np.int64)
+
+
+def embed_keyed(carrier, bits, key, start=0):
+    """
+    Write bits into the LSBs of keyed pseudo-random carrier elements in place
+
+    Args:
+        carrier (np.ndarray): Writable 1-D integer array
+        bits (np.ndarray): Array of 0/1 values
+        key (str or bytes): Password selecting the embedding order
+        start (int): Payload position of the first bit
+    """
+    indices = keyed_indices(key, carrier.size, len(bits), start)
+    values = carrier[indices]
+    embed_bits(values, bits)
+    carrier[indices] = values
+
+
+def extract_keyed_bytes(carrier, n_bytes, key, start=0):
+    """
+    Read bytes from the LSBs of keyed pseudo-random carrier elements
+
+    Args:
+        carrier (np.ndarray): 1-D integer array
+        n_bytes (int): Number of bytes to read
+        key (str or bytes): Password selecting the embedding order
+        start (int): Payload position of the first bit
+
+    Returns:
+        bytes: Extracted data (shorter if the carrier runs out)
+    """
+    n_bytes = min(n_bytes, max(0, (carrier.size - start) // 8))
+    indices = keyed_indices(key, carrier.size, n_bytes * 8, start)
+    return np.packbits(carrier[indices] & 1).tobytes()
+
+
+def find_delimited(carrier, delimiter, chunk_bytes=65536):
+    """
+    Extract bytes up to a delimiter, scanning the carrier chunk by chunk
+
+    Args:
+        carrier (np.ndarray): 1-D integer array
+        delimiter (bytes): End-of-message marker
+        chunk_bytes (int): Number of bytes extracted per step
+
+    Returns:
+        bytes or None: Data before the delimiter, None if it was not found
+    """
+    total_bytes = carrier.size // 8
+    buffer = bytearray()
+    position = 0
+
+    while position < total_bytes:
+        count = min(chunk_bytes, total_bytes - position)
+        search_from = max(0, len(buffer) - len(delimiter) + 1)
+        buffer += extract_bytes(carrier, count, position * 8)
+
+        index = buffer.find(delimiter, search_from)
+        if index != -1:
+            return bytes(buffer[:index])
+
+        position += count
+
+    return None
+
+
+class StreamReader:
+    """Sequential LSB reader over a lazily produced sequence of carriers"""
+
+    def __init__(self, carriers):
+        """
+        Args:
+            carriers (iterable): 1-D integer arrays read in order (e.g. video frames)
+        """
+        self._carriers = iter(carriers)
+        self.wanted_bits = 0  # Furthest bit requested so far; lets producers bound read-ahead
+        self._bits = np.zeros(0, dtype=np.uint8)
+        self._dropped = 0
+        self._current = None
+        self._position = 0
+
+    def _fill(self, n_bits):
+        """Pull carriers until at least n_bits are buffered or the stream ends"""
+        self.wanted_bits = max(self.wanted_bits, n_bits)
+        chunks = [self._bits]
+        have = self._dropped + self._bits.size
+
+        while have < n_bits:
+            if self._current is None or self._position >= self._current.size:
+                self._current = next(self._carriers, None)
+                self._position = 0
+                if self._current is None:
+                    break
+
+            take = min(n_bits - have, self._current.size - self._position)
+            chunks.append(extract_bits(self._current, take, self._position))
+            self._position += take
+            have += take
+
+        if len(chunks) > 1:
+            self._bits = np.concatenate(chunks)
+
+    def read_bytes(self, offset, count):
+        """
+        Read hidden bytes, consuming carriers only as far as needed
+
+        Args:
+            offset (int): Byte offset into the hidden stream
+            count (int): Number of bytes to read
+
+        Returns:
+            bytes: Extracted data (shorter if the carriers run out)
+        """
+        end_bit = (offset + count) * 8
+        self._fill(end_bit)
+        end_bit = min(end_bit - self._dropped, self._bits.size - self._bits.size % 8)
+        return np.packbits(self._bits[offset * 8 - self._dropped:end_bit]).tobytes()
+
+    def _discard(self, n_bytes):
+        """Release buffered bits before byte offset n_bytes (they can no longer be read)"""
+        drop = n_bytes * 8 - self._dropped
+        if drop > 0:
+            self._bits = self._bits[drop:]
+            self._dropped += drop
+
+    def find(self, delimiter, chunk_bytes=65536):
+        """
+        Read hidden bytes up to a delimiter
+
+        Args:
+            delimiter (bytes): End-of-message marker
+            chunk_bytes (int): Number of bytes read per step
+
+        Returns:
+            bytes or None: Data before the delimiter, None if it was not found
+        """
+        buffer = bytearray()
+
+        while True:
+            chunk = self.read_bytes(len(buffer), chunk_bytes)
+            search_from = max(0, len(buffer) - len(delimiter) + 1)
+            buffer += chunk
+
+            index = buffer.find(delimiter, search_from)
+            if index != -1:
+                return bytes(buffer[:index])
+            if len(chunk) < chunk_bytes:
+                return None
+            self._discard(len(buffer))
@@ -0,0 +1,147 @@
+"""
+Payload Header Module
+Versioned, length-prefixed binary header for hidden payloads
+
+Layout (big-endian, 14 bytes):
+    magic (4) | version (1) | flags (1) | payload length (4) | CRC-32 (4)
+"""
+
+import struct
+import zlib
+
+MAGIC = b'CSTG'
+VERSION = 1
+
+HEADER_FORMAT = '>4sBBII'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+HEADER_BITS = HEADER_SIZE * 8
+
+# Flag bits
+FLAG_TEXT = 0x01        # Payload is UTF-8 text
+FLAG_COMPRESSED = 0x02  # Payload is zlib compressed
+
+
+def pack(data, flags=0):
+    """
+    Prefix data with a payload header
+
+    Args:
+        data (bytes): Payload bytes
+        flags (int): Combination of FLAG_* values
+
+    Returns:
+        bytes: Header followed by payload
+    """
+    header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, flags, len(data), zlib.crc32(data))
+    return header + data
+
+
+def parse_header(header):
+    """
+    Parse a payload header
+
+    Args:
+        header (bytes): At least HEADER_SIZE bytes
+
+    Returns:
+        tuple or None: (flags, length, crc), None if no valid header is present
+    """
+    if len(header) < HEADER_SIZE:
+        return None
+
+    magic, version, flags, length, crc = struct.unpack(HEADER_FORMAT, header[:HEADER_SIZE])
+    if magic != MAGIC or version != VERSION:
+        return None
+
+    return flags, length, crc
+
+
+def read(read_bytes, capacity=None):
+    """
+    Read a header-prefixed payload from a carrier
+
+    Only the header and the payload bytes are requested from the carrier.
+
+    Args:
+        read_bytes (callable): read_bytes(offset, count) -> bytes from the hidden stream
+        capacity (int, optional): Number of bytes the carrier can hold
+
+    Returns:
+        tuple or None: (flags, data), None if the carrier holds no valid payload
+    """
+    parsed = parse_header(read_bytes(0, HEADER_SIZE))
+    if parsed is None:
+        return None
+
+    flags, length, crc = parsed
+    if capacity is not None and HEADER_SIZE + length > capacity:
+        return None
+
+    data = read_bytes(HEADER_SIZE, length)
+    if len(data) != length or zlib.crc32(data) != crc:
+        return None
+
+    return flags, data
+
+
+def encode_bytes(data, compress=False, flags=0):
+    """
+    Serialize raw bytes into a header-prefixed payload
+
+    Args:
+        data (bytes): Data to hide
+        compress (bool): Whether to zlib compress the data
+        flags (int): Additional FLAG_* values
+
+    Returns:
+        bytes: Header-prefixed payload
+    """
+    data = bytes(data)
+    if compress:
+        data = zlib.compress(data)
+        flags |= FLAG_COMPRESSED
+    return pack(data, flags)
+
+
+def decode_bytes(flags, data):
+    """
+    Deserialize payload bytes produced by encode_bytes
+
+    Args:
+        flags (int): Header flags
+        data (bytes): Payload bytes
+
+    Returns:
+        bytes: Hidden data
+    """
+    if flags & FLAG_COMPRESSED:
+        data = zlib.decompress(data)
+    return data
+
+
+def encode_text(message, compress=False):
+    """
+    Serialize a text message into payload bytes
+
+    Args:
+        message (str): Message to hide
+        compress (bool): Whether to zlib compress the message
+
+    Returns:
+        bytes: Header-prefixed payload
+    """
+    return encode_bytes(message.encode('utf-8'), compress, FLAG_TEXT)
+
+
+def decode_text(flags, data):
+    """
+    Deserialize payload bytes produced by encode_text
+
+    Args:
+        flags (int): Header flags
+        data (bytes): Payload bytes
+
+    Returns:
+        str: Hidden message
+    """
+    return decode_bytes(flags, data).decode('utf-8')
@@ -3,212 +3,444 @@ Video Steganography Module
 Implements steganography for video files (MP4, AVI)
 """
 
+import json
 import os
 import subprocess
-import tempfile
-import shutil
-from PIL import Image
+from fractions import Fraction
+from functools import lru_cache
+from itertools import islice
 import numpy as np
 
+from . import lsb, payload
+from ..utils.parallel import ordered_map
+from .jpeg_stego import JPEGSteganography  # Re-exported for backwards compatibility
+
+
+@lru_cache(maxsize=None)
+def _tool_available(name):
+    """Check once per process whether an ffmpeg tool can be run"""
+    try:
+        subprocess.run([name, '-version'], capture_output=True, check=True)
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+
+
+@lru_cache(maxsize=256)
+def _probe_file(video_path, mtime_ns, size):
+    """
+    Read video stream metadata with ffprobe (no frames are decoded)
+    
+    Cached per process; mtime_ns and size are part of the key so a
+    modified file is probed again.
+    """
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height,avg_frame_rate,r_frame_rate,duration,nb_frames'
+                         ':format=duration',
+        '-of', 'json',
+        video_path
+    ]
+    
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    info = json.loads(result.stdout)
+    streams = info.get('streams') or [{}]
+    stream = streams[0]
+    
+    def number(value, cast):
+        try:
+            return cast(value)
+        except (TypeError, ValueError, ZeroDivisionError):  # Missing or 'N/A'
+            return cast(0)
+    
+    frame_rate = stream.get('avg_frame_rate', '0/0')
+    if number(frame_rate, Fraction) == 0:
+        frame_rate = stream.get('r_frame_rate', '30/1')
+    
+    duration = number(stream.get('duration'), float) or number(info.get('format', {}).get('duration'), float)
+    frames = number(stream.get('nb_frames'), int)
+    if not frames:
+        # Containers such as Matroska have no frame count; estimate it
+        frames = round(duration * number(frame_rate, Fraction))
+    
+    return {
+        'width': number(stream.get('width'), int),
+        'height': number(stream.get('height'), int),
+        'frame_rate': frame_rate,
+        'duration': duration,
+        'frames': frames
+    }
+
 
 class VideoSteganography:
     """Video steganography using frame-based LSB technique"""
     
     DELIMITER = "<<<END_OF_MESSAGE>>>"
     
+    # Output video codecs: ffmpeg encoder arguments for rgb24 input
+    CODECS = {
+        'ffv1': ['-c:v', 'ffv1', '-level', '3', '-slices', '16', '-g', '1'],
+        'libx264rgb': ['-c:v', 'libx264rgb', '-qp', '0', '-preset', 'ultrafast'],
+        'libx264': ['-c:v', 'libx264', '-pix_fmt', 'yuv420p'],  # Lossy; LSBs do not survive
+    }
+    
     @staticmethod
     def _check_ffmpeg():
-        """Check if ffmpeg is installed"""
-        try:
-            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        """Check if ffmpeg and ffprobe are installed (memoised per process)"""
+        return _tool_available('ffmpeg') and _tool_available('ffprobe')
     
     @staticmethod
-    def _extract_frames(video_path, output_dir):
+    def _probe(video_path):
         """
-        Extract frames from video using ffmpeg
+        Read video stream metadata with ffprobe
+        
+        Results are cached by (path, mtime, size), so repeated calls for an
+        unchanged file do not spawn ffprobe.
         
         Args:
             video_path (str): Path to video file
-            output_dir (str): Directory to save frames
             
         Returns:
-            int: Number of frames extracted
+            dict: width, height, frame_rate (ffmpeg rate string), duration, frames
+        """
+        stat = os.stat(video_path)
+        return dict(_probe_file(os.path.abspath(video_path), stat.st_mtime_ns, stat.st_size))
+    
+    @staticmethod
+    def _read_frames(video_path, width, height, max_frames=None):
+        """
+        Decode video frames through an ffmpeg pipe
+        
+        ffmpeg writes raw rgb24 frames to stdout, which are read straight
+        into NumPy buffers; nothing is written to disk. The decoder is
+        stopped as soon as the caller stops iterating.
+        
+        Args:
+            video_path (str): Path to video file
+            width (int): Frame width
+            height (int): Frame height
+            max_frames (int, optional): Number of frames ffmpeg decodes at most
+            
+        Yields:
+            np.ndarray: Writable flat uint8 RGB frame
         """
         cmd = [
-            'ffmpeg', '-i', video_path,
-            '-vf', 'fps=30',
-            os.path.join(output_dir, 'frame_%06d.png')
+            'ffmpeg', '-v', 'error',
+            '-i', video_path,
+            '-map', '0:v:0', '-an', '-sn', '-dn',
+            '-vsync', 'passthrough'  # One output frame per decoded frame, no duplicates
         ]
+        if max_frames is not None:
+            cmd += ['-frames:v', str(max_frames)]
+        cmd += ['-f', 'rawvideo', '-pix_fmt', 'rgb24', '-']
+        frame_size = width * height * 3
         
-        subprocess.run(cmd, capture_output=True, check=True)
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        try:
+            while True:
+                frame = bytearray(frame_size)
+                view = memoryview(frame)
+                filled = 0
+                while filled < frame_size:
+                    n = process.stdout.readinto(view[filled:])
+                    if not n:
+                        break
+                    filled += n
+                if filled < frame_size:
+                    return
+                yield np.frombuffer(frame, dtype=np.uint8)
+        finally:
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+    
+    @classmethod
+    def _output_codec(cls, output_path, codec=None):
+        """Pick a lossless codec the output container supports"""
+        if codec is None:
+            extension = os.path.splitext(output_path)[1].lower()
+            codec = 'libx264rgb' if extension in ('.mp4', '.m4v', '.mov') else 'ffv1'
         
-        # Count frames
-        frames = [f for f in os.listdir(output_dir) if f.startswith('frame_')]
-        return len(frames)
+        if codec not in cls.CODECS:
+            raise ValueError(f"Unsupported codec: {codec}. Choose from {', '.join(cls.CODECS)}")
+        return codec
     
-    @staticmethod
-    def _frames_to_video(frames_dir, output_path, fps=30):
+    @classmethod
+    def _open_writer(cls, output_path, width, height, frame_rate, cover_path, codec):
         """
-        Combine frames back into video
+        Start an ffmpeg process that encodes raw rgb24 frames from stdin
+        
+        The cover's audio tracks and metadata are stream-copied into the
+        output without re-encoding.
         
         Args:
-            frames_dir (str): Directory containing frames
             output_path (str): Output video path
-            fps (int): Frames per second
+            width (int): Frame width
+            height (int): Frame height
+            frame_rate (str): Frame rate (e.g. '30000/1001')
+            cover_path (str): Cover video providing audio and metadata
+            codec (str): Key of CODECS
+            
+        Returns:
+            subprocess.Popen: Encoder process
         """
         cmd = [
-            'ffmpeg', '-framerate', str(fps),
-            '-i', os.path.join(frames_dir, 'frame_%06d.png'),
-            '-c:v', 'libx264', '-pix_fmt', 'yuv420p',
+            'ffmpeg', '-v', 'error', '-y',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+            '-s', f'{width}x{height}', '-framerate', frame_rate,
+            '-i', '-',
+            '-i', cover_path,
+            '-map', '0:v:0', '-map', '1:a?', '-map_metadata', '1',
+            *cls.CODECS[codec],
+            '-c:a', 'copy',
             output_path
         ]
         
-        subprocess.run(cmd, capture_output=True, check=True)
+        return subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
     
     @classmethod
-    def encode(cls, video_path, message, output_path, max_frames=30):
+    def _embed(cls, video_path, stream, output_path, max_frames, codec=None, workers=None):
         """
-        Encode message into video
+        Embed a header-prefixed payload stream into a video
+        
+        Frames are piped from a decoding ffmpeg process through NumPy into
+        an encoding ffmpeg process at the source frame rate.
         
         Args:
             video_path (str): Path to cover video
-            message (str): Message to hide
+            stream (bytes): Header-prefixed payload
             output_path (str): Path to save stego video
             max_frames (int): Maximum frames to use for encoding
+            codec (str, optional): Output codec, lossless for the container by default
+            workers (int, optional): Frames embedded in parallel (default: CPU count)
             
         Returns:
-            dict: Encoding result
+            tuple: (frames_used, total_frames)
         """
         if not cls._check_ffmpeg():
-            raise RuntimeError("ffmpeg is required but not installed")
+            raise RuntimeError("ffmpeg and ffprobe are required but not installed")
         
-        # Create temporary directories
-        temp_dir = tempfile.mkdtemp()
-        frames_dir = os.path.join(temp_dir, 'frames')
-        os.makedirs(frames_dir)
+        codec = cls._output_codec(output_path, codec)
+        info = cls._probe(video_path)
+        width, height = info['width'], info['height']
         
-        try:
-            # Extract frames
-            num_frames = cls._extract_frames(video_path, frames_dir)
-            
-            # Prepare message
-            message_with_delimiter = message + cls.DELIMITER
-            binary_message = ''.join(format(ord(c), '08b') for c in message_with_delimiter)
-            
-            # Encode in frames
-            frames_used = 0
+        bits = lsb.bytes_to_bits(stream)
+        frame_size = width * height * 3
+        if bits.size > frame_size * max_frames:
+            raise ValueError(f"Message too large for the first {max_frames} frames of this video")
+        
+        # Each frame's bit range is known up front from the payload offset
+        def frame_slices(frames):
             data_index = 0
-            
-            for i in range(1, min(num_frames, max_frames) + 1):
-                if data_index >= len(binary_message):
-                    break
-                
-                frame_path = os.path.join(frames_dir, f'frame_{i:06d}.png')
-                
-                # Load frame
-                image = Image.open(frame_path).convert('RGB')
-                pixels = np.array(image, dtype=np.int32)
-                
-                # Encode data in this frame
-                for row in range(pixels.shape[0]):
-                    for col in range(pixels.shape[1]):
-                        if data_index >= len(binary_message):
-                            break
-                        
-                        for channel in range(3):
-                            if data_index < len(binary_message):
-                                pixels[row, col, channel] = (
-                                    pixels[row, col, channel] & ~1
-                                ) | int(binary_message[data_index])
-                                data_index += 1
-                    
-                    if data_index >= len(binary_message):
-                        break
-                
-                # Save modified frame
-                stego_frame = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
-                stego_frame.save(frame_path)
-                frames_used += 1
-                
-                if data_index >= len(binary_message):
-                    break
-            
-            # Reconstruct video
-            cls._frames_to_video(frames_dir, output_path)
-            
-            return {
-                'success': True,
-                'message_size': len(message),
-                'frames_used': frames_used,
-                'total_frames': num_frames,
-                'output_path': output_path
-            }
+            for frame in frames:
+                chunk = bits[data_index:data_index + frame.size]
+                data_index += chunk.size
+                yield frame, chunk
+        
+        def embed(item):
+            frame, chunk = item
+            if chunk.size:
+                lsb.embed_bits(frame, chunk)
+            return frame, chunk.size
+        
+        writer = cls._open_writer(output_path, width, height, info['frame_rate'], video_path, codec)
+        frames = cls._read_frames(video_path, width, height)
+        frames_used = 0
+        num_frames = 0
+        data_index = 0
         
+        try:
+            for frame, n_bits in ordered_map(embed, frame_slices(frames), workers or os.cpu_count() or 1):
+                if n_bits:
+                    data_index += n_bits
+                    frames_used += 1
+                
+                try:
+                    writer.stdin.write(frame)
+                except BrokenPipeError:
+                    break  # Encoder failed; its error is reported below
+                num_frames += 1
         finally:
-            # Cleanup
-            shutil.rmtree(temp_dir)
+            frames.close()
+            try:
+                writer.stdin.close()
+            except BrokenPipeError:
+                pass
+            error = writer.stderr.read()
+            writer.wait()
+        
+        if writer.returncode != 0:
+            raise subprocess.CalledProcessError(writer.returncode, 'ffmpeg', stderr=error)
+        
+        if data_index < bits.size:
+            raise ValueError(f"Message too large for the first {max_frames} frames of this video")
+        
+        return frames_used, num_frames
     
     @classmethod
-    def decode(cls, video_path, max_frames=30):
+    def _extract(cls, video_path, max_frames, workers=None):
         """
-        Decode message from video
+        Extract the hidden payload from a video
         
         Args:
             video_path (str): Path to stego video
             max_frames (int): Maximum frames to check
+            workers (int, optional): Frames read in parallel (default: CPU count)
             
         Returns:
-            str: Hidden message
+            tuple: (flags, data) for headered payloads, (None, data) for legacy
+                delimiter-terminated messages
         """
         if not cls._check_ffmpeg():
-            raise RuntimeError("ffmpeg is required but not installed")
+            raise RuntimeError("ffmpeg and ffprobe are required but not installed")
+        
+        info = cls._probe(video_path)
+        frame_size = info['width'] * info['height'] * 3
+        workers = workers or os.cpu_count() or 1
         
-        temp_dir = tempfile.mkdtemp()
-        frames_dir = os.path.join(temp_dir, 'frames')
-        os.makedirs(frames_dir)
+        def frame_carriers(count, wanted_bits):
+            # Frames are pulled only up to the furthest bit the reader has asked
+            # for (the header first, then the payload length it gives), and LSB
+            # planes within that range are extracted in parallel
+            frames = cls._read_frames(video_path, info['width'], info['height'], count)
+            taken = 0
+            try:
+                while taken < count:
+                    batch = min(count, -(-wanted_bits() // frame_size)) - taken
+                    pulled = 0
+                    for plane in ordered_map(lambda frame: frame & 1, islice(frames, batch),
+                                             min(workers, batch)):
+                        pulled += 1
+                        yield plane
+                    taken += pulled
+                    if pulled < batch:
+                        return
+            finally:
+                frames.close()
         
+        # ffmpeg decodes at most max_frames; the length header stops reading
+        # (and the decoder) after the last payload-bearing frame
+        carriers = frame_carriers(max_frames, lambda: reader.wanted_bits)
+        reader = lsb.StreamReader(carriers)
         try:
-            # Extract frames
-            num_frames = cls._extract_frames(video_path, frames_dir)
-            
-            # Extract binary data
-            binary_data = ""
-            
-            for i in range(1, min(num_frames, max_frames) + 1):
-                frame_path = os.path.join(frames_dir, f'frame_{i:06d}.png')
-                
-                if not os.path.exists(frame_path):
-                    break
-                
-                image = Image.open(frame_path).convert('RGB')
-                pixels = np.array(image)
-                
-                for row in range(pixels.shape[0]):
-                    for col in range(pixels.shape[1]):
-                        for channel in range(3):
-                            binary_data += str(pixels[row, col, channel] & 1)
+            result = payload.read(reader.read_bytes, frame_size * max_frames // 8)
+        finally:
+            carriers.close()
+        if result is not None:
+            return result
+        
+        # Legacy format: search for the delimiter
+        carriers = frame_carriers(max_frames, lambda: reader.wanted_bits)
+        reader = lsb.StreamReader(carriers)
+        try:
+            data = reader.find(cls.DELIMITER.encode('latin-1'))
+        finally:
+            carriers.close()
+        if data is None:
+            raise ValueError("No hidden message found")
+        
+        return None, data
+    
+    @classmethod
+    def encode(cls, video_path, message, output_path, max_frames=30, codec=None, workers=None):
+        """
+        Encode message into video
+        
+        Args:
+            video_path (str): Path to cover video
+            message (str): Message to hide
+            output_path (str): Path to save stego video
+            max_frames (int): Maximum frames to use for encoding
+            codec (str, optional): 'ffv1', 'libx264rgb' (lossless) or 'libx264' (lossy);
+                defaults to a lossless codec supported by the output container
+            workers (int, optional): Frames embedded in parallel (default: CPU count)
             
-            # Convert to text
-            message_with_delimiter = ''.join(
-                chr(int(binary_data[i:i+8], 2))
-                for i in range(0, len(binary_data), 8)
-            )
+        Returns:
+            dict: Encoding result
+        """
+        stream = payload.encode_text(message)
+        frames_used, num_frames = cls._embed(video_path, stream, output_path, max_frames, codec, workers)
+        
+        return {
+            'success': True,
+            'message_size': len(stream) - payload.HEADER_SIZE,
+            'frames_used': frames_used,
+            'total_frames': num_frames,
+            'codec': cls._output_codec(output_path, codec),
+            'output_path': output_path
+        }
+    
+    @classmethod
+    def encode_bytes(cls, video_path, data, output_path, max_frames=30, compress=False, codec=None,
+                     workers=None):
+        """
+        Encode raw bytes into video
+        
+        Args:
+            video_path (str): Path to cover video
+            data (bytes): Data to hide
+            output_path (str): Path to save stego video
+            max_frames (int): Maximum frames to use for encoding
+            compress (bool): Whether to zlib compress data before encoding
+            codec (str, optional): 'ffv1', 'libx264rgb' (lossless) or 'libx264' (lossy);
+                defaults to a lossless codec supported by the output container
+            workers (int, optional): Frames embedded in parallel (default: CPU count)
             
-            # Find delimiter
-            delimiter_index = message_with_delimiter.find(cls.DELIMITER)
-            if delimiter_index == -1:
-                raise ValueError("No hidden message found")
+        Returns:
+            dict: Encoding result
+        """
+        stream = payload.encode_bytes(data, compress)
+        frames_used, num_frames = cls._embed(video_path, stream, output_path, max_frames, codec, workers)
+        
+        return {
+            'success': True,
+            'message_size': len(stream) - payload.HEADER_SIZE,
+            'frames_used': frames_used,
+            'total_frames': num_frames,
+            'codec': cls._output_codec(output_path, codec),
+            'output_path': output_path
+        }
+    
+    @classmethod
+    def decode(cls, video_path, max_frames=30, workers=None):
+        """
+        Decode message from video
+        
+        Args:
+            video_path (str): Path to stego video
+            max_frames (int): Maximum frames to check
+            workers (int, optional): Frames read in parallel (default: CPU count)
             
-            return message_with_delimiter[:delimiter_index]
+        Returns:
+            str: Hidden message
+        """
+        flags, data = cls._extract(video_path, max_frames, workers)
+        if flags is None:
+            return data.decode('latin-1')
+        return payload.decode_text(flags, data)
+    
+    @classmethod
+    def decode_bytes(cls, video_path, max_frames=30, workers=None):
+        """
+        Decode raw bytes from video
         
-        finally:
-            shutil.rmtree(temp_dir)
+        Args:
+            video_path (str): Path to stego video
+            max_frames (int): Maximum frames to check
+            workers (int, optional): Frames read in parallel (default: CPU count)
+            
+        Returns:
+            bytes: Hidden data
+        """
+        flags, data = cls._extract(video_path, max_frames, workers)
+        if flags is None:
+            return data
+        return payload.decode_bytes(flags, data)
     
-    @staticmethod
-    def get_video_info(video_path):
+    @classmethod
+    def get_video_info(cls, video_path):
         """
         Get video information
         
@@ -218,29 +450,15 @@ class VideoSteganography:
         Returns:
             dict: Video information
         """
-        cmd = [
-            'ffprobe', '-v', 'error',
-            '-select_streams', 'v:0',
-            '-show_entries', 'stream=width,height,duration,nb_frames',
-            '-of', 'default=noprint_wrappers=1',
-            video_path
-        ]
-        
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            info = {}
-            for line in result.stdout.split('\n'):
-                if '=' in line:
-                    key, value = line.strip().split('=')
-                    info[key] = value
-            
+            info = cls._probe(video_path)
             return {
-                'width': int(info.get('width', 0)),
-                'height': int(info.get('height', 0)),
-                'duration': float(info.get('duration', 0)),
-                'frames': int(info.get('nb_frames', 0))
+                'width': info['width'],
+                'height': info['height'],
+                'duration': info['duration'],
+                'frames': info['frames']
             }
-        except:
+        except (subprocess.CalledProcessError, OSError, ValueError):
             return {
                 'width': 0,
                 'height': 0,
@@ -248,6 +466,44 @@ class VideoSteganography:
                 'frames': 0,
                 'error': 'Could not get video info'
             }
+    
+    @classmethod
+    def get_capacity(cls, video_path, max_frames=30):
+        """
+        Get maximum message capacity of a video
+        
+        Computed from ffprobe stream metadata without decoding any frames.
+        
+        Args:
+            video_path (str): Path to video file
+            max_frames (int): Maximum frames used for encoding
+            
+        Returns:
+            dict: Capacity information
+        """
+        if not _tool_available('ffprobe'):
+            raise RuntimeError("ffprobe is required but not installed")
+        
+        info = cls._probe(video_path)
+        width, height = info['width'], info['height']
+        total_frames = info['frames']
+        frames_usable = min(total_frames, max_frames)
+        
+        bytes_per_frame = width * height * 3 // 8
+        max_bytes = frames_usable * width * height * 3 // 8
+        
+        return {
+            'resolution': f"{width}x{height}",
+            'width': width,
+            'height': height,
+            'frame_rate': float(Fraction(info['frame_rate'])),
+            'duration_seconds': info['duration'],
+            'total_frames': total_frames,
+            'frames_usable': frames_usable,
+            'bytes_per_frame': bytes_per_frame,
+            'max_bytes': max_bytes,
+            'max_chars_approx': max(0, max_bytes - payload.HEADER_SIZE)
+        }
 
 
 class MP3Steganography:
@@ -278,76 +534,3 @@ class MP3Steganography:
             "MP3 steganography requires LAME encoder integration. "
             "Please use WAV format."
         )
-
-
-class JPEGSteganography:
-    """JPEG steganography using DCT coefficients"""
-    
-    @staticmethod
-    def encode(image_path, message, output_path, quality=95):
-        """
-        Encode message into JPEG using DCT coefficient modification
-        
-        Args:
-            image_path (str): Path to cover image
-            message (str): Message to hide
-            output_path (str): Output path
-            quality (int): JPEG quality (85-100 recommended)
-            
-        Returns:
-            dict: Encoding result
-        """
-        # Note: Full DCT-based JPEG steganography requires complex implementation
-        # This is a simplified version using conversion to/from lossless format
-        
-        # Load JPEG
-        image = Image.open(image_path)
-        
-        # Convert to PNG (lossless)
-        temp_png = tempfile.mktemp(suffix='.png')
-        image.save(temp_png, 'PNG')
-        
-        # Use LSB on PNG
-        from .image_stego import ImageSteganography
-        
-        temp_stego = tempfile.mktemp(suffix='.png')
-        ImageSteganography.encode(temp_png, message, temp_stego, compress=True)
-        
-        # Convert back to JPEG
-        stego_image = Image.open(temp_stego)
-        stego_image.save(output_path, 'JPEG', quality=quality)
-        
-        # Cleanup
-        os.remove(temp_png)
-        os.remove(temp_stego)
-        
-        return {
-            'success': True,
-            'message_size': len(message),
-            'output_path': output_path,
-            'quality': quality,
-            'note': 'JPEG compression may affect message recovery'
-        }
-    
-    @staticmethod
-    def decode(image_path):
-        """
-        Decode message from JPEG
-        
-        Args:
-            image_path (str): Path to stego image
-            
-        Returns:
-            str: Hidden message
-        """
-        from .image_stego import ImageSteganography
-        
-        # Try to decode
-        try:
-            message = ImageSteganography.decode(image_path, compressed=True)
-            return message
-        except Exception as e:
-            raise ValueError(
-                f"Failed to decode message. JPEG compression may have "
-                f"corrupted the hidden data. Error: {str(e)}"
-            )
@@ -1,26 +1,35 @@
-"""Utils module initialization"""
-
-from .security import (
-    calculate_file_hash,
-    calculate_string_hash,
-    verify_file_integrity,
-    PasswordValidator,
-    generate_random_key,
-    secure_delete_file,
-    Logger,
-    format_file_size
-)
-from .file_ops import FileManager, ConfigManager
-
-__all__ = [
-    'calculate_file_hash',
-    'calculate_string_hash',
-    'verify_file_integrity',
-    'PasswordValidator',
-    'generate_random_key',
-    'secure_delete_file',
-    'Logger',
-    'format_file_size',
-    'FileManager',
-    'ConfigManager'
-]
+"""Utils module initialization
+
+Helpers are imported on first access (PEP 562), so importing this package
+only loads the submodule a caller actually uses.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'calculate_file_hash': '.security',
+    'calculate_string_hash': '.security',
+    'verify_file_integrity': '.security',
+    'PasswordValidator': '.security',
+    'generate_random_key': '.security',
+    'secure_delete_file': '.security',
+    'Logger': '.security',
+    'format_file_size': '.security',
+    'FileManager': '.file_ops',
+    'ConfigManager': '.file_ops',
+    'ordered_map': '.parallel',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -110,6 +110,22 @@ class FileManager:
         shutil.copy2(file_path, backup_path)
         return backup_path
     
+    @staticmethod
+    def copy_for_patching(source_path, dest_path):
+        """
+        Copy a file that is about to be patched in place
+        
+        Nothing is copied when both paths name the same file, so the
+        source itself is patched.
+        
+        Args:
+            source_path (str): Path to file
+            dest_path (str): Path to copy to
+        """
+        if os.path.exists(dest_path) and os.path.samefile(source_path, dest_path):
+            return
+        shutil.copyfile(source_path, dest_path)
+    
     @staticmethod
     def read_file_binary(file_path):
         """
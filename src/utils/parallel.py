@@ -0,0 +1,37 @@
+"""
+Parallel helpers utility module
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+def ordered_map(func, items, workers):
+    """
+    Apply func to items on a thread pool, yielding results in input order
+
+    Meant for work that releases the GIL (NumPy operations, pycryptodome
+    ciphers). Items are consumed lazily and at most 2 * workers of them are
+    in flight, so memory stays bounded for long inputs.
+
+    Args:
+        func (callable): Function applied to each item
+        items (iterable): Items in order
+        workers (int): Number of worker threads, 1 to run inline
+
+    Yields:
+        Results of func in input order
+    """
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -5,11 +5,18 @@ Unit tests for cryptography module
 import unittest
 import sys
 import os
+import io
+import base64
+import hashlib
+import time
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.crypto import CaesarCipher, AESCipher, RSACipher
+from src.crypto import envelope, kdf, keypool, keyring, stream
+from src.crypto.cipher import hybrid_encrypt, hybrid_decrypt
+from src.crypto.modern import BlowfishCipher, DES3Cipher, ChaCha20Cipher
 
 
 class TestCaesarCipher(unittest.TestCase):
@@ -138,5 +145,387 @@ class TestRSACipher(unittest.TestCase):
         self.assertEqual(decrypted, plaintext)
 
 
+
+class TestStreamEncryption(unittest.TestCase):
+    """Test chunked streaming encryption"""
+    
+    def setUp(self):
+        self.data = os.urandom(10000)
+    
+    def _encrypt(self, cipher, data, chunk_size=1024):
+        dst = io.BytesIO()
+        result = cipher.encrypt_stream(io.BytesIO(data), dst, chunk_size)
+        return dst.getvalue(), result
+    
+    def test_roundtrip(self):
+        """Test AES-GCM and ChaCha20-Poly1305 streams, including chunk-aligned and empty input"""
+        for cipher in (AESCipher("password"), ChaCha20Cipher("password")):
+            for data in (self.data, self.data[:4096], b''):
+                container, result = self._encrypt(cipher, data)
+                self.assertEqual(result['bytes'], len(data))
+                header_size = stream.HEADER_SIZE + len(cipher.kdf[1])
+                self.assertEqual(len(container),
+                                 header_size + len(data) + result['chunks'] * stream.TAG_SIZE)
+                
+                out = io.BytesIO()
+                cipher.decrypt_stream(io.BytesIO(container), out)
+                self.assertEqual(out.getvalue(), data)
+    
+    def test_password_interop(self):
+        """Test that a password stream decrypts through the module API"""
+        container, _ = self._encrypt(AESCipher("password"), self.data)
+        out = io.BytesIO()
+        result = stream.decrypt_stream("password", io.BytesIO(container), out)
+        self.assertEqual(result['algorithm'], 'aes')
+        self.assertEqual(out.getvalue(), self.data)
+    
+    def test_parallel_workers(self):
+        """Test that multi-threaded encryption and decryption match the inline result"""
+        key = os.urandom(32)
+        data = os.urandom(100000)
+        
+        parallel = io.BytesIO()
+        stream.encrypt_stream(key, io.BytesIO(data), parallel, chunk_size=1000, workers=4)
+        for workers in (1, 4):
+            out = io.BytesIO()
+            result = stream.decrypt_stream(key, io.BytesIO(parallel.getvalue()), out, workers=workers)
+            self.assertEqual(result['chunks'], 100)
+            self.assertEqual(out.getvalue(), data)
+    
+    def test_decrypt_segment(self):
+        """Test random-access decryption of single chunks"""
+        container, _ = self._encrypt(AESCipher("password"), self.data)
+        src = io.BytesIO(container)
+        
+        self.assertEqual(stream.decrypt_segment("password", src, 3), self.data[3072:4096])
+        self.assertEqual(stream.decrypt_segment("password", src, 9), self.data[9216:])
+        with self.assertRaises(IndexError):
+            stream.decrypt_segment("password", src, 10)
+    
+    def test_segment_reader(self):
+        """Test seekable reads that decrypt only the overlapping segments"""
+        cipher = AESCipher("password")
+        container, _ = self._encrypt(cipher, self.data)
+        
+        with cipher.open_stream(io.BytesIO(container), cache_size=2) as reader:
+            self.assertEqual(reader.size, len(self.data))
+            self.assertEqual(reader.segment_count, 10)
+            self.assertEqual(reader.read_range(1000, 100), self.data[1000:1100])
+            self.assertEqual(reader.read_range(9990, 100), self.data[9990:])
+            self.assertEqual(reader.read_range(20000, 5), b'')
+            
+            reader.seek(-50, io.SEEK_END)
+            self.assertEqual(reader.read(), self.data[-50:])
+            reader.seek(2040)
+            self.assertEqual(reader.read(20), self.data[2040:2060])
+            self.assertEqual(reader.tell(), 2060)
+            self.assertLessEqual(len(reader._cache), 2)
+    
+    def test_segment_reader_isolates_damage(self):
+        """Test that a damaged segment only fails reads that touch it"""
+        cipher = AESCipher("password")
+        container, _ = self._encrypt(cipher, self.data)
+        damaged = bytearray(container)
+        damaged[stream.HEADER_SIZE + len(cipher.kdf[1]) + 5 * (1024 + stream.TAG_SIZE) + 1] ^= 1
+        
+        reader = stream.SegmentReader(io.BytesIO(bytes(damaged)), "password")
+        self.assertEqual(reader.read_range(0, 1024), self.data[:1024])
+        with self.assertRaises(ValueError):
+            reader.read_range(5 * 1024, 10)
+    
+    def test_tampering_detected(self):
+        """Test that modified, truncated, reordered and extended streams fail"""
+        cipher = AESCipher("password")
+        container, _ = self._encrypt(cipher, self.data)
+        header_size = stream.HEADER_SIZE + len(cipher.kdf[1])
+        block = 1024 + stream.TAG_SIZE
+        body = container[header_size:]
+        
+        flipped = bytearray(container)
+        flipped[header_size + 5] ^= 1
+        truncated = container[:header_size + 2 * block]
+        swapped = container[:header_size] + body[block:2 * block] + body[:block] + body[2 * block:]
+        
+        for bad in (bytes(flipped), truncated, swapped, container + b'x' * 20):
+            with self.assertRaises(ValueError):
+                cipher.decrypt_stream(io.BytesIO(bad), io.BytesIO())
+        
+        with self.assertRaises(ValueError):
+            AESCipher("wrong").decrypt_stream(io.BytesIO(container), io.BytesIO())
+
+
+class TestEnvelope(unittest.TestCase):
+    """Test the binary ciphertext envelope"""
+    
+    def test_roundtrip_all_ciphers(self):
+        """Test that every cipher emits and consumes envelopes"""
+        rsa_cipher = RSACipher()
+        rsa_cipher.generate_key_pair()
+        ciphers = [AESCipher("password"), BlowfishCipher("password"), DES3Cipher("password"),
+                   ChaCha20Cipher("password"), AESCipher(), rsa_cipher]
+        
+        for cipher in ciphers:
+            data = cipher.encrypt_envelope("Envelope message")
+            self.assertTrue(envelope.is_envelope(data))
+            self.assertEqual(cipher.decrypt_envelope(data), "Envelope message")
+    
+    def test_smaller_than_armor(self):
+        """Test that the envelope is smaller than the base64 dictionary"""
+        cipher = AESCipher("password")
+        armored = cipher.encrypt("x" * 1000)
+        binary = cipher.encrypt_envelope("x" * 1000)
+        self.assertLess(len(binary), len(armored['ciphertext']) + len(armored['iv']))
+    
+    def test_unpack_fields(self):
+        """Test field parsing and that fields are views of the input"""
+        data = envelope.pack(envelope.ALG_AES_CBC, b'ciphertext', nonce=b'n' * 16,
+                             kdf=envelope.KDF_SHA256, kdf_params=b'params')
+        parsed = envelope.unpack(data)
+        
+        self.assertEqual(parsed.algorithm, envelope.ALG_AES_CBC)
+        self.assertEqual(parsed.kdf, envelope.KDF_SHA256)
+        self.assertEqual(bytes(parsed.kdf_params), b'params')
+        self.assertEqual(bytes(parsed.nonce), b'n' * 16)
+        self.assertEqual(bytes(parsed.tag), b'')
+        self.assertEqual(bytes(parsed.ciphertext), b'ciphertext')
+        self.assertIs(parsed.ciphertext.obj, data)
+    
+    def test_invalid_envelopes(self):
+        """Test malformed, truncated and mismatched envelopes"""
+        data = AESCipher("password").encrypt_envelope("message")
+        
+        for bad in (b'', b'XXXX' + data[4:], data[:envelope.HEADER_SIZE + 5]):
+            with self.assertRaises(ValueError):
+                envelope.unpack(bad)
+        
+        with self.assertRaises(ValueError):
+            BlowfishCipher("password").decrypt_envelope(data)
+
+
+class TestKeyDerivation(unittest.TestCase):
+    """Test salted password key derivation and its cache"""
+    
+    def setUp(self):
+        kdf.cache.clear()
+    
+    def test_salt_in_armor_and_envelope(self):
+        """Test that password ciphertexts carry scrypt parameters and a salt"""
+        cipher = AESCipher("password")
+        params = kdf.KDFParams.decode(*cipher.kdf)
+        self.assertEqual(params.kdf, kdf.KDF_SCRYPT)
+        self.assertEqual(params.cost, kdf.SCRYPT_COST)
+        self.assertEqual(len(params.salt), kdf.SALT_SIZE)
+        
+        result = cipher.encrypt("message")
+        armored = envelope.unpack(base64.b64decode(result['ciphertext']))
+        self.assertEqual((armored.kdf, bytes(armored.kdf_params)), cipher.kdf)
+        self.assertEqual(AESCipher.decrypt_with_password(result['ciphertext'], result['iv'], "password"),
+                         "message")
+    
+    def test_legacy_ciphertext(self):
+        """Test that unsalted SHA-256 ciphertexts still decrypt"""
+        from Crypto.Cipher import AES
+        from Crypto.Util.Padding import pad
+        
+        legacy = AES.new(hashlib.sha256(b"password").digest(), AES.MODE_CBC)
+        ciphertext = legacy.encrypt(pad(b"old message", AES.block_size))
+        decrypted = AESCipher.decrypt_with_password(base64.b64encode(ciphertext).decode(),
+                                                    base64.b64encode(legacy.iv).decode(), "password")
+        self.assertEqual(decrypted, "old message")
+    
+    def test_cache_reuses_derivation(self):
+        """Test that bulk operations under one password derive the key once"""
+        results = [ChaCha20Cipher.encrypt_with_password(f"message {i}", "bulk") for i in range(5)]
+        stats = kdf.cache.stats()
+        
+        for i, result in enumerate(results):
+            self.assertEqual(ChaCha20Cipher.decrypt_with_password(
+                result['ciphertext'], result['nonce'], "bulk"), f"message {i}")
+        
+        self.assertEqual(kdf.cache.stats()['misses'], stats['misses'])
+        self.assertEqual(kdf.cache.stats()['hits'], stats['hits'] + 5)
+        self.assertEqual(len({r['nonce'] for r in results}), 5)
+    
+    def test_decrypt_derives_only_the_data_key(self):
+        """Test that decryption does not derive an unused encryption key"""
+        result = AESCipher.encrypt_with_password("message", "cold")
+        kdf.cache.clear()
+        
+        self.assertEqual(AESCipher.decrypt_with_password(result['ciphertext'], result['iv'], "cold"), "message")
+        self.assertEqual(kdf.cache.stats()['misses'], 1)
+    
+    def test_returned_key_decrypts_armor(self):
+        """Test that the raw key returned with a password ciphertext decrypts it"""
+        result = AESCipher.encrypt_with_password("message", "password")
+        cipher = AESCipher(base64.b64decode(result['key']))
+        self.assertEqual(cipher.decrypt(result['ciphertext'], result['iv']), "message")
+        
+        result = ChaCha20Cipher.encrypt_with_password("message", "password")
+        cipher = ChaCha20Cipher(base64.b64decode(result['key']))
+        self.assertEqual(cipher.decrypt(result['ciphertext'], result['nonce']), "message")
+    
+    def test_kdf_choice(self):
+        """Test choosing the KDF and its cost per cipher"""
+        result = BlowfishCipher.encrypt_with_password("message", "password", kdf='pbkdf2', cost=(1000,))
+        armored = envelope.unpack(base64.b64decode(result['ciphertext']))
+        params = kdf.KDFParams.decode(armored.kdf, armored.kdf_params)
+        self.assertEqual((params.kdf, params.cost), (kdf.KDF_PBKDF2, (1000,)))
+        self.assertEqual(BlowfishCipher.decrypt_with_password(result['ciphertext'], result['iv'], "password"),
+                         "message")
+        
+        cipher = DES3Cipher("password", kdf='scrypt', cost=(10, 8, 1))
+        self.assertEqual(kdf.KDFParams.decode(*cipher.kdf).cost, (10, 8, 1))
+        with self.assertRaises(ValueError):
+            AESCipher("password", kdf='argon2')
+    
+    def test_pbkdf2_and_tunable_cost(self):
+        """Test PBKDF2 parameters round trip through an envelope"""
+        material, params = kdf.encryption_key("password", kdf.KDF_PBKDF2, (1000,))
+        self.assertEqual(kdf.KDFParams.decode(params.kdf, params.encode()), params)
+        
+        cipher = AESCipher(material)
+        cipher.kdf = (params.kdf, params.encode())
+        data = cipher.encrypt_envelope("message")
+        self.assertEqual(AESCipher("password").decrypt_envelope(data), "message")
+        
+        with self.assertRaises(ValueError):
+            kdf.KDFParams.decode(kdf.KDF_SCRYPT, bytes([40, 8, 1]) + b'salt')
+    
+    def test_oversized_scrypt_header_rejected(self):
+        """Test that headers demanding GiBs of scrypt memory are refused before deriving"""
+        for cost in ((20, 64, 64), (20, 8, 1), (14, 8, 17)):
+            with self.assertRaises(ValueError):
+                kdf.KDFParams.decode(kdf.KDF_SCRYPT, bytes(cost) + b'salt')
+            with self.assertRaises(ValueError):
+                kdf.new_params(kdf.KDF_SCRYPT, cost)
+        self.assertEqual(kdf.KDFParams.decode(kdf.KDF_SCRYPT, bytes([18, 8, 16]) + b'salt').cost, (18, 8, 16))
+        
+        cipher = AESCipher("password")
+        params = cipher.kdf[1]
+        crafted = bytes([20, 64, 64]) + params[3:]
+        
+        result = cipher.encrypt("message")
+        armor = base64.b64decode(result['ciphertext']).replace(params, crafted)
+        start = time.monotonic()
+        with self.assertRaises(ValueError):
+            AESCipher.decrypt_with_password(base64.b64encode(armor).decode(), result['iv'], "password")
+        
+        container = io.BytesIO()
+        cipher.encrypt_stream(io.BytesIO(b"data"), container)
+        container = container.getvalue().replace(params, crafted)
+        with self.assertRaises(ValueError):
+            stream.decrypt_stream("password", io.BytesIO(container), io.BytesIO())
+        with self.assertRaises(ValueError):
+            stream.SegmentReader(io.BytesIO(container), "password")
+        self.assertLess(time.monotonic() - start, 5)
+    
+    def test_cache_eviction(self):
+        """Test LRU size bound and TTL expiry"""
+        cache = kdf.KeyCache(maxsize=2, ttl=0.05)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        
+        time.sleep(0.06)
+        self.assertIsNone(cache.get('c'))
+        self.assertEqual(cache.stats()['size'], 1)
+
+
+class TestRSAKeyPool(unittest.TestCase):
+    """Test background RSA key generation"""
+    
+    def tearDown(self):
+        keypool.stop_default_pool()
+    
+    def test_pool_hits_and_refills(self):
+        """Test that generate_key_pair takes pooled keys and the pool refills"""
+        pool = keypool.start_default_pool(sizes=(1024,), high_water=2)
+        self.assertTrue(pool.wait(timeout=60))
+        
+        cipher = RSACipher(1024)
+        cipher.generate_key_pair()
+        self.assertEqual(cipher.decrypt(cipher.encrypt("pooled")), "pooled")
+        
+        stats = pool.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['available'][1024] + stats['pending'][1024], 2)
+        self.assertTrue(pool.wait(timeout=60))
+    
+    def test_fallback_when_empty(self):
+        """Test inline generation for sizes the pool does not hold"""
+        pool = keypool.start_default_pool(sizes=(1024,), high_water=1)
+        keys = RSACipher(2048).generate_key_pair()
+        self.assertIn('PRIVATE KEY', keys['private_key'])
+        
+        stats = pool.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_rate'], 0.0)
+    
+    def test_no_pool(self):
+        """Test that nothing is taken when no pool is running"""
+        self.assertIsNone(keypool.take(2048))
+
+
+class TestKeyring(unittest.TestCase):
+    """Test the parsed RSA key cache"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.keys = RSACipher(1024).generate_key_pair()
+    
+    def test_hybrid_round_trip(self):
+        """Test hybrid encryption and decryption through cached keys"""
+        for message in ("first", "second"):
+            result = hybrid_encrypt(message, self.keys['public_key'])
+            plaintext = hybrid_decrypt(result['encrypted_data'], result['iv'],
+                                       result['encrypted_key'], self.keys['private_key'])
+            self.assertEqual(plaintext, message)
+    
+    def test_entries_are_reused(self):
+        """Test that a PEM is parsed once and its cipher shared"""
+        ring = keyring.Keyring()
+        first = ring.private(self.keys['private_key'])
+        second = ring.private(self.keys['private_key'].encode('utf-8') + b'\n')
+        
+        self.assertIs(first, second)
+        self.assertTrue(first.key.has_private())
+        self.assertFalse(ring.public(self.keys['private_key']).key.has_private())
+        self.assertEqual(ring.stats(), {'size': 2, 'maxsize': keyring.DEFAULT_MAXSIZE,
+                                        'hits': 1, 'misses': 2})
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used key is evicted"""
+        other = RSACipher(1024).generate_key_pair()['public_key']
+        ring = keyring.Keyring(maxsize=1)
+        ring.public(self.keys['public_key'])
+        ring.public(other)
+        ring.public(self.keys['public_key'])
+        
+        self.assertEqual(ring.stats()['size'], 1)
+        self.assertEqual(ring.stats()['misses'], 3)
+    
+    def test_public_key_is_not_private(self):
+        """Test that a public key cannot be loaded for decryption"""
+        with self.assertRaises(ValueError):
+            keyring.Keyring().private(self.keys['public_key'])
+    
+    def test_threads_share_contexts(self):
+        """Test concurrent encryption and decryption with shared ciphers"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        cipher = RSACipher()
+        cipher.load_public_key(self.keys['public_key'])
+        cipher.load_private_key(self.keys['private_key'])
+        
+        def round_trip(i):
+            return cipher.decrypt(cipher.encrypt(f"message {i}"))
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(round_trip, range(16)))
+        self.assertEqual(results, [f"message {i}" for i in range(16)])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,99 @@
+"""
+Import-time regression benchmark for the CLI
+Runs cli.py under `python -X importtime` and checks that light subcommands
+stay within an import budget and never load the heavy backends
+"""
+
+import unittest
+import sys
+import os
+import subprocess
+import tempfile
+import importlib.util
+
+CLI_PATH = os.path.join(os.path.dirname(__file__), '..', 'apps', 'cli.py')
+
+# Total cumulative import time (microseconds) allowed for the CLI's own
+# imports, excluding interpreter start-up (site)
+IMPORT_BUDGET_US = 150_000
+
+# Modules only the crypto/steganography subcommands may load
+HEAVY_MODULES = ('numpy', 'PIL', 'Crypto')
+
+
+def measure_imports(*cli_args):
+    """
+    Run the CLI under -X importtime
+    
+    Args:
+        *cli_args: Command line arguments for cli.py
+    
+    Returns:
+        dict: Module name -> (cumulative time in us, nesting depth) for every
+            module imported after interpreter start-up
+    """
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', CLI_PATH, *cli_args],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    
+    timings = {}
+    started = False
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue  # Column header
+        module = name.strip()
+        if not started:
+            started = module == 'site'
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        timings[module] = (int(cumulative), depth)
+    return timings
+
+
+@unittest.skipUnless(importlib.util.find_spec('colorama'), "colorama not installed")
+class TestCLIImportTime(unittest.TestCase):
+    """Test that light subcommands stay cheap to start"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.temp_dir.name, 'input.txt')
+        with open(self.input_path, 'w') as f:
+            f.write("data")
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def _check(self, *cli_args):
+        timings = measure_imports(*cli_args)
+        
+        loaded = [m for m in timings if m.split('.')[0] in HEAVY_MODULES]
+        self.assertEqual(loaded, [], f"{cli_args[0]} imported heavy modules")
+        
+        total = sum(cumulative for cumulative, depth in timings.values() if depth == 0)
+        self.assertLess(total, IMPORT_BUDGET_US,
+                        f"{cli_args[0]} imports took {total / 1000:.1f} ms")
+    
+    def test_help(self):
+        """Test --help within budget"""
+        self._check('--help')
+    
+    def test_hash(self):
+        """Test hash within budget"""
+        self._check('hash', '--input', self.input_path)
+    
+    def test_generate_password(self):
+        """Test generate-password within budget"""
+        self._check('generate-password')
+    
+    def test_stego_loads_backend(self):
+        """Test that the benchmark sees backends imported by stego commands"""
+        timings = measure_imports('stego-decode', '--type', 'image', '--input', self.input_path)
+        self.assertIn('numpy', timings)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,16 +1,20 @@
 """
 Unit tests for CryptoOperations in core/operations.py
-Tests Blowfish, 3DES, ChaCha20, and RSA encryption/decryption
+Tests Blowfish, 3DES, ChaCha20, and RSA encryption/decryption and
+streamed file encryption
 """
 
 import unittest
 import sys
 import os
+import tempfile
+from unittest import mock
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.core.operations import CryptoOperations
+from src.crypto import registry
 
 
 class TestBlowfishOperations(unittest.TestCase):
@@ -234,5 +238,104 @@ class TestRSAOperations(unittest.TestCase):
         self.assertFalse(decrypt_result['success'])
 
 
+
+class ReverseCodec(registry.Codec):
+    """Toy third-party codec used to test registration"""
+    
+    def encrypt(self, text, key=None, shift=3):
+        return {'success': True, 'ciphertext': text[::-1], 'algorithm': self.name}
+    
+    def decrypt(self, ciphertext, key=None, shift=3, iv=None, nonce=None, private_key=None):
+        return {'success': True, 'plaintext': ciphertext[::-1], 'algorithm': self.name}
+
+
+class TestAlgorithmRegistry(unittest.TestCase):
+    """Test registry-based algorithm dispatch"""
+    
+    def test_register_custom_algorithm(self):
+        """Test that registered codecs are dispatched by CryptoOperations"""
+        # Restore the process-wide table so 'reverse'/'rev' do not leak into other tests
+        patcher = mock.patch.dict(registry._codecs)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        registry.register('reverse', ReverseCodec('reverse', 'unused:Unused'), aliases=('rev',))
+        
+        result = CryptoOperations.encrypt("abc", "REV")
+        self.assertEqual(result, {'success': True, 'ciphertext': 'cba', 'algorithm': 'reverse'})
+        self.assertEqual(CryptoOperations.decrypt("cba", "reverse")['plaintext'], "abc")
+        self.assertIn('reverse', registry.available())
+    
+    def test_registration_does_not_leak(self):
+        """Test that the custom codec is gone after the registering test"""
+        self.test_register_custom_algorithm()
+        self.doCleanups()
+        self.assertIsNone(registry.get('reverse'))
+        self.assertIsNone(registry.get('rev'))
+    
+    def test_unsupported_algorithm(self):
+        """Test unknown algorithm names"""
+        result = CryptoOperations.encrypt("abc", "Enigma")
+        self.assertFalse(result['success'])
+        self.assertEqual(result['error'], 'Unsupported algorithm: enigma')
+    
+    def test_alias_and_missing_key(self):
+        """Test aliases and per-algorithm key errors"""
+        self.assertIs(registry.get('3DES'), registry.get('des3'))
+        self.assertEqual(CryptoOperations.encrypt("abc", "aes"),
+                         {'success': False, 'error': 'Password required for AES'})
+        self.assertEqual(CryptoOperations.decrypt("abc", "chacha20", key="k"),
+                         {'success': False, 'error': 'Key and nonce required'})
+
+
+
+class TestFileEncryption(unittest.TestCase):
+    """Test streamed file encryption through CryptoOperations"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.plain_path = os.path.join(self.temp_dir.name, 'plain.bin')
+        self.enc_path = os.path.join(self.temp_dir.name, 'plain.enc')
+        self.out_path = os.path.join(self.temp_dir.name, 'out.bin')
+        self.data = os.urandom(50000)
+        with open(self.plain_path, 'wb') as f:
+            f.write(self.data)
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_encrypt_decrypt_file(self):
+        """Test file round trip for both stream algorithms"""
+        for algorithm in ('aes', 'chacha20'):
+            result = CryptoOperations.encrypt_file(self.plain_path, self.enc_path, "pw",
+                                                   algorithm=algorithm, chunk_size=8192)
+            self.assertTrue(result['success'])
+            self.assertEqual(result['chunks'], 7)
+            
+            result = CryptoOperations.decrypt_file(self.enc_path, self.out_path, "pw")
+            self.assertTrue(result['success'])
+            self.assertEqual(result['algorithm'], algorithm)
+            with open(self.out_path, 'rb') as f:
+                self.assertEqual(f.read(), self.data)
+    
+    def test_read_file_range(self):
+        """Test decrypting only a byte range of an encrypted file"""
+        CryptoOperations.encrypt_file(self.plain_path, self.enc_path, "pw", chunk_size=8192)
+        
+        result = CryptoOperations.read_file_range(self.enc_path, "pw", 20000, 5000)
+        self.assertTrue(result['success'])
+        self.assertEqual(result['data'], self.data[20000:25000])
+        
+        tail = CryptoOperations.read_file_range(self.enc_path, "pw", -100, 100)
+        self.assertEqual(tail['data'], self.data[-100:])
+        self.assertEqual(tail['size'], len(self.data))
+    
+    def test_wrong_password_leaves_no_output(self):
+        """Test that failed authentication removes the partial output"""
+        CryptoOperations.encrypt_file(self.plain_path, self.enc_path, "pw", chunk_size=8192)
+        result = CryptoOperations.decrypt_file(self.enc_path, self.out_path, "wrong")
+        self.assertFalse(result['success'])
+        self.assertIn('Authentication failed', result['error'])
+        self.assertFalse(os.path.exists(self.out_path))
+
 if __name__ == '__main__':
     unittest.main()
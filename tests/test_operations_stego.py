@@ -0,0 +1,126 @@
+"""
+Unit tests for SteganographyOperations in core/operations.py
+Tests single-file and batch encode/decode
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+import signal
+import time
+import multiprocessing
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.operations import SteganographyOperations
+
+
+def _sleep_job(seconds, ignore_timer=False, crash=False):
+    """Stand-in for encode() that takes a known time (patched in before workers fork)"""
+    if ignore_timer:
+        signal.signal(signal.SIGALRM, signal.SIG_IGN)
+    time.sleep(seconds)
+    if crash:
+        os._exit(1)
+    return {'success': True}
+
+
+class TestSteganographyBatch(unittest.TestCase):
+    """Test batch steganography operations on a process pool"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        self.covers = []
+        for i in range(4):
+            path = os.path.join(self.temp_dir, f'cover{i}.png')
+            Image.fromarray(rng.integers(0, 256, size=(40, 60, 3), dtype=np.uint8)).save(path)
+            self.covers.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_encode_decode_batch(self):
+        """Test that every job's result is returned with its index"""
+        jobs = [
+            {'cover_path': cover, 'message': f"message {i}",
+             'output_path': os.path.join(self.temp_dir, f'stego{i}.png')}
+            for i, cover in enumerate(self.covers)
+        ]
+
+        results = list(SteganographyOperations.encode_batch(iter(jobs), workers=2))
+        self.assertEqual(sorted(r['job_index'] for r in results), [0, 1, 2, 3])
+        self.assertTrue(all(r['success'] for r in results))
+
+        decode_jobs = ({'stego_path': job['output_path']} for job in jobs)
+        decoded = {r['job_index']: r['message'] for r in SteganographyOperations.decode_batch(decode_jobs, workers=2)}
+        self.assertEqual(decoded, {i: f"message {i}" for i in range(4)})
+
+    def test_per_job_errors(self):
+        """Test that a failing job does not stop the batch"""
+        jobs = [
+            (self.covers[0], "ok", os.path.join(self.temp_dir, 'ok.png')),
+            ('/nonexistent/cover.png', "fails", os.path.join(self.temp_dir, 'bad.png')),
+        ]
+        results = {r['job_index']: r for r in SteganographyOperations.encode_batch(jobs, workers=2)}
+        self.assertTrue(results[0]['success'])
+        self.assertFalse(results[1]['success'])
+        self.assertIn('error', results[1])
+
+    def test_timeout(self):
+        """Test that jobs exceeding the time limit report an error"""
+        large = os.path.join(self.temp_dir, 'large.png')
+        Image.new('RGB', (1500, 1500)).save(large)
+        jobs = [{'cover_path': large, 'message': "slow", 'output_path': os.path.join(self.temp_dir, 'out.png')}]
+
+        result = next(SteganographyOperations.encode_batch(jobs, workers=1, timeout=0.0001))
+        self.assertFalse(result['success'])
+        self.assertIn('timed out', result['error'])
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork', "workers must inherit the patched encode()")
+    def test_timeout_counts_from_job_start(self):
+        """Test that queued jobs shorter than the limit are not reported as timed out"""
+        with mock.patch.object(SteganographyOperations, 'encode', staticmethod(_sleep_job)), \
+                mock.patch('src.core.operations.BATCH_TIMEOUT_GRACE', 0.2):
+            results = list(SteganographyOperations.encode_batch([(0.7,)] * 4, workers=1, timeout=1))
+
+        self.assertEqual(sorted(r['job_index'] for r in results), [0, 1, 2, 3])
+        self.assertTrue(all(r['success'] for r in results), results)
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork' and hasattr(signal, 'setitimer'),
+                         "workers must inherit the patched encode()")
+    def test_stuck_worker_is_killed(self):
+        """Test that a job ignoring its timer is killed and the others still run"""
+        jobs = [(0.1,), (30, True), (0.1,), (0.1,)]
+        start = time.monotonic()
+        with mock.patch.object(SteganographyOperations, 'encode', staticmethod(_sleep_job)):
+            results = {r['job_index']: r for r in SteganographyOperations.encode_batch(jobs, workers=1, timeout=0.5)}
+
+        self.assertLess(time.monotonic() - start, 30)
+        self.assertIn('timed out', results[1]['error'])
+        self.assertTrue(all(results[i]['success'] for i in (0, 2, 3)))
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork', "workers must inherit the patched encode()")
+    def test_crashed_worker_fails_only_its_job(self):
+        """Test that a worker dying mid-job fails that job and the rest of the batch still runs"""
+        jobs = [(0.05,)] * 8
+        jobs[3] = (0.05, False, True)
+        for timeout in (None, 5):
+            with mock.patch.object(SteganographyOperations, 'encode', staticmethod(_sleep_job)):
+                results = list(SteganographyOperations.encode_batch(jobs, workers=2, timeout=timeout))
+
+            self.assertEqual(sorted(r['job_index'] for r in results), list(range(8)))
+            by_index = {r['job_index']: r for r in results}
+            self.assertIn('died', by_index[3]['error'])
+            self.assertTrue(all(by_index[i]['success'] for i in range(8) if i != 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
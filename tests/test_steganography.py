@@ -0,0 +1,622 @@
+"""
+Unit tests for steganography module
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+import struct
+import subprocess
+import wave
+from unittest import mock
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import numpy as np
+from PIL import Image
+
+# Add src to path
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from src.steganography import ImageSteganography, AdvancedImageSteganography, AudioSteganography
+from src.steganography import VideoSteganography, JPEGSteganography
+from src.steganography import lsb, payload
+from src.steganography.document_stego import TextSteganography
+
+
+def make_cover_image(path, width=64, height=48, seed=0):
+    """Write a random RGB cover image"""
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(path)
+    return pixels
+
+
+def make_cover_audio(path, n_frames=8000, n_channels=2, seed=0):
+    """Write a random 16-bit PCM cover WAV"""
+    rng = np.random.default_rng(seed)
+    samples = rng.integers(-20000, 20000, size=n_frames * n_channels, dtype=np.int16)
+    with wave.open(path, 'wb') as audio:
+        audio.setnchannels(n_channels)
+        audio.setsampwidth(2)
+        audio.setframerate(8000)
+        audio.writeframes(samples.astype('<i2').tobytes())
+    return samples
+
+
+def write_wav(path, raw, format_tag, sample_width, n_channels=2, extra_chunk=b''):
+    """Write a WAV file directly from raw sample bytes (any format tag)"""
+    fmt = struct.pack('<HHIIHH', format_tag, n_channels, 48000,
+                      48000 * n_channels * sample_width, n_channels * sample_width, sample_width * 8)
+    chunks = b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+    if extra_chunk:
+        chunks += b'LIST' + struct.pack('<I', len(extra_chunk)) + extra_chunk
+    chunks += b'data' + struct.pack('<I', len(raw)) + raw
+    with open(path, 'wb') as f:
+        f.write(b'RIFF' + struct.pack('<I', 4 + len(chunks)) + b'WAVE' + chunks)
+
+
+class TestImageSteganography(unittest.TestCase):
+    """Test LSB image steganography"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cover = os.path.join(self.temp_dir, 'cover.png')
+        self.stego = os.path.join(self.temp_dir, 'stego.png')
+        self.cover_pixels = make_cover_image(self.cover)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_encode_decode_compressed(self):
+        """Test round trip with compression"""
+        message = "Hidden message with compression " * 5
+        ImageSteganography.encode(self.cover, message, self.stego, compress=True)
+        self.assertEqual(ImageSteganography.decode(self.stego, compressed=True), message)
+
+    def test_encode_decode_uncompressed(self):
+        """Test round trip without compression"""
+        message = "Plain hidden message"
+        ImageSteganography.encode(self.cover, message, self.stego, compress=False)
+        self.assertEqual(ImageSteganography.decode(self.stego, compressed=False), message)
+
+    def test_only_lsbs_change(self):
+        """Test that embedding only touches the least significant bits"""
+        ImageSteganography.encode(self.cover, "LSB only", self.stego)
+        stego_pixels = np.array(Image.open(self.stego))
+        diff = np.abs(stego_pixels.astype(np.int16) - self.cover_pixels.astype(np.int16))
+        self.assertLessEqual(diff.max(), 1)
+
+    def test_message_too_large(self):
+        """Test that oversized messages are rejected"""
+        with self.assertRaises(ValueError):
+            ImageSteganography.encode(self.cover, "x" * 10000, self.stego, compress=False)
+
+    def test_no_message(self):
+        """Test decoding a clean image fails"""
+        with self.assertRaises(ValueError):
+            ImageSteganography.decode(self.cover, compressed=False)
+
+    def test_unicode_message(self):
+        """Test that non Latin-1 text survives the round trip"""
+        message = "Привет, 世界 🔐"
+        ImageSteganography.encode(self.cover, message, self.stego, compress=False)
+        self.assertEqual(ImageSteganography.decode(self.stego), message)
+
+    def test_encode_decode_bytes(self):
+        """Test raw binary data round trip"""
+        data = bytes(range(256)) * 2
+        ImageSteganography.encode_bytes(self.cover, data, self.stego)
+        self.assertEqual(ImageSteganography.decode_bytes(self.stego), data)
+
+    def test_tiled_matches_in_memory(self):
+        """Test that strip-wise embedding produces the same pixels"""
+        message = "Tiled embedding " * 40
+        for extension in ('png', 'bmp'):
+            cover = os.path.join(self.temp_dir, f'cover.{extension}')
+            Image.fromarray(self.cover_pixels).save(cover)
+            in_memory = os.path.join(self.temp_dir, f'memory.{extension}')
+            tiled = os.path.join(self.temp_dir, f'tiled.{extension}')
+
+            ImageSteganography.encode(cover, message, in_memory, compress=False)
+            ImageSteganography.encode(cover, message, tiled, compress=False, strip_rows=5)
+
+            np.testing.assert_array_equal(np.array(Image.open(in_memory)), np.array(Image.open(tiled)))
+            self.assertEqual(ImageSteganography.decode(tiled, strip_rows=3), message)
+
+    def test_tiled_in_place(self):
+        """Test strip-wise embedding with the cover as the output path"""
+        cover = os.path.join(self.temp_dir, 'cover.bmp')
+        Image.fromarray(self.cover_pixels).save(cover)
+        ImageSteganography.encode(cover, "in place", cover, strip_rows=4)
+        self.assertEqual(ImageSteganography.decode(cover, strip_rows=4), "in place")
+
+    @unittest.skipIf(resource is None, "resource module not available")
+    def test_tiled_memory_is_bounded(self):
+        """Test that patching an uncompressed raster never holds the whole image"""
+        cover = os.path.join(self.temp_dir, 'large.bmp')
+        stego = os.path.join(self.temp_dir, 'large_stego.bmp')
+        Image.new('RGB', (4000, 3000)).save(cover)
+        raster_bytes = 4000 * 3000 * 3
+
+        # Peak RSS growth of a fresh process, which also counts PIL's C allocations
+        script = (
+            "import resource, sys\n"
+            f"sys.path.insert(0, {ROOT!r})\n"
+            "from src.steganography import ImageSteganography\n"
+            "import PIL.BmpImagePlugin\n"
+            "before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+            f"ImageSteganography.encode_bytes({cover!r}, bytes(range(256)) * 200, {stego!r}, strip_rows=16)\n"
+            "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before)\n"
+        )
+        output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+        growth = int(output.stdout) * (1 if sys.platform == 'darwin' else 1024)
+
+        self.assertLess(growth, raster_bytes // 4)
+        self.assertEqual(ImageSteganography.decode_bytes(stego, strip_rows=16), bytes(range(256)) * 200)
+
+    def test_password_scatter(self):
+        """Test keyed pseudo-random embedding order"""
+        data = bytes(range(256))
+        ImageSteganography.encode_bytes(self.cover, data, self.stego, password="s3cret")
+        self.assertEqual(ImageSteganography.decode_bytes(self.stego, password="s3cret"), data)
+
+        # Changes are spread over the whole image, not packed into the first rows
+        stego_pixels = np.array(Image.open(self.stego))
+        changed_rows = np.flatnonzero((stego_pixels != self.cover_pixels).any(axis=(1, 2)))
+        self.assertGreater(changed_rows.max(), self.cover_pixels.shape[0] // 2)
+
+        with self.assertRaises(ValueError):
+            ImageSteganography.decode_bytes(self.stego, password="wrong")
+        with self.assertRaises(ValueError):
+            ImageSteganography.decode_bytes(self.stego)
+
+    def test_legacy_delimiter_format(self):
+        """Test decoding images written with the delimiter format"""
+        legacy = ImageSteganography.compress_text("old message") + ImageSteganography.DELIMITER
+        pixels = self.cover_pixels.copy()
+        lsb.embed_bits(pixels.reshape(-1), lsb.bytes_to_bits(legacy.encode('latin-1')))
+        Image.fromarray(pixels).save(self.stego)
+
+        self.assertEqual(ImageSteganography.decode(self.stego, compressed=True), "old message")
+
+
+class TestAdvancedImageSteganography(unittest.TestCase):
+    """Test multi-bit image steganography"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cover = os.path.join(self.temp_dir, 'cover.png')
+        self.stego = os.path.join(self.temp_dir, 'stego.png')
+        self.cover_pixels = make_cover_image(self.cover)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_encode_decode_all_widths(self):
+        """Test round trip for 1-4 bits per channel"""
+        data = bytes(range(256)) + b"\xff" * 32
+        for bits in range(1, 5):
+            stego = AdvancedImageSteganography(bits)
+            stego.encode_bytes(self.cover, data, self.stego)
+            self.assertEqual(stego.decode_bytes(self.stego), data)
+
+            pixels = np.array(Image.open(self.stego))
+            self.assertTrue(np.all((pixels >> bits) == (self.cover_pixels >> bits)))
+
+    def test_text_round_trip(self):
+        """Test text messages with a 3-bit configuration"""
+        stego = AdvancedImageSteganography(3)
+        stego.encode(self.cover, "Multi-bit ✓", self.stego)
+        self.assertEqual(stego.decode(self.stego), "Multi-bit ✓")
+
+    def test_legacy_end_marker(self):
+        """Test decoding images written with the 16-bit end marker"""
+        bits = lsb.bytes_to_bits(b"legacy msg")
+        bits = np.concatenate([bits, np.ones(16, dtype=np.uint8)])
+        pixels = self.cover_pixels.copy()
+        lsb.embed_symbols(pixels.reshape(-1), lsb.pack_symbols(bits, 2), 2)
+        Image.fromarray(pixels).save(self.stego)
+
+        self.assertEqual(AdvancedImageSteganography(2).decode(self.stego), "legacy msg")
+
+    def test_password_scatter(self):
+        """Test keyed symbol order for multi-bit embedding"""
+        data = os.urandom(500)
+        AdvancedImageSteganography(3, password="key").encode_bytes(self.cover, data, self.stego)
+        self.assertEqual(AdvancedImageSteganography(3, password="key").decode_bytes(self.stego), data)
+        with self.assertRaises(ValueError):
+            AdvancedImageSteganography(3, password="other").decode_bytes(self.stego)
+
+    def test_invalid_bits(self):
+        """Test that unsupported bit counts are rejected"""
+        with self.assertRaises(ValueError):
+            AdvancedImageSteganography(5)
+
+
+class TestPayloadHeader(unittest.TestCase):
+    """Test the length-prefixed payload header"""
+
+    def test_round_trip(self):
+        """Test packing and reading a payload"""
+        stream = payload.pack(b"payload bytes", payload.FLAG_TEXT)
+        self.assertEqual(len(stream), payload.HEADER_SIZE + 13)
+
+        result = payload.read(lambda offset, count: stream[offset:offset + count])
+        self.assertEqual(result, (payload.FLAG_TEXT, b"payload bytes"))
+
+    def test_reads_only_needed_bytes(self):
+        """Test that reading stops after header and payload"""
+        stream = payload.pack(b"abc") + b"\x00" * 1000
+        requested = []
+
+        def read_bytes(offset, count):
+            requested.append((offset, count))
+            return stream[offset:offset + count]
+
+        payload.read(read_bytes)
+        self.assertEqual(requested, [(0, payload.HEADER_SIZE), (payload.HEADER_SIZE, 3)])
+
+    def test_crc_mismatch(self):
+        """Test that corrupted payloads are rejected"""
+        stream = bytearray(payload.pack(b"abc"))
+        stream[-1] ^= 0xFF
+        self.assertIsNone(payload.read(lambda offset, count: bytes(stream[offset:offset + count])))
+
+    def test_no_header(self):
+        """Test that data without magic is not treated as a payload"""
+        self.assertIsNone(payload.read(lambda offset, count: b"\x00" * count))
+
+
+class TestKeyedIndices(unittest.TestCase):
+    """Test the password-keyed embedding order"""
+
+    def test_permutation(self):
+        """Test that keyed indices form a permutation of the carrier"""
+        for size in (1, 2, 7, 100, 4097):
+            indices = lsb.keyed_indices("key", size, size)
+            self.assertEqual(sorted(indices.tolist()), list(range(size)))
+
+    def test_partial_generation(self):
+        """Test that a window of positions matches the full sequence"""
+        full = lsb.keyed_indices("key", 10 ** 6, 300)
+        np.testing.assert_array_equal(lsb.keyed_indices("key", 10 ** 6, 100, start=200), full[200:])
+        self.assertFalse(np.array_equal(lsb.keyed_indices("other", 10 ** 6, 300), full))
+
+    def test_carrier_too_small(self):
+        """Test that requesting more positions than elements fails"""
+        with self.assertRaises(ValueError):
+            lsb.keyed_indices("key", 10, 11)
+
+
+class TestAudioSteganography(unittest.TestCase):
+    """Test LSB audio steganography"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cover = os.path.join(self.temp_dir, 'cover.wav')
+        self.stego = os.path.join(self.temp_dir, 'stego.wav')
+        self.cover_samples = make_cover_audio(self.cover)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_encode_decode(self):
+        """Test audio round trip"""
+        message = "Secret hidden in audio"
+        AudioSteganography.encode(self.cover, message, self.stego)
+        self.assertEqual(AudioSteganography.decode(self.stego), message)
+
+    def test_encode_decode_bytes(self):
+        """Test raw binary data round trip"""
+        data = bytes(range(256))
+        AudioSteganography.encode_bytes(self.cover, data, self.stego, compress=True)
+        self.assertEqual(AudioSteganography.decode_bytes(self.stego), data)
+
+    def test_only_lsbs_change(self):
+        """Test that embedding only touches sample LSBs"""
+        AudioSteganography.encode(self.cover, "LSB only", self.stego)
+        with wave.open(self.stego, 'rb') as audio:
+            stego_samples = np.frombuffer(audio.readframes(audio.getnframes()), dtype='<i2')
+        diff = np.abs(stego_samples.astype(np.int32) - self.cover_samples.astype(np.int32))
+        self.assertLessEqual(diff.max(), 1)
+
+    def test_message_too_large(self):
+        """Test that oversized messages are rejected"""
+        with self.assertRaises(ValueError):
+            AudioSteganography.encode(self.cover, "x" * 5000, self.stego)
+
+    def test_block_size_does_not_change_output(self):
+        """Test that streaming block size only affects memory, not output"""
+        data = bytes(range(256)) * 4
+        small_blocks = os.path.join(self.temp_dir, 'small.wav')
+        AudioSteganography.encode_bytes(self.cover, data, self.stego)
+        AudioSteganography.encode_bytes(self.cover, data, small_blocks, block_frames=37)
+
+        with open(self.stego, 'rb') as a, open(small_blocks, 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+        self.assertEqual(AudioSteganography.decode_bytes(small_blocks), data)
+
+    def test_in_place_encode(self):
+        """Test encoding with the cover as the output path"""
+        AudioSteganography.encode_bytes(self.cover, b"in place", self.stego)
+        AudioSteganography.encode_bytes(self.cover, b"in place", self.cover)
+
+        with open(self.stego, 'rb') as a, open(self.cover, 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+        self.assertEqual(AudioSteganography.decode_bytes(self.cover), b"in place")
+
+    def test_legacy_delimiter_format(self):
+        """Test decoding audio written with the delimiter format"""
+        samples = self.cover_samples.copy()
+        legacy = b"old audio message" + AudioSteganography.DELIMITER.encode('latin-1')
+        lsb.embed_bits(samples, lsb.bytes_to_bits(legacy))
+        with wave.open(self.stego, 'wb') as audio:
+            audio.setnchannels(2)
+            audio.setsampwidth(2)
+            audio.setframerate(8000)
+            audio.writeframes(samples.astype('<i2').tobytes())
+
+        self.assertEqual(AudioSteganography.decode(self.stego), "old audio message")
+
+    def test_password_scatter(self):
+        """Test keyed sample order, independent of block size"""
+        data = bytes(range(256))
+        small_blocks = os.path.join(self.temp_dir, 'small.wav')
+        AudioSteganography.encode_bytes(self.cover, data, self.stego, password="pw")
+        AudioSteganography.encode_bytes(self.cover, data, small_blocks, password="pw", block_frames=50)
+
+        with open(self.stego, 'rb') as a, open(small_blocks, 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+        self.assertEqual(AudioSteganography.decode_bytes(self.stego, password="pw"), data)
+        with self.assertRaises(ValueError):
+            AudioSteganography.decode_bytes(self.stego, password="nope")
+
+    def test_24_bit_pcm(self):
+        """Test 24-bit audio, where only the low byte of each sample changes"""
+        rng = np.random.default_rng(1)
+        raw = rng.integers(0, 256, size=6000 * 3, dtype=np.uint8).tobytes()
+        write_wav(self.cover, raw, 1, 3, extra_chunk=b'INFOtest')
+
+        data = bytes(range(200))
+        AudioSteganography.encode_bytes(self.cover, data, self.stego)
+        self.assertEqual(AudioSteganography.decode_bytes(self.stego), data)
+        self.assertEqual(AudioSteganography.get_capacity(self.cover)['max_bytes'], 6000 // 8)
+
+        with open(self.cover, 'rb') as a, open(self.stego, 'rb') as b:
+            cover, stego = np.frombuffer(a.read(), np.uint8), np.frombuffer(b.read(), np.uint8)
+        changed = np.flatnonzero(cover != stego)
+        self.assertTrue(np.all((cover[changed] ^ stego[changed]) == 1))
+        self.assertTrue(np.all((changed - changed[0]) % 3 == 0))
+
+    def test_float_and_8_bit(self):
+        """Test 32-bit float and 8-bit PCM round trips"""
+        rng = np.random.default_rng(2)
+        covers = {
+            (3, 4): rng.uniform(-1, 1, 4000).astype('<f4').tobytes(),
+            (1, 1): rng.integers(0, 256, 4000, dtype=np.uint8).tobytes(),
+        }
+        for (format_tag, width), raw in covers.items():
+            write_wav(self.cover, raw, format_tag, width)
+            self.assertTrue(AudioSteganography.validate_audio_file(self.cover)['valid'])
+
+            AudioSteganography.encode(self.cover, "studio master", self.stego)
+            self.assertEqual(AudioSteganography.decode(self.stego), "studio master")
+
+        stego_samples = np.frombuffer(open(self.stego, 'rb').read()[-4000:], np.uint8)
+        self.assertLessEqual(np.abs(stego_samples.astype(int) - np.frombuffer(raw, np.uint8)).max(), 1)
+
+    def test_unsupported_format(self):
+        """Test that unsupported sample formats are rejected"""
+        write_wav(self.cover, b'\x00' * 1200, 3, 2)
+        self.assertFalse(AudioSteganography.validate_audio_file(self.cover)['valid'])
+        with self.assertRaises(ValueError):
+            AudioSteganography.encode(self.cover, "x", self.stego)
+
+
+class TestJPEGSteganography(unittest.TestCase):
+    """Test DCT coefficient JPEG steganography"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cover = os.path.join(self.temp_dir, 'cover.jpg')
+        self.stego = os.path.join(self.temp_dir, 'stego.jpg')
+        self.png_cover = os.path.join(self.temp_dir, 'cover.png')
+        make_cover_image(self.png_cover, width=128, height=96)
+        Image.open(self.png_cover).save(self.cover, quality=90)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_encode_decode_bytes(self):
+        """Test binary round trip in a baseline JPEG"""
+        data = bytes(range(256)) * 4
+        result = JPEGSteganography.encode_bytes(self.cover, data, self.stego)
+        self.assertFalse(result['reencoded'])
+        self.assertEqual(JPEGSteganography.decode_bytes(self.stego), data)
+
+    def test_tables_and_scan_length_preserved(self):
+        """Test that only coefficient bits inside the scan change"""
+        JPEGSteganography.encode(self.cover, "DCT domain", self.stego)
+        with open(self.cover, 'rb') as a, open(self.stego, 'rb') as b:
+            cover, stego = a.read(), b.read()
+
+        scan_start = cover.index(b'\xff\xda')
+        self.assertEqual(cover[:scan_start], stego[:scan_start])
+        self.assertEqual(Image.open(self.stego).size, (128, 96))
+        self.assertEqual(JPEGSteganography.decode(self.stego), "DCT domain")
+
+    def test_window_size_does_not_change_carriers(self):
+        """Test that decoding the scan in small windows finds the same coefficients"""
+        from src.steganography import jpeg_stego
+
+        with open(self.cover, 'rb') as f:
+            data = f.read()
+        expected = np.concatenate([p for _, p in jpeg_stego.JPEGFile(data).iter_carriers()])
+
+        with mock.patch.object(jpeg_stego, 'WINDOW_BYTES', 1):
+            windows = list(jpeg_stego.JPEGFile(data).iter_carriers())
+            self.assertGreater(len(windows), 1)
+            np.testing.assert_array_equal(np.concatenate([p for _, p in windows]), expected)
+
+            JPEGSteganography.encode_bytes(self.cover, b"windowed", self.stego)
+        self.assertEqual(JPEGSteganography.decode_bytes(self.stego), b"windowed")
+
+    def test_corrupt_scan(self):
+        """Test that a truncated scan is reported as corrupt"""
+        from src.steganography import jpeg_stego
+
+        with open(self.cover, 'rb') as f:
+            jpeg = jpeg_stego.JPEGFile(f.read())
+        jpeg.intervals = [jpeg.intervals[0][:200]]
+        with self.assertRaises(ValueError):
+            list(jpeg.iter_carriers())
+
+    def test_restart_markers_and_grayscale(self):
+        """Test covers with restart intervals and a single component"""
+        image = Image.open(self.png_cover)
+        for cover, options in ((image, {'restart_marker_blocks': 2}), (image.convert('L'), {})):
+            cover.save(self.cover, quality=85, **options)
+            JPEGSteganography.encode(self.cover, "restart ✓", self.stego)
+            self.assertEqual(JPEGSteganography.decode(self.stego), "restart ✓")
+
+    def test_non_jpeg_cover(self):
+        """Test that other covers are converted to baseline JPEG in memory"""
+        result = JPEGSteganography.encode(self.png_cover, "from png", self.stego)
+        self.assertTrue(result['reencoded'])
+        self.assertEqual(JPEGSteganography.decode(self.stego), "from png")
+
+    def test_message_too_large(self):
+        """Test that oversized payloads are rejected"""
+        capacity = JPEGSteganography.get_capacity(self.cover)['max_bytes']
+        with self.assertRaises(ValueError):
+            JPEGSteganography.encode_bytes(self.cover, b"x" * capacity, self.stego)
+
+
+@unittest.skipUnless(shutil.which('ffmpeg') and shutil.which('ffprobe'), "ffmpeg/ffprobe not installed")
+class TestVideoSteganography(unittest.TestCase):
+    """Test frame-based video steganography (requires ffmpeg)"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cover = os.path.join(self.temp_dir, 'cover.mkv')
+        subprocess.run([
+            'ffmpeg', '-v', 'error', '-y',
+            '-f', 'lavfi', '-i', 'testsrc=size=96x64:rate=25',
+            '-f', 'lavfi', '-i', 'sine=frequency=440',
+            '-t', '2', '-c:v', 'ffv1', '-c:a', 'pcm_s16le', self.cover
+        ], check=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_lossless_round_trip(self):
+        """Test that the default lossless output keeps multi-frame payloads"""
+        data = bytes(range(256)) * 20
+        for extension in ('mkv', 'mp4'):
+            stego = os.path.join(self.temp_dir, f'stego.{extension}')
+            result = VideoSteganography.encode_bytes(self.cover, data, stego)
+            self.assertGreater(result['frames_used'], 1)
+            self.assertEqual(result['total_frames'], 50)
+            self.assertEqual(VideoSteganography.decode_bytes(stego), data)
+
+    def test_text_round_trip(self):
+        """Test text messages"""
+        stego = os.path.join(self.temp_dir, 'stego.mkv')
+        VideoSteganography.encode(self.cover, "Hidden in frames ✓", stego)
+        self.assertEqual(VideoSteganography.decode(stego), "Hidden in frames ✓")
+
+    def test_worker_count_does_not_change_output(self):
+        """Test that parallel embedding matches sequential embedding"""
+        data = os.urandom(4000)
+        sequential = os.path.join(self.temp_dir, 'sequential.mkv')
+        parallel = os.path.join(self.temp_dir, 'parallel.mkv')
+        VideoSteganography.encode_bytes(self.cover, data, sequential, workers=1)
+        VideoSteganography.encode_bytes(self.cover, data, parallel, workers=4)
+
+        def frame_hashes(path):
+            return subprocess.run(
+                ['ffmpeg', '-v', 'error', '-i', path, '-map', '0:v', '-f', 'framemd5', '-'],
+                capture_output=True, text=True, check=True
+            ).stdout
+        self.assertEqual(frame_hashes(sequential), frame_hashes(parallel))
+        self.assertEqual(VideoSteganography.decode_bytes(parallel, workers=1), data)
+        self.assertEqual(VideoSteganography.decode_bytes(parallel, workers=4), data)
+
+    def test_get_capacity(self):
+        """Test capacity from stream metadata"""
+        capacity = VideoSteganography.get_capacity(self.cover, max_frames=10)
+        self.assertEqual(capacity['resolution'], '96x64')
+        self.assertEqual(capacity['total_frames'], 50)
+        self.assertEqual(capacity['max_bytes'], 10 * 96 * 64 * 3 // 8)
+        self.assertEqual(VideoSteganography.get_capacity(self.cover, max_frames=10), capacity)
+
+    def test_message_too_large(self):
+        """Test that payloads beyond max_frames are rejected"""
+        stego = os.path.join(self.temp_dir, 'stego.mkv')
+        with self.assertRaises(ValueError):
+            VideoSteganography.encode_bytes(self.cover, b"x" * 5000, stego, max_frames=2)
+
+
+class TestVideoExtraction(unittest.TestCase):
+    """Test how many frames video decoding reads (ffmpeg replaced by synthetic frames)"""
+
+    def test_parallel_decode_reads_only_payload_frames(self):
+        """Test that workers > 1 do not read ahead past the frames the header says are needed"""
+        width, height = 8, 8
+        frame_size = width * height * 3
+        data = os.urandom(40)
+        bits = np.unpackbits(np.frombuffer(payload.encode_bytes(data), dtype=np.uint8))
+        needed = -(-bits.size // frame_size)
+        stream = np.zeros(30 * frame_size, dtype=np.uint8)
+        stream[:bits.size] = bits
+        pulled = []
+
+        def read_frames(video_path, w, h, max_frames=None):
+            for i in range(max_frames):
+                pulled.append(i)
+                yield stream[i * frame_size:(i + 1) * frame_size].copy()
+
+        with mock.patch.object(VideoSteganography, '_check_ffmpeg', staticmethod(lambda: True)), \
+                mock.patch.object(VideoSteganography, '_probe',
+                                  staticmethod(lambda path: {'width': width, 'height': height})), \
+                mock.patch.object(VideoSteganography, '_read_frames', staticmethod(read_frames)):
+            for workers in (1, 4, 16):
+                del pulled[:]
+                self.assertEqual(VideoSteganography.decode_bytes('cover.mkv', max_frames=30,
+                                                                 workers=workers), data)
+                self.assertEqual(len(pulled), needed)
+
+
+class TestTextSteganography(unittest.TestCase):
+    """Test text steganography bytes API"""
+
+    def test_unicode_bytes(self):
+        """Test zero-width character round trip"""
+        cover = "The quick brown fox jumps over the lazy dog. " * 10
+        data = b"\x00\xffbinary\xff\xff"
+        stego = TextSteganography.encode_bytes(cover, data)
+        self.assertEqual(stego.replace('\u200b', '').replace('\u200c', ''), cover)
+        self.assertEqual(TextSteganography.decode_bytes(stego), data)
+
+    def test_whitespace_bytes(self):
+        """Test trailing whitespace round trip"""
+        cover = '\n'.join(f"line {i}" for i in range(300))
+        data = "ключ".encode('utf-8')
+        stego = TextSteganography.encode_bytes(cover, data, method='whitespace')
+        self.assertEqual(TextSteganography.decode_bytes(stego, method='whitespace'), data)
+
+    def test_cover_too_short(self):
+        """Test that oversized payloads are rejected"""
+        with self.assertRaises(ValueError):
+            TextSteganography.encode_bytes("short", b"too much data")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,7 +14,8 @@ from src.utils import (
     calculate_string_hash,
     PasswordValidator,
     generate_random_key,
-    format_file_size
+    format_file_size,
+    ordered_map
 )
 
 
@@ -115,5 +116,29 @@ class TestFormatFileSize(unittest.TestCase):
         self.assertIn('GB', result)
 
 
+class TestOrderedMap(unittest.TestCase):
+    """Test the order-preserving thread pool map"""
+    
+    def test_results_in_input_order(self):
+        """Results come back in input order for any worker count"""
+        for workers in (1, 4):
+            self.assertEqual(list(ordered_map(lambda x: x * x, range(50), workers)),
+                             [x * x for x in range(50)])
+    
+    def test_bounded_read_ahead(self):
+        """At most 2 * workers items are taken ahead of the consumer"""
+        consumed = []
+        
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+        
+        results = ordered_map(lambda x: x, items(), 3)
+        self.assertEqual(next(results), 0)
+        self.assertLessEqual(len(consumed), 6)
+        results.close()
+
+
 if __name__ == '__main__':
     unittest.main()